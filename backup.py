@@ -0,0 +1,347 @@
+"""
+Backups for Horsepower Gym Management System
+Online snapshots of horsepower_gym.db taken with SQLite's backup API,
+rotated by a retention policy, verified with PRAGMA quick_check, and
+restorable from inside the app
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import database as db
+import events
+
+
+# Snapshot folder name, next to the database file
+BACKUP_DIR_NAME = "backups"
+
+# Pages copied per backup step, and the pause between steps (seconds), so a
+# backup of a large database trickles along instead of saturating the disk
+BACKUP_PAGES = 1024
+BACKUP_STEP_SLEEP = 0.005
+
+# busy_timeout of the backup connections (ms); in WAL mode a backup only
+# waits for a checkpoint, never for ordinary writes
+BACKUP_BUSY_TIMEOUT_MS = 10000
+
+# How often the scheduler takes a snapshot (hours)
+BACKUP_INTERVAL_HOURS = 6
+
+# Snapshots kept by rotate(): the newest "last" ones, plus the newest of each
+# of the latest "daily" days and "weekly" ISO weeks that have a snapshot
+BACKUP_RETENTION = {"last": 4, "daily": 7, "weekly": 8}
+
+# horsepower_gym_20260131_183005.123456[_label].db (microseconds, so two
+# snapshots in the same second get different names); names without the
+# fraction come from older versions
+_SNAPSHOT_RE = re.compile(r"^horsepower_gym_(\d{8}_\d{6})(?:\.(\d{6}))?(?:_([\w-]+))?\.db$")
+
+# Backups, rotations and restores never run at the same time (reentrant:
+# backup and restore rotate while holding it)
+_lock = threading.RLock()
+
+
+class BackupError(Exception):
+    """A snapshot could not be taken, failed verification, or cannot be restored"""
+
+
+def get_backup_dir():
+    """Folder holding the snapshots of the current database (created if missing)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(db.DATABASE_PATH)), BACKUP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def list_snapshots():
+    """
+    Snapshots of the current database, newest first.
+
+    Returns:
+        List of dicts with path, name, taken (datetime), label (or None) and size
+    """
+    directory = get_backup_dir()
+    snapshots = []
+    for name in os.listdir(directory):
+        match = _SNAPSHOT_RE.match(name)
+        if not match:
+            continue
+        path = os.path.join(directory, name)
+        snapshots.append({
+            "path": path,
+            "name": name,
+            "taken": datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').replace(
+                microsecond=int(match.group(2) or 0)),
+            "label": match.group(3),
+            "size": os.path.getsize(path),
+        })
+    snapshots.sort(key=lambda s: s["taken"], reverse=True)
+    return snapshots
+
+
+def verify(path):
+    """
+    Run PRAGMA quick_check on a snapshot.
+
+    Returns:
+        List of problems reported by SQLite (empty if the file is sound)
+    """
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = [row[0] for row in conn.execute("PRAGMA quick_check")]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return [str(e)]
+    return [] if rows == ["ok"] else rows
+
+
+def backup(label=None, progress=None):
+    """
+    Take a snapshot of the database while the app keeps running.
+
+    The copy is made page by page (BACKUP_PAGES per step) on a private
+    connection. In WAL mode that connection holds one read transaction for
+    the whole copy: the snapshot is the database as of the moment the
+    backup started, check-ins committed meanwhile are neither blocked nor
+    copied, and the copy never has to restart. With the rollback journal
+    ("safe" profile) a read lock would hold writers off, so the database is
+    copied in a single step instead.
+
+    The snapshot is written to a temporary file, checked with
+    PRAGMA quick_check and only then given its final name; rotate() runs
+    afterwards. Safe to call from any thread.
+
+    Args:
+        label: Optional suffix for the file name (e.g. "pre-restore")
+        progress: Optional callback(pages_done, pages_total) after every step
+
+    Returns:
+        Path of the new snapshot
+    """
+    with _lock:
+        path = _snapshot(label, progress)
+        rotate()
+    return path
+
+
+def _snapshot(label=None, progress=None):
+    """backup() without the rotate() afterwards"""
+    directory = get_backup_dir()
+
+    def on_step(status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+
+    with _lock:
+        path = _new_snapshot_path(directory, label)
+        temp_path = path + ".tmp"
+        source = sqlite3.connect(db.DATABASE_PATH, isolation_level=None)
+        target = sqlite3.connect(temp_path, isolation_level=None)
+        try:
+            source.execute(f"PRAGMA busy_timeout={BACKUP_BUSY_TIMEOUT_MS}")
+            wal = source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+            if wal:
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                source.backup(target, pages=BACKUP_PAGES, progress=on_step, sleep=BACKUP_STEP_SLEEP)
+                source.execute("COMMIT")
+            else:
+                source.backup(target, pages=-1, progress=on_step)
+            # A snapshot is one self-contained file, not a WAL database
+            target.execute("PRAGMA journal_mode=DELETE")
+        except sqlite3.Error as e:
+            target.close()
+            _remove(temp_path)
+            raise BackupError(f"Backup failed: {e}") from e
+        finally:
+            source.close()
+            target.close()
+
+        problems = verify(temp_path)
+        if problems:
+            _remove(temp_path)
+            raise BackupError("Backup failed verification: " + "; ".join(problems[:5]))
+        os.replace(temp_path, path)
+    return path
+
+
+def _new_snapshot_path(directory, label=None):
+    """Unused snapshot file name for now (call with _lock held)"""
+    taken = datetime.now()
+    while True:
+        stamp = taken.strftime('%Y%m%d_%H%M%S.%f')
+        name = f"horsepower_gym_{stamp}_{label}.db" if label else f"horsepower_gym_{stamp}.db"
+        path = os.path.join(directory, name)
+        if not os.path.exists(path) and not os.path.exists(path + ".tmp"):
+            return path
+        # A coarse clock (Windows) can repeat a timestamp
+        taken += timedelta(microseconds=1)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def snapshots_to_keep(snapshots, retention=None):
+    """
+    Apply the retention policy.
+
+    Args:
+        snapshots: As returned by list_snapshots (newest first)
+        retention: Dict like BACKUP_RETENTION (default: BACKUP_RETENTION)
+
+    Returns:
+        Set of paths to keep
+    """
+    retention = retention or BACKUP_RETENTION
+    keep = {s["path"] for s in snapshots[:retention["last"]]}
+    for period, key in (("daily", lambda t: t.date()), ("weekly", lambda t: t.isocalendar()[:2])):
+        seen = set()
+        for snapshot in snapshots:
+            bucket = key(snapshot["taken"])
+            if bucket in seen:
+                continue
+            if len(seen) == retention[period]:
+                break
+            seen.add(bucket)
+            keep.add(snapshot["path"])
+    return keep
+
+
+def rotate(retention=None):
+    """
+    Delete snapshots the retention policy no longer keeps.
+
+    Returns:
+        List of deleted paths
+    """
+    with _lock:
+        snapshots = list_snapshots()
+        keep = snapshots_to_keep(snapshots, retention)
+        deleted = []
+        for snapshot in snapshots:
+            if snapshot["path"] not in keep:
+                _remove(snapshot["path"])
+                deleted.append(snapshot["path"])
+    return deleted
+
+
+def restore(path, progress=None, publish=True):
+    """
+    Replace the database content with a snapshot.
+
+    The snapshot is verified first and the current database is saved as a
+    "pre-restore" snapshot, so a restore can itself be undone. The copy goes
+    through the backup API into the live file (never a file copy, which
+    would ignore the -wal file), then init_database brings an older
+    snapshot's schema up to date. Every open connection sees the new
+    content on its next query.
+
+    With publish, call on the Tk thread: it publishes a row_id=None change
+    event for every table so the views reload. A worker thread passes
+    publish=False and calls publish_restore() on the Tk thread afterwards.
+
+    Args:
+        path: Snapshot file (from list_snapshots)
+        progress: Optional callback(pages_done, pages_total)
+        publish: Publish the change events (see publish_restore)
+
+    Returns:
+        Path of the pre-restore snapshot
+    """
+    def on_step(status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+
+    # Held from verification to the end of the copy: no scheduled backup
+    # can rotate the snapshot away in between. The pre-restore snapshot is
+    # rotated only after the copy for the same reason.
+    with _lock:
+        problems = verify(path)
+        if problems:
+            raise BackupError("Snapshot failed verification: " + "; ".join(problems[:5]))
+
+        safety_path = _snapshot(label="pre-restore")
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        target = sqlite3.connect(db.DATABASE_PATH, isolation_level=None)
+        try:
+            target.execute(f"PRAGMA busy_timeout={BACKUP_BUSY_TIMEOUT_MS}")
+            source.backup(target, pages=-1, progress=on_step)
+        except sqlite3.Error as e:
+            raise BackupError(f"Restore failed: {e} (the previous data is in {safety_path})") from e
+        finally:
+            source.close()
+            target.close()
+        rotate()
+
+    db.init_database()
+    if publish:
+        publish_restore()
+    return safety_path
+
+
+def publish_restore():
+    """Tell the views that every table changed (after restore; Tk thread only)"""
+    for table in ("members", "payments", "personal_training", "attendance"):
+        events.publish(table, None, events.UPDATE)
+
+
+class BackupScheduler:
+    """
+    Background thread taking a snapshot every BACKUP_INTERVAL_HOURS.
+
+    On start it backs up straight away if the newest snapshot is older than
+    the interval (the app is often closed overnight). The outcome of the
+    last run is kept in last_backup / last_error for the UI; a failure
+    never stops the thread, the next attempt comes a full interval later.
+    """
+
+    def __init__(self, interval_hours=BACKUP_INTERVAL_HOURS):
+        self.interval = interval_hours * 3600
+        self.last_backup = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="backup", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the scheduler (a snapshot in progress is finished first)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _seconds_until_due(self):
+        snapshots = list_snapshots()
+        if not snapshots:
+            return 0
+        age = (datetime.now() - snapshots[0]["taken"]).total_seconds()
+        return min(self.interval, max(0, self.interval - age))
+
+    def _run(self):
+        while True:
+            try:
+                if self._stop.wait(self._seconds_until_due()):
+                    break
+                self.last_backup = backup()
+                self.last_error = None
+            except Exception as e:
+                # Listing the backup folder can fail as well as the backup
+                # itself; whatever it was, report it and keep the thread alive
+                self.last_error = str(e) or type(e).__name__
+                # Try again after a full interval rather than in a tight loop
+                if self._stop.wait(self.interval):
+                    break
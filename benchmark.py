@@ -0,0 +1,1286 @@
+"""
+Load-profile benchmark for Horsepower Gym Management System
+Times every public database.py function (and optionally the construction
+of every view) against a synthetic database, and compares runs
+
+Usage:
+    python benchmark.py --members 5000 --years 3
+    python benchmark.py --compare benchmark_results/<older>.json
+    xvfb-run python benchmark.py --views     (headless view construction)
+    xvfb-run python benchmark.py --members-list   (members list at 1k/10k/100k members)
+    python benchmark.py --members 20000 --years 3 --export   (multi-million-row attendance export)
+    python benchmark.py --backup    (snapshot while check-ins are being recorded)
+    python benchmark.py --stress --writers 4 --readers 4   (check-in and report processes side by side)
+    python benchmark.py --imports   (python -X importtime profile of startup)
+    python benchmark.py --members 50000 --pool   (pooled connections vs a connection per call)
+    python benchmark.py --webcam    (capture pipeline fed by a synthetic camera)
+    python benchmark.py --images    (photo badge and avatar rendering)
+    python benchmark.py --search    (member search: FTS index vs LIKE scan at 10k/100k/1M members)
+
+Results are written to benchmark_results/<git commit>.json.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import database as db
+import synthetic_data
+import exporter
+import backup
+import webcam
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+# Timed calls per function (the median is reported)
+DEFAULT_REPEAT = 20
+
+# Runs slower than this factor against the compared run are flagged
+REGRESSION_FACTOR = 1.25
+
+# Rows written per table by the bulk throughput comparison
+BULK_ROWS = 5000
+
+# Modules that must not be imported before the login window is shown
+# (OpenCV and NumPy load when the webcam dialog opens)
+STARTUP_EXCLUDED_MODULES = ("cv2", "numpy")
+
+# Slowest imports listed by benchmark_imports
+IMPORT_REPORT_LINES = 15
+
+# Synthetic camera used by benchmark_webcam: frame rate, and how long to run (s)
+FAKE_CAMERA_FPS = 30
+WEBCAM_SECONDS = 3
+
+# benchmark_concurrency: check-in writer and report reader processes, how
+# long they run (s), and the profiles compared
+STRESS_WRITERS = 4
+STRESS_READERS = 4
+STRESS_SECONDS = 5
+DB_PROFILES_TO_STRESS = ("default", "safe")
+
+# benchmark_members_list: list sizes, history generated per member (years)
+# and scroll steps timed
+MEMBER_LIST_SIZES = (1_000, 10_000, 100_000)
+MEMBER_LIST_YEARS = 0.1
+MEMBER_LIST_SCROLL_FRAMES = 60
+
+# Member list size used by benchmark_status
+STATUS_MEMBERS = 100_000
+
+# benchmark_search: member table sizes, and queries for a name, the last
+# digits of a phone number, a street and a single member
+SEARCH_SIZES = (10_000, 100_000, 1_000_000)
+SEARCH_QUERIES = ("Kumar", "4567", "MG Road", "Iyer 1234")
+
+# <Configure> events in the simulated login window drag
+LOGIN_DRAG_STEPS = 40
+
+# Connection / schema / transaction management, not part of a load profile
+NOT_BENCHMARKED = {
+    "get_app_directory", "get_connection", "close_connection", "close_all_connections",
+    "init_database", "ensure_database", "run_migrations", "transaction",
+}
+
+
+def _fresh_member(ctx):
+    """Add a throwaway member for functions that modify or delete one"""
+    return db.add_member("Bench Member", f"8{next(ctx['phones']):09d}", "", 30, "Male", "Monthly",
+                         ctx["today"], ctx["month_end"], 1200, "Paid")
+
+
+def _fresh_training(ctx):
+    return db.add_personal_training(ctx["member_id"], "Suriya", 1, 2500, ctx["today"], ctx["month_end"])
+
+
+# Tables large enough that a full SCAN in a query plan is a regression
+PLAN_CHECKED_TABLES = ("members", "payments", "attendance")
+
+# Function name -> tables it reads in full on purpose (whole-table lists and
+# totals); benchmark_query_plans fails on any other full scan of them
+FULL_SCAN_ALLOWED = {
+    "get_all_members": ("members",),            # The whole list, in name order
+    "get_total_members_count": ("members",),
+    "get_dashboard_stats": ("members",),        # Total member count
+    "get_all_payments": ("payments",),          # The whole history, newest first
+}
+
+_SQL_KEYWORDS = {"WHERE", "JOIN", "LEFT", "INNER", "CROSS", "ON", "ORDER", "GROUP", "LIMIT", "SET",
+                 "VALUES", "USING", "UNION", "HAVING", "AS", "SELECT", "DEFAULT", "NATURAL"}
+
+
+# Function name -> ctx -> argument tuple. Every public function of
+# database.py needs an entry here or in NOT_BENCHMARKED.
+CASES = {
+    "get_schema_version": lambda ctx: (),
+    "get_data_version": lambda ctx: (),
+    "get_database_settings": lambda ctx: (),
+    "add_member": lambda ctx: (
+        "Bench Member", f"7{next(ctx['phones']):09d}", "", 30, "Male", "Monthly",
+        ctx["today"], ctx["month_end"], 1200, "Paid"),
+    "update_member": lambda ctx: (
+        ctx["member_id"], ctx["member"]["name"], ctx["member"]["phone"], ctx["member"]["address"],
+        ctx["member"]["age"], ctx["member"]["gender"], ctx["member"]["membership_type"],
+        ctx["member"]["start_date"], ctx["member"]["end_date"], ctx["member"]["fees"],
+        ctx["member"]["payment_status"]),
+    "delete_member": lambda ctx: (_fresh_member(ctx),),
+    "get_all_members": lambda ctx: (),
+    "get_member_by_id": lambda ctx: (ctx["member_id"],),
+    "search_members": lambda ctx: ("Kumar", 50),
+    "get_active_members_count": lambda ctx: (),
+    "get_expired_members_count": lambda ctx: (),
+    "get_total_members_count": lambda ctx: (),
+    "add_personal_training": lambda ctx: (
+        ctx["member_id"], "Suriya", 1, 2500, ctx["today"], ctx["month_end"]),
+    "update_personal_training": lambda ctx: (
+        ctx["training_id"], "Ganesh", 1, 2500, ctx["today"], ctx["month_end"], "Active"),
+    "delete_personal_training": lambda ctx: (_fresh_training(ctx),),
+    "get_member_training": lambda ctx: (ctx["member_id"],),
+    "get_active_training": lambda ctx: (ctx["member_id"],),
+    "get_all_training": lambda ctx: (),
+    "add_attendance": lambda ctx: (ctx["member_id"], None),
+    "get_attendance_record": lambda ctx: (ctx["attendance_id"],),
+    "query_attendance": lambda ctx: (ctx["month_start"], ctx["today"], "Suriya", None, None, 50),
+    "attendance_cursor": lambda ctx: (ctx["attendance"],),
+    "get_today_attendance": lambda ctx: (),
+    "get_member_attendance": lambda ctx: (ctx["member_id"],),
+    "get_attendance_by_trainer": lambda ctx: ("Suriya",),
+    "get_member_attendance_page": lambda ctx: (ctx["member_id"], ctx["attendance_after"]),
+    "get_trainer_attendance_page": lambda ctx: ("Suriya", ctx["attendance_after"]),
+    "get_today_attendance_count": lambda ctx: (),
+    "check_already_checked_in": lambda ctx: (ctx["member_id"],),
+    "get_checked_in_member_ids": lambda ctx: (range(1, 51),),
+    "get_monthly_revenue": lambda ctx: (),
+    "get_dashboard_stats": lambda ctx: (),
+    "verify_admin": lambda ctx: ("admin", "wrong password"),
+    "change_admin_password": lambda ctx: ("bench", "bench"),
+    "get_member_by_phone": lambda ctx: (ctx["member"]["phone"],),
+    "check_phone_exists": lambda ctx: (ctx["member"]["phone"], ctx["member_id"]),
+    "get_member_fee_details": lambda ctx: (ctx["member"]["phone"],),
+    "update_member_status": lambda ctx: (),
+    "add_payment": lambda ctx: (ctx["member_id"], ctx["member"]["phone"], 1200, "Membership"),
+    "update_member_payment": lambda ctx: (ctx["member_id"], 0, 0),
+    "get_member_payments": lambda ctx: (ctx["member_id"],),
+    "get_payment": lambda ctx: (ctx["payment_id"],),
+    "get_all_payments": lambda ctx: (),
+    "get_payments_page": lambda ctx: (ctx["payment_after"],),
+    "payment_cursor": lambda ctx: (ctx["payment"],),
+    "get_pending_payments": lambda ctx: (),
+    "get_today_collections": lambda ctx: (),
+    "get_monthly_collections": lambda ctx: (),
+    "update_member_photo": lambda ctx: (ctx["member_id"], None),
+    "get_member_photo": lambda ctx: (ctx["member_id"],),
+    "get_existing_phones": lambda ctx: ([f"9{i:09d}" for i in range(1000)],),
+    "get_member_ids_by_phone": lambda ctx: ([f"9{i:09d}" for i in range(1000)],),
+    "add_members_batch": lambda ctx: ([
+        ("Bench Member", f"6{next(ctx['phones']):09d}", "", 30, "Male", "Monthly",
+         ctx["today"], ctx["month_end"], 1200, "Paid") for _ in range(100)],),
+    "add_payments_batch": lambda ctx: (
+        [(ctx["member_id"], ctx["member"]["phone"], 1200, "Membership", "", None)] * 100,),
+    "add_personal_training_batch": lambda ctx: (
+        [(ctx["member_id"], "Suriya", 1, 2500, ctx["today"], ctx["month_end"])] * 100,),
+    "add_attendance_batch": lambda ctx: ([(ctx["member_id"], None, None, None)] * 100,),
+    "set_member_payments_batch": lambda ctx: (
+        [(ctx["member_id"], ctx["member"]["amount_paid"], ctx["member"]["pending_amount"],
+          ctx["member"]["last_payment_date"])] * 100,),
+}
+
+
+def public_functions():
+    """Public functions defined in database.py, in source order"""
+    functions = [
+        (name, fn) for name, fn in vars(db).items()
+        if inspect.isfunction(fn) and not name.startswith("_") and fn.__module__ == db.__name__
+    ]
+    return sorted(functions, key=lambda item: item[1].__code__.co_firstlineno)
+
+
+def _context():
+    """Sample ids and cursors from the synthetic data for the CASES arguments"""
+    conn = db.get_connection()
+    today = date.today()
+    # The member with the longest attendance history is the worst case
+    member_id = conn.execute('''
+        SELECT member_id FROM attendance GROUP BY member_id ORDER BY COUNT(*) DESC LIMIT 1
+    ''').fetchone()[0]
+    member = db.get_member_by_id(member_id)
+    attendance = db.get_member_attendance_page(member_id, limit=db.HISTORY_PAGE_SIZE)
+    payments = db.get_payments_page()
+    ctx = {
+        "today": today.strftime('%Y-%m-%d'),
+        "month_start": today.replace(day=1).strftime('%Y-%m-%d'),
+        "month_end": (today + timedelta(days=30)).strftime('%Y-%m-%d'),
+        "member_id": member_id,
+        "member": member,
+        "attendance": attendance[-1],
+        "attendance_id": attendance[-1]["id"],
+        "attendance_after": db.attendance_cursor(attendance[-1]),
+        "payment": payments[-1],
+        "payment_id": payments[-1]["id"],
+        "payment_after": db.payment_cursor(payments[-1]),
+        "phones": iter(range(10 ** 9)),     # Phone numbers for added members
+    }
+    ctx["training_id"] = _fresh_training(ctx)
+    return ctx
+
+
+def benchmark_database(repeat=DEFAULT_REPEAT):
+    """
+    Time every public database.py function on the current database.
+
+    Returns:
+        Dict of function name -> {"median_ms", "min_ms"}
+    """
+    ctx = _context()
+    results = {}
+    for name, fn in public_functions():
+        if name in NOT_BENCHMARKED:
+            continue
+        if name not in CASES:
+            print(f"  {name}: no benchmark case - add one to CASES")
+            continue
+        timings = []
+        for _ in range(repeat):
+            args = CASES[name](ctx)
+            start = time.perf_counter()
+            fn(*args)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+        print(f"  {name:32s} {results[name]['median_ms']:9.3f} ms")
+    return results
+
+
+def benchmark_connection_pool(repeat=DEFAULT_REPEAT):
+    """
+    Time the read functions (get_* / search_* / query_*) with the
+    per-thread connection pool against the way database.py worked before
+    it: every call opening a new sqlite3 connection with default settings
+    and closing it again (included in the time).
+
+    Returns:
+        Dict of "pool:<function>" -> {"median_ms" (pooled), "per_call_ms"}
+    """
+    ctx = _context()
+    pooled = db.get_connection
+    opened = []
+
+    def per_call_connection():
+        conn = sqlite3.connect(db.DATABASE_PATH)
+        conn.row_factory = sqlite3.Row
+        opened.append(conn)
+        return conn
+
+    results = {}
+    for name, fn in public_functions():
+        if name in NOT_BENCHMARKED or name not in CASES or not name.startswith(("get_", "search_", "query_")):
+            continue
+        timings = {"pooled": [], "per_call": []}
+        for _ in range(repeat):
+            for mode, times in timings.items():
+                args = CASES[name](ctx)
+                if mode == "per_call":
+                    db.get_connection = per_call_connection
+                start = time.perf_counter()
+                try:
+                    fn(*args)
+                    for conn in opened:
+                        conn.close()
+                    times.append((time.perf_counter() - start) * 1000)
+                finally:
+                    db.get_connection = pooled
+                    opened.clear()
+        pooled_ms, per_call_ms = statistics.median(timings["pooled"]), statistics.median(timings["per_call"])
+        results[f"pool:{name}"] = {"median_ms": pooled_ms, "per_call_ms": per_call_ms}
+        print(f"  {name:32s} {per_call_ms:9.3f} ms per call -> {pooled_ms:9.3f} ms pooled")
+    pooled_total = sum(r["median_ms"] for r in results.values())
+    per_call_total = sum(r["per_call_ms"] for r in results.values())
+    speedup = statistics.median(r["per_call_ms"] / r["median_ms"] for r in results.values())
+    print(f"  all {len(results)} functions: {per_call_total:.1f} ms -> {pooled_total:.1f} ms "
+          f"({per_call_total / pooled_total:.2f}x), median per function {speedup:.1f}x")
+    return results
+
+
+def _large_table_names(sql):
+    """Dict of name (table or alias) -> PLAN_CHECKED_TABLES table read under it by sql"""
+    names = {}
+    for match in re.finditer(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE):
+        table, alias = match.group(1).lower(), match.group(2)
+        if table in PLAN_CHECKED_TABLES:
+            names[table] = table
+            if alias and alias.upper() not in _SQL_KEYWORDS:
+                names[alias.lower()] = table
+    return names
+
+
+def benchmark_query_plans():
+    """
+    EXPLAIN QUERY PLAN regression check.
+
+    Runs every CASES function once with a trace callback, then runs
+    EXPLAIN QUERY PLAN on each statement it executed. Fails
+    (AssertionError) when a statement fully scans members, payments or
+    attendance (a SCAN step, with or without an index), unless
+    FULL_SCAN_ALLOWED lists that function and table.
+
+    Returns:
+        Dict with "plans:checked" -> {"median_ms": 0, "statements"}
+    """
+    ctx = _context()
+    ctx["phones"] = iter(range(10 ** 8, 10 ** 9))   # Clear of the numbers benchmark_database used
+    conn = db.get_connection()
+    statements = []
+    for name, fn in public_functions():
+        if name in NOT_BENCHMARKED or name not in CASES:
+            continue
+        args = CASES[name](ctx)
+        traced = []
+        conn.set_trace_callback(traced.append)
+        try:
+            fn(*args)
+        finally:
+            conn.set_trace_callback(None)
+        for sql in dict.fromkeys(traced):
+            if sql.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT"):
+                statements.append((name, sql))
+
+    failures = []
+    for name, sql in statements:
+        names = _large_table_names(sql)
+        for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+            detail = row[3]
+            match = re.match(r"SCAN (\w+)", detail)
+            table = names.get(match.group(1).lower()) if match else None
+            if table is not None and table not in FULL_SCAN_ALLOWED.get(name, ()):
+                failures.append(f"{name}: {detail}\n      {' '.join(sql.split())[:200]}")
+    print(f"  {len(statements)} statements from {len({name for name, _ in statements})} functions checked")
+    for failure in failures:
+        print(f"  FULL SCAN {failure}")
+    assert not failures, f"{len(failures)} statements fully scan a large table (see above)"
+    return {"plans:checked": {"median_ms": 0, "statements": len(statements)}}
+
+
+def benchmark_migration_resume(directory, members=35, chunk_size=10):
+    """
+    Interrupted-migration check: rolls a scratch database with `members`
+    members back to before migration 4 (the member search index), runs
+    the migrations with chunk_size rows per chunk and an error after the
+    second chunk, then runs them again the way the next start would.
+    Fails (AssertionError) unless the resumed index passes the FTS5
+    integrity-check and finds every member.
+
+    Returns:
+        Dict with "migration:resume" -> {"median_ms" (resumed run)}
+    """
+    class Interrupted(Exception):
+        pass
+
+    def interrupt(version, description, done, total):
+        if version == 4 and done >= 2 * chunk_size:
+            raise Interrupted()
+
+    database_path, chunk_default = db.DATABASE_PATH, db.MIGRATION_CHUNK_SIZE
+    try:
+        db.DATABASE_PATH = os.path.join(directory, "migration.db")
+        db.ensure_database()
+        conn = db.get_connection()
+        if not db._has_member_search_index(conn):
+            print("  skipped (no FTS5 trigram support)")
+            return {}
+        db.add_members_batch(
+            (f"Resume Member {i}", f"4{i:09d}", "", 30, "Male", "Monthly",
+             date.today().strftime('%Y-%m-%d'), date.today().strftime('%Y-%m-%d'), 1200, "Paid")
+            for i in range(members))
+        conn.executescript('''
+            DROP TRIGGER members_fts_ai;
+            DROP TRIGGER members_fts_ad;
+            DROP TRIGGER members_fts_au;
+            DROP TABLE members_fts;
+            PRAGMA user_version=3;
+        ''')
+
+        db.MIGRATION_CHUNK_SIZE = chunk_size
+        try:
+            db.run_migrations(interrupt)
+            raise AssertionError("the migration was not interrupted")
+        except Interrupted:
+            pass
+        start = time.perf_counter()
+        db.run_migrations()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        conn.execute("INSERT INTO members_fts(members_fts, rank) VALUES('integrity-check', 1)")
+        found = conn.execute("SELECT COUNT(*) FROM members_fts WHERE members_fts MATCH '\"Resume Member\"'").fetchone()[0]
+        assert found == members, f"resumed search index finds {found} of {members} members"
+        print(f"  search index resumed after 2 of {-(-members // chunk_size)} chunks: integrity-check ok")
+        return {"migration:resume": {"median_ms": elapsed}}
+    finally:
+        db.MIGRATION_CHUNK_SIZE = chunk_default
+        db.close_all_connections()
+        db.DATABASE_PATH = database_path
+
+
+def benchmark_bulk(rows=BULK_ROWS):
+    """
+    Compare the per-row add_* functions with their batch variants.
+
+    Returns:
+        Dict of "bulk:<function>" -> {"median_ms" (for all rows), "rows_per_s"}
+    """
+    ctx = _context()
+    member_row = lambda: ("Bench Member", f"5{next(ctx['phones']):09d}", "", 30, "Male", "Monthly",
+                          ctx["today"], ctx["month_end"], 1200, "Paid")
+    member_id, phone = ctx["member_id"], ctx["member"]["phone"]
+    training_row = (member_id, "Suriya", 1, 2500, ctx["today"], ctx["month_end"])
+    pairs = [
+        ("add_member", lambda: db.add_member(*member_row()),
+         "add_members_batch", lambda: db.add_members_batch(member_row() for _ in range(rows))),
+        ("add_payment", lambda: db.add_payment(member_id, phone, 1200, "Membership"),
+         "add_payments_batch",
+         lambda: db.add_payments_batch([(member_id, phone, 1200, "Membership", "", None)] * rows)),
+        ("add_personal_training", lambda: db.add_personal_training(*training_row),
+         "add_personal_training_batch", lambda: db.add_personal_training_batch([training_row] * rows)),
+        ("add_attendance", lambda: db.add_attendance(member_id),
+         "add_attendance_batch", lambda: db.add_attendance_batch([(member_id, None, None, None)] * rows)),
+    ]
+    results = {}
+    for single_name, single, batch_name, batch in pairs:
+        start = time.perf_counter()
+        for _ in range(rows):
+            single()
+        single_s = time.perf_counter() - start
+        start = time.perf_counter()
+        batch()
+        batch_s = time.perf_counter() - start
+        for name, seconds in ((single_name, single_s), (batch_name, batch_s)):
+            results[f"bulk:{name}"] = {"median_ms": seconds * 1000, "rows_per_s": rows / seconds}
+        print(f"  {single_name:24s} {rows / single_s:12,.0f} rows/s   "
+              f"{batch_name:28s} {rows / batch_s:12,.0f} rows/s ({single_s / batch_s:.1f}x)")
+    return results
+
+
+def benchmark_export(directory):
+    """
+    Export the attendance table in every available format.
+
+    A last csv run under tracemalloc records the peak Python memory, which
+    should stay flat (it depends on exporter.EXPORT_FETCH_SIZE, not on the
+    number of rows).
+
+    Returns:
+        Dict of "export:<format>" -> {"median_ms", "rows_per_s", "mb"} and
+        "export:peak_memory" -> {"median_ms": 0, "peak_kb"}
+    """
+    results = {}
+    for fmt in exporter.available_formats():
+        start = time.perf_counter()
+        path, rows = exporter.export(directory, ["attendance"], fmt)["attendance"]
+        seconds = time.perf_counter() - start
+        results[f"export:{fmt}"] = {"median_ms": seconds * 1000, "rows_per_s": rows / seconds,
+                                    "mb": os.path.getsize(path) / 2 ** 20}
+        print(f"  {fmt:10s} {rows:,} rows {rows / seconds:12,.0f} rows/s {results[f'export:{fmt}']['mb']:8.1f} MB")
+
+    tracemalloc.start()
+    try:
+        exporter.export(directory, ["attendance"], "csv")
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    results["export:peak_memory"] = {"median_ms": 0, "peak_kb": peak / 1024}
+    print(f"  peak Python memory during csv export: {peak / 1024:,.0f} KB")
+    return results
+
+
+def benchmark_backup():
+    """
+    Take a snapshot while another thread keeps recording check-ins.
+
+    Fails (AssertionError) unless the backup completes, the writer commits
+    throughout it, and the snapshot passes PRAGMA quick_check.
+
+    Returns:
+        Dict with "backup:online" -> {"median_ms", "writes", "max_write_ms"}
+    """
+    member_id = db.get_connection().execute("SELECT MIN(id) FROM members").fetchone()[0]
+    backup_done = threading.Event()
+    writer = {"writes": 0, "max_write_ms": 0.0, "error": None}
+
+    def write_attendance():
+        try:
+            while not backup_done.is_set():
+                start = time.perf_counter()
+                db.add_attendance(member_id)
+                writer["max_write_ms"] = max(writer["max_write_ms"], (time.perf_counter() - start) * 1000)
+                writer["writes"] += 1
+        except Exception as e:
+            writer["error"] = e
+        finally:
+            db.close_connection()
+
+    thread = threading.Thread(target=write_attendance)
+    thread.start()
+    start = time.perf_counter()
+    try:
+        path = backup.backup(label="benchmark")
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        backup_done.set()
+        thread.join()
+
+    assert writer["error"] is None, f"Concurrent writer failed: {writer['error']}"
+    assert writer["writes"] > 0, "No check-in was recorded while the backup ran"
+    assert not backup.verify(path), "Snapshot failed quick_check"
+    print(f"  {os.path.getsize(path) / 2 ** 20:.1f} MB in {elapsed:.0f} ms while {writer['writes']} check-ins "
+          f"were recorded (slowest {writer['max_write_ms']:.1f} ms)")
+    return {"backup:online": {"median_ms": elapsed, "writes": writer["writes"],
+                              "max_write_ms": writer["max_write_ms"]}}
+
+
+def _percentile(values, fraction):
+    """Value below which `fraction` of the values lie (0 for no values)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _stress_worker(role, path, profile, member_ids, start_at, seconds, seed):
+    """
+    One process of benchmark_concurrency: record check-ins ("writer") or
+    run the report queries ("reader") until the time is up.
+
+    The lock wait is the time to get the lock, measured apart from the
+    work: a writer's BEGIN IMMEDIATE (waits for the write lock, up to
+    busy_timeout), a reader's first read of a transaction (waits for the
+    shared lock; never blocked in WAL mode).
+
+    Returns:
+        Dict with role, ops, errors, waits_ms (per op) and ops_ms (per op)
+    """
+    import random
+    import sqlite3
+    db.DATABASE_PATH = path
+    db.DB_PROFILE = profile
+    rng = random.Random(seed)
+    conn = db.get_connection()
+    stats = {"role": role, "ops": 0, "errors": 0, "waits_ms": [], "ops_ms": []}
+    reports = (db.get_dashboard_stats, db.get_monthly_collections, db.get_pending_payments,
+               db.get_today_attendance)
+
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            if role == "writer":
+                with db.transaction():
+                    locked = time.perf_counter()
+                    db.add_attendance(rng.choice(member_ids))
+            else:
+                conn.execute("BEGIN")
+                try:
+                    conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                    locked = time.perf_counter()
+                    rng.choice(reports)()
+                finally:
+                    conn.rollback()
+        except sqlite3.OperationalError:
+            # "database is locked": busy_timeout ran out
+            stats["errors"] += 1
+            continue
+        end = time.perf_counter()
+        stats["ops"] += 1
+        stats["waits_ms"].append((locked - start) * 1000)
+        stats["ops_ms"].append((end - start) * 1000)
+    db.close_all_connections()
+    return stats
+
+
+def benchmark_concurrency(writers=STRESS_WRITERS, readers=STRESS_READERS, seconds=STRESS_SECONDS):
+    """
+    Multi-process stress test: `writers` processes record check-ins while
+    `readers` processes run dashboard and report queries, once for every
+    DB_PROFILES entry (WAL against the rollback journal).
+
+    Every process has its own connection, exactly like separate front-desk
+    PCs sharing one database file. Fails (AssertionError) if a check-in
+    gives up because busy_timeout ran out.
+
+    Returns:
+        Dict of "concurrency:<profile>:<role>" -> {"median_ms" (lock wait),
+        "p95_wait_ms", "max_wait_ms", "p95_op_ms", "ops_per_s", "errors"}
+    """
+    import multiprocessing
+
+    path = db.DATABASE_PATH
+    member_ids = [row[0] for row in db.get_connection().execute("SELECT id FROM members LIMIT 5000")]
+    original_profile = db.DB_PROFILE
+    results = {}
+    # spawn works the same on Windows (the app's platform) and elsewhere
+    with multiprocessing.get_context("spawn").Pool(writers + readers) as pool:
+        for profile in DB_PROFILES_TO_STRESS:
+            db.init_database(profile=profile)
+            db.close_all_connections()
+            start_at = time.time() + 2   # Lets every process finish starting first
+            jobs = [("writer", path, profile, member_ids, start_at, seconds, i) for i in range(writers)]
+            jobs += [("reader", path, profile, member_ids, start_at, seconds, writers + i) for i in range(readers)]
+            runs = pool.starmap(_stress_worker, jobs)
+
+            for role in ("writer", "reader"):
+                waits = [w for run in runs if run["role"] == role for w in run["waits_ms"]]
+                ops_ms = [o for run in runs if run["role"] == role for o in run["ops_ms"]]
+                errors = sum(run["errors"] for run in runs if run["role"] == role)
+                name = f"concurrency:{profile}:{role}"
+                results[name] = {
+                    "median_ms": statistics.median(waits) if waits else 0.0,
+                    "p95_wait_ms": _percentile(waits, 0.95),
+                    "max_wait_ms": max(waits, default=0.0),
+                    "p95_op_ms": _percentile(ops_ms, 0.95),
+                    "ops_per_s": len(ops_ms) / seconds,
+                    "errors": errors,
+                }
+                r = results[name]
+                print(f"  {profile:8s} {role}s: {r['ops_per_s']:8,.0f} ops/s, lock wait median "
+                      f"{r['median_ms']:.2f} / p95 {r['p95_wait_ms']:.2f} / max {r['max_wait_ms']:.1f} ms, "
+                      f"p95 op {r['p95_op_ms']:.1f} ms, {errors} timeouts")
+    db.init_database(profile=original_profile)
+
+    for profile in DB_PROFILES_TO_STRESS:
+        assert results[f"concurrency:{profile}:writer"]["errors"] == 0, \
+            f"Check-ins timed out waiting for the write lock ({profile} profile)"
+    return results
+
+
+def benchmark_status(members=STATUS_MEMBERS, repeat=5):
+    """
+    Time the membership status of a whole member list: the per-row
+    is_membership_valid / get_remaining_days calls against one
+    member_status.MemberSnapshot, on `members` rows fetched as sqlite3.Row
+    like the members list gets them. Fails if the two disagree.
+
+    Returns:
+        Dict of "status:<case>" -> {"median_ms", "min_ms"}
+    """
+    import utils
+    import member_status
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE members (id INTEGER PRIMARY KEY, end_date TEXT, pending_amount REAL, payment_status TEXT)")
+    conn.execute('''
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO members
+        SELECT i, date('now', 'localtime', ((i * 7919) % 730 - 365) || ' days'), (i % 3) * 400,
+               CASE i % 3 WHEN 0 THEN 'Paid' ELSE 'Pending' END
+        FROM n
+    ''', (members,))
+    rows = conn.execute("SELECT * FROM members").fetchall()
+    conn.close()
+
+    def per_row():
+        statuses = []
+        for row in rows:
+            is_valid = utils.is_membership_valid(row['end_date'])
+            remaining = utils.get_remaining_days(row['end_date'])
+            statuses.append((is_valid, remaining, member_status.expiry_bucket(remaining)))
+        return statuses
+
+    snapshot = member_status.MemberSnapshot(rows)   # Also pays for importing NumPy
+    cases = {
+        "per_row": per_row,
+        "snapshot": lambda: member_status.MemberSnapshot(rows),
+        "classify": snapshot.classify,
+    }
+    results = {}
+    for name, fn in cases.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[f"status:{name}"] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+        print(f"  status:{name:10s} {results[f'status:{name}']['median_ms']:9.1f} ms for {members:,} members")
+    print(f"  snapshot is {results['status:per_row']['median_ms'] / results['status:snapshot']['median_ms']:.0f}x "
+          f"faster than per row")
+
+    expected = per_row()
+    assert [snapshot.status(i) for i in range(len(rows))] == expected, "snapshot disagrees with the per-row status"
+    return results
+
+
+def benchmark_search(directory, sizes=SEARCH_SIZES, repeat=5):
+    """
+    Time search_members through the members_fts trigram index against the
+    LIKE scan it falls back to, on member tables of every size (members
+    only, no history). Every query runs unlimited, like the members list,
+    and with the attendance view's limit of 8. Fails if the two paths find
+    different members.
+
+    Returns:
+        Dict of "search:<path>:<size>:<query>[:8]" -> {"median_ms", "min_ms"}
+    """
+    import random
+
+    database_path = db.DATABASE_PATH
+    results = {}
+    try:
+        for size in sizes:
+            db.DATABASE_PATH = os.path.join(directory, f"search_{size}.db")
+            db.ensure_database()
+            rng = random.Random(0)
+            members = synthetic_data._members(rng, size, 1, date.today(), 1)
+            while True:
+                chunk = [member for _, member in zip(range(10_000), members)]
+                if not chunk:
+                    break
+                with db.transaction():
+                    db.add_members_batch(chunk)
+            conn = db.get_connection()
+            assert db._has_member_search_index(conn), "SQLite was built without FTS5 trigram support"
+
+            for query in SEARCH_QUERIES:
+                for limit in (-1, 8):
+                    medians = {}
+                    for path, fn in (("fts", db._search_members_fts), ("like", db._search_members_like)):
+                        timings = []
+                        for _ in range(repeat):
+                            start = time.perf_counter()
+                            rows = fn(conn, query, limit)
+                            timings.append((time.perf_counter() - start) * 1000)
+                        name = f"search:{path}:{size}:{query}" + (f":{limit}" if limit >= 0 else "")
+                        results[name] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+                        medians[path] = results[name]["median_ms"]
+                        if limit < 0:
+                            found = len(rows)
+                            if path == "fts":
+                                expected = {row["id"] for row in rows}
+                            else:
+                                assert {row["id"] for row in rows} == expected, \
+                                    f"FTS and LIKE search disagree for {query!r}"
+                    label = f"'{query}'" + (f" limit {limit}" if limit >= 0 else f" ({found:,} found)")
+                    print(f"  {size:>9,} members {label:30s} fts {medians['fts']:8.2f} ms, "
+                          f"like {medians['like']:8.2f} ms")
+            db.close_all_connections()
+    finally:
+        db.close_all_connections()
+        db.DATABASE_PATH = database_path
+    return results
+
+
+def benchmark_images(repeat=200):
+    """
+    Time the payment badge and default avatar rendering per thumbnail.
+
+    Returns:
+        Dict of "image:<case>" -> {"median_ms", "min_ms"}
+    """
+    from PIL import Image
+    import utils
+
+    photo = Image.effect_noise((200, 200), 64).convert("RGB")
+    thumb = photo.resize((40, 40))
+    cases = {
+        "badge_overlay_pending": lambda: utils.create_badge_overlay(photo, 500),
+        "badge_overlay_paid": lambda: utils.create_badge_overlay(photo, 0),
+        "mini_badge_overlay": lambda: utils.create_mini_badge_overlay(thumb, 500),
+        "default_avatar_with_badge": lambda: utils.create_default_avatar((150, 150), 500),
+        "member_photo_with_badge": lambda: utils.load_member_photo_with_badge(None, 500),
+    }
+    results = {}
+    for name, fn in cases.items():
+        fn()   # First call pays for font loading / caches
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[f"image:{name}"] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+        print(f"  image:{name:26s} {results[f'image:{name}']['median_ms']:9.3f} ms")
+    return results
+
+
+def benchmark_login_background(directory, steps=LOGIN_DRAG_STEPS):
+    """
+    Time the login background per window size along a simulated drag of
+    the window edge from 1024x640 to 1920x1080.
+
+    Uses assets/login_bg.jpg, or a synthetic 4K photo when the asset is
+    missing. "full_pass" is the resize + darken + blur at window size that
+    every <Configure> event used to trigger; "first_render" is the first
+    window with nothing cached (renders one level); "frame_cold" is the
+    drag right after it, rendering the other levels it needs on first use;
+    "frame" is one render once they are all on disk.
+
+    Returns:
+        Dict of "login_bg:<case>" -> {"median_ms", "max_ms"}
+    """
+    from PIL import Image, ImageEnhance, ImageFilter
+    import utils
+
+    source = utils.get_resource_path(os.path.join("assets", "login_bg.jpg"))
+    if not os.path.exists(source):
+        source = os.path.join(directory, "login_bg.jpg")
+        Image.merge("RGB", [Image.linear_gradient("L").resize((3840, 2160)),
+                            Image.effect_noise((3840, 2160), 48),
+                            Image.radial_gradient("L").resize((3840, 2160))]).save(source, quality=90)
+    cache_dir = os.path.join(directory, "cache")
+    sizes = [(1024 + (1920 - 1024) * i // (steps - 1), 640 + (1080 - 640) * i // (steps - 1)) for i in range(steps)]
+
+    def full_pass(width, height):
+        original = Image.open(source)
+        ratio = original.width / original.height
+        if width / height > ratio:
+            fit = (int(height * ratio), height)
+        else:
+            fit = (width, int(width / ratio))
+        canvas = Image.new("RGB", (width, height), (13, 13, 13))
+        canvas.paste(original.resize(fit, Image.Resampling.LANCZOS), ((width - fit[0]) // 2, (height - fit[1]) // 2))
+        ImageEnhance.Brightness(canvas).enhance(0.45).filter(ImageFilter.GaussianBlur(radius=1))
+
+    def timed(fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        return (time.perf_counter() - start) * 1000
+
+    results = {}
+    full = [timed(full_pass, *size) for size in sizes[::max(1, steps // 10)]]
+    results["login_bg:full_pass"] = {"median_ms": statistics.median(full), "max_ms": max(full)}
+    first = timed(utils.render_login_background, source, *sizes[-1], cache_dir)
+    results["login_bg:first_render"] = {"median_ms": first, "max_ms": first}
+    cold = [timed(utils.render_login_background, source, width, height, cache_dir) for width, height in sizes]
+    results["login_bg:frame_cold"] = {"median_ms": statistics.median(cold), "max_ms": max(cold)}
+    # Later runs start with empty memory caches but the levels on disk
+    utils._login_bg_level.cache_clear()
+    frames = [timed(utils.render_login_background, source, width, height, cache_dir) for width, height in sizes]
+    results["login_bg:frame"] = {"median_ms": statistics.median(frames), "max_ms": max(frames)}
+    for name, value in results.items():
+        print(f"  {name:24s} {value['median_ms']:9.2f} ms median, {value['max_ms']:9.2f} ms max")
+    print(f"  A {steps}-event drag renders once after it settles: "
+          f"{sum(full) / len(full) * steps:.0f} ms of filtering before, {statistics.median(frames):.0f} ms now")
+    return results
+
+
+class _FakeVideoCapture:
+    """cv2.VideoCapture stand-in producing synthetic 640x480 frames at a fixed rate"""
+
+    def __init__(self, device, fps=FAKE_CAMERA_FPS):
+        import numpy as np
+        self.fps = fps
+        self.frames = 0
+        self.start = time.perf_counter()
+        width, height = webcam.CAPTURE_SIZE
+        self.gradient = np.tile(np.arange(width, dtype=np.uint8), (height, 1))
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        import numpy as np
+        self.frames += 1
+        delay = self.start + self.frames / self.fps - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if image is None:
+            image = np.empty(self.gradient.shape + (3,), np.uint8)
+        image[:, :, 0] = self.gradient
+        image[:, :, 1] = self.frames % 256
+        image[:, :, 2] = 255 - self.gradient
+        return True, image
+
+    def release(self):
+        pass
+
+
+def benchmark_webcam(seconds=WEBCAM_SECONDS):
+    """
+    Run webcam.FrameGrabber on a synthetic camera and show its frames the
+    way WebcamCaptureDialog does (PhotoImage.paste, if a display is
+    available; otherwise PIL paste). The per-frame Tk thread cost of the
+    previous preview code (cvtColor, two Image.fromarray, LANCZOS resize)
+    is measured on the same frames for comparison.
+
+    Returns:
+        Dict of "webcam:preview" -> {"median_ms" (Tk time per shown frame),
+        "fps_captured", "fps_shown"} and "webcam:legacy_preview" -> {"median_ms"}
+    """
+    import cv2
+    from PIL import Image
+
+    root = photo = None
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+        photo = ImageTk.PhotoImage(Image.new("RGB", webcam.PREVIEW_SIZE))
+        paste = photo.paste
+    except Exception:
+        # No display: paste into a PIL image instead
+        target = Image.new("RGB", webcam.PREVIEW_SIZE)
+        paste = target.paste
+
+    grabber = webcam.FrameGrabber(capture_factory=_FakeVideoCapture)
+    grabber.start()
+    seq, timings = 0, []
+    end = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < end:
+            latest = grabber.latest_preview(seq)
+            if latest is not None:
+                start = time.perf_counter()
+                seq, frame = latest
+                paste(Image.fromarray(frame))
+                timings.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.015)
+        assert grabber.capture() is not None, "No frame captured"
+    finally:
+        grabber.stop()
+        if root is not None:
+            del photo
+            root.destroy()
+    assert grabber.error is None, grabber.error
+    assert timings, "No preview frame shown"
+
+    legacy = []
+    raw = _FakeVideoCapture(0, fps=1e9).read()[1]
+    for _ in range(30):
+        start = time.perf_counter()
+        rgb = cv2.cvtColor(raw, cv2.COLOR_BGR2RGB)
+        Image.fromarray(rgb).resize(webcam.PREVIEW_SIZE, Image.Resampling.LANCZOS)
+        Image.fromarray(rgb)
+        legacy.append((time.perf_counter() - start) * 1000)
+
+    results = {
+        "webcam:preview": {"median_ms": statistics.median(timings), "fps_captured": grabber.fps(),
+                           "fps_shown": len(timings) / seconds},
+        "webcam:legacy_preview": {"median_ms": statistics.median(legacy)},
+    }
+    print(f"  {grabber.fps():.1f} fps captured, {len(timings) / seconds:.1f} fps shown, "
+          f"{results['webcam:preview']['median_ms']:.2f} ms Tk time per frame "
+          f"({'PhotoImage' if root is not None else 'PIL, no display'}; "
+          f"previous preview code: {results['webcam:legacy_preview']['median_ms']:.2f} ms)")
+    return results
+
+
+def benchmark_views(repeat=3):
+    """
+    Time the construction of every sidebar view (needs a display; use xvfb-run).
+
+    Returns:
+        Dict of "view:<name>" -> {"median_ms", "min_ms"}
+    """
+    import customtkinter as ctk
+    import db_executor
+    from main import VIEW_CLASSES, get_view_class
+
+    root = ctk.CTk()
+    root.withdraw()
+    db_executor.install(root)
+    results = {}
+    try:
+        for name in VIEW_CLASSES:
+            view_class = get_view_class(name)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                view = view_class(root)
+                root.update_idletasks()
+                timings.append((time.perf_counter() - start) * 1000)
+                view.destroy()
+            results[f"view:{name}"] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+            print(f"  view:{name:27s} {results[f'view:{name}']['median_ms']:9.3f} ms")
+    finally:
+        db_executor.shutdown()
+        root.destroy()
+    return results
+
+
+def _resident_mb():
+    """Resident memory of this process in MB (psutil if installed, else /proc), or None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def benchmark_members_list(directory, sizes=MEMBER_LIST_SIZES, scroll_frames=MEMBER_LIST_SCROLL_FRAMES):
+    """
+    Members list at scale (needs a display; use xvfb-run).
+
+    For every size a database with that many members (and a few weeks of
+    history) is generated in directory, then the members view is built and
+    scrolled through the list:
+    first_paint is construction until the loaded list is drawn, frame is
+    one scroll step of 3 rows (median and max), rss_mb is the growth of
+    resident memory while the loaded view exists.
+
+    Returns:
+        Dict of "members_list:<size>" -> {"median_ms" (first paint),
+        "frame_median_ms", "frame_max_ms", "rss_mb"}
+    """
+    import customtkinter as ctk
+    import db_executor
+    from views.members import MembersView
+
+    database_path = db.DATABASE_PATH
+    root = ctk.CTk()
+    root.geometry("1280x800")
+    db_executor.install(root)
+    results = {}
+    try:
+        for size in sizes:
+            db.DATABASE_PATH = os.path.join(directory, f"members_{size}.db")
+            db.ensure_database()
+            synthetic_data.generate(size, MEMBER_LIST_YEARS)
+            root.update()
+            rss_before = _resident_mb()
+
+            start = time.perf_counter()
+            view = MembersView(root)
+            view.pack(fill="both", expand=True)
+            deadline = start + 300
+            while not view.members_list.get_items() and time.perf_counter() < deadline:
+                root.update()
+            root.update_idletasks()
+            first_paint = (time.perf_counter() - start) * 1000
+            rss_after = _resident_mb()
+
+            frames = []
+            for frame in range(1, scroll_frames + 1):
+                start = time.perf_counter()
+                view.members_list.scroll_to(min(size - 1, frame * 3 + 15))
+                root.update_idletasks()
+                frames.append((time.perf_counter() - start) * 1000)
+            view.destroy()
+
+            rss = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            results[f"members_list:{size}"] = {
+                "median_ms": first_paint,
+                "frame_median_ms": statistics.median(frames),
+                "frame_max_ms": max(frames),
+                "rss_mb": rss,
+            }
+            memory = f"+{rss:.0f} MB" if rss is not None else "n/a"
+            print(f"  {size:>8,} members: first paint {first_paint:8.0f} ms, scroll frame "
+                  f"{statistics.median(frames):6.2f} ms median / {max(frames):6.2f} ms max, memory {memory}")
+    finally:
+        db_executor.shutdown()
+        root.destroy()
+        db.DATABASE_PATH = database_path
+    return results
+
+
+def benchmark_imports(report_path=None):
+    """
+    Profile the imports of main.py with python -X importtime.
+
+    Fails (AssertionError) if a STARTUP_EXCLUDED_MODULES module is imported
+    before the login window. The full importtime output is written to
+    report_path.
+
+    Returns:
+        Dict of "imports:main" -> {"median_ms": cumulative import time of main}
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, cwd=here
+    )
+    if output.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{output.stderr[-2000:]}")
+    if report_path:
+        with open(report_path, "w") as f:
+            f.write(output.stderr)
+
+    # "import time: self [us] | cumulative | imported package"
+    imports = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = int(cumulative) / 1000
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)
+    for name, ms in slowest[:IMPORT_REPORT_LINES]:
+        print(f"  {name:60s} {ms:9.1f} ms")
+
+    loaded = [name for name in STARTUP_EXCLUDED_MODULES if name in imports]
+    assert not loaded, f"Imported before the login window: {', '.join(loaded)}"
+    return {"imports:main": {"median_ms": imports["main"]}}
+
+
+def benchmark_startup(repeat=3):
+    """
+    Time python main.py --startup-benchmark (import to first paint of the
+    login window; needs a display).
+
+    Returns:
+        Dict of "startup:login_window" -> {"median_ms", "min_ms"}
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "main.py", "--startup-benchmark"],
+            capture_output=True, text=True, cwd=here, check=True
+        ).stdout
+        # "Startup (import to first paint): 812 ms"
+        timings.append(float(output.rsplit(":", 1)[1].split()[0]))
+    result = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+    print(f"  startup:login_window            {result['median_ms']:9.3f} ms")
+    return {"startup:login_window": result}
+
+
+def compare(current, previous):
+    """Print the change of every timing against an earlier run"""
+    print(f"\nCompared with {previous['label']} ({previous['members']} members):")
+    for name, timing in current["results"].items():
+        before = previous["results"].get(name)
+        if before is None:
+            continue
+        ratio = timing["median_ms"] / max(before["median_ms"], 1e-6)
+        flag = "  <-- slower" if ratio > REGRESSION_FACTOR else ""
+        print(f"  {name:32s} {before['median_ms']:9.3f} -> {timing['median_ms']:9.3f} ms ({ratio:5.2f}x){flag}")
+
+
+def _git_label():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return time.strftime("%Y%m%d-%H%M%S")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database.py on synthetic data")
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--pool", action="store_true",
+                        help="Also time the read functions with a new connection per call, as before pooling")
+    parser.add_argument("--images", action="store_true", help="Also time photo badge rendering")
+    parser.add_argument("--status", action="store_true",
+                        help=f"Also time membership status for {STATUS_MEMBERS:,} members")
+    parser.add_argument("--search", action="store_true",
+                        help="Also time member search through FTS and LIKE at 10k/100k/1M members")
+    parser.add_argument("--login", action="store_true", help="Also time the login background during a resize")
+    parser.add_argument("--webcam", action="store_true",
+                        help="Also run the webcam pipeline on a synthetic camera (needs OpenCV)")
+    parser.add_argument("--imports", action="store_true",
+                        help="Also profile startup imports (fails if OpenCV/NumPy load before login)")
+    parser.add_argument("--stress", action="store_true",
+                        help="Also run check-in writer and report reader processes side by side")
+    parser.add_argument("--writers", type=int, default=STRESS_WRITERS)
+    parser.add_argument("--readers", type=int, default=STRESS_READERS)
+    parser.add_argument("--backup", action="store_true", help="Also time a backup under concurrent writes")
+    parser.add_argument("--export", action="store_true", help="Also time exporting the attendance table")
+    parser.add_argument("--views", action="store_true", help="Also time view construction (needs a display)")
+    parser.add_argument("--members-list", action="store_true",
+                        help="Also time the members list at 1k/10k/100k members (needs a display)")
+    parser.add_argument("--label", help="Name of the results file (default: current git commit)")
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    args = parser.parse_args()
+    label = args.label or _git_label()
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        db.DATABASE_PATH = os.path.join(scratch, "benchmark.db")
+        db.ensure_database()
+
+        print(f"Generating {args.members} members, {args.years} years of history...")
+        start = time.perf_counter()
+        counts = synthetic_data.generate(args.members, args.years, args.seed)
+        print(f"  {counts} in {time.perf_counter() - start:.1f} s")
+
+        print("database.py:")
+        results = benchmark_database(args.repeat)
+        print("Query plans:")
+        results.update(benchmark_query_plans())
+        print("Interrupted migration:")
+        results.update(benchmark_migration_resume(scratch))
+        if args.pool:
+            print("Connection pool (per call -> pooled):")
+            results.update(benchmark_connection_pool(args.repeat))
+        print(f"Bulk inserts ({BULK_ROWS} rows each):")
+        results.update(benchmark_bulk())
+        if args.images:
+            print("Photo badges:")
+            results.update(benchmark_images())
+        if args.status:
+            print("Membership status:")
+            results.update(benchmark_status())
+        if args.search:
+            print("Member search:")
+            results.update(benchmark_search(scratch))
+        if args.login:
+            print("Login background:")
+            results.update(benchmark_login_background(scratch))
+        if args.webcam:
+            print("Webcam capture:")
+            results.update(benchmark_webcam())
+        if args.imports:
+            report = os.path.join(RESULTS_DIR, f"{label}.importtime.txt")
+            print(f"Startup imports (full report in {report}):")
+            results.update(benchmark_imports(report))
+        if args.stress:
+            print(f"Concurrency ({args.writers} writer and {args.readers} reader processes):")
+            results.update(benchmark_concurrency(args.writers, args.readers))
+        if args.backup:
+            print("Online backup:")
+            results.update(benchmark_backup())
+        if args.export:
+            print("Attendance export:")
+            results.update(benchmark_export(os.path.join(scratch, "export")))
+        if args.views:
+            print("Views:")
+            results.update(benchmark_views())
+            print("Startup:")
+            results.update(benchmark_startup())
+        if args.members_list:
+            print("Members list:")
+            results.update(benchmark_members_list(scratch))
+        db.close_all_connections()
+
+    run = {
+        "label": label,
+        "members": args.members,
+        "years": args.years,
+        "seed": args.seed,
+        "counts": counts,
+        "results": results,
+    }
+    path = os.path.join(RESULTS_DIR, f"{run['label']}.json")
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(run, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -67,6 +67,12 @@ def build_exe():
         "--hidden-import=PIL.ImageEnhance",
         "--hidden-import=cv2",
         "--hidden-import=numpy",
+        # Sidebar views are imported by name on first navigation (main.get_view_class)
+        "--hidden-import=views.dashboard",
+        "--hidden-import=views.members",
+        "--hidden-import=views.payment",
+        "--hidden-import=views.training",
+        "--hidden-import=views.attendance",
         # Collect all required packages
         "--collect-all=customtkinter",
         "--collect-all=cv2",
@@ -6,8 +6,11 @@ Handles all SQLite database operations
 import sqlite3
 import os
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime, date
 import hashlib
+import events
 
 
 def get_app_directory():
@@ -26,18 +29,211 @@ def get_app_directory():
 DATABASE_PATH = os.path.join(get_app_directory(), 'horsepower_gym.db')
 
 
+# Number of prepared statements kept per connection. Every query in this
+# module is a fixed string, so they all fit comfortably in the cache.
+STATEMENT_CACHE_SIZE = 256
+
+# SQLite tuning profiles.
+# "default" runs in WAL mode so front-desk writes (check-ins, payments) and
+# report reads no longer block each other. "safe" keeps the classic rollback
+# journal with full fsyncs, for databases stored on network/USB drives where
+# WAL's shared-memory file is not supported.
+DB_PROFILES = {
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,       # negative = KiB, i.e. ~16 MB page cache
+        "mmap_size": 64 * 1024 * 1024,
+        "busy_timeout": 5000,       # ms to wait for a lock before failing
+        "temp_store": "MEMORY",
+    },
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "busy_timeout": 10000,
+        "temp_store": "DEFAULT",
+    },
+}
+
+# Active profile name (change with init_database(profile=...))
+DB_PROFILE = "default"
+
+# Pragmas that live in the database file and only need to be set once
+_PERSISTENT_PRAGMAS = ("journal_mode",)
+
+# One long-lived connection per thread (sqlite3 connections must not be
+# shared between threads without external locking)
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
+# Bumped by close_all_connections; a thread whose connection belongs to an
+# older generation (closed from another thread) opens a fresh one
+_generation = 0
+
+
+def _apply_connection_pragmas(conn):
+    """Apply the per-connection pragmas of the active profile"""
+    for name, value in DB_PROFILES[DB_PROFILE].items():
+        if name in _PERSISTENT_PRAGMAS:
+            continue
+        conn.execute(f"PRAGMA {name}={value}")
+
+
 def get_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    """
+    Get the database connection for the current thread.
+    
+    The connection is opened on first use and then reused for every
+    later call from the same thread, so callers must NOT close it.
+    Use close_all_connections() on application exit.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.path == DATABASE_PATH and _local.generation == _generation:
+        return conn
+    
+    if conn is not None:
+        # DATABASE_PATH was changed (e.g. pointing at a scratch database), or
+        # close_all_connections already closed this one
+        _discard_connection(conn)
+    
+    conn = sqlite3.connect(
+        DATABASE_PATH,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False
+    )
     conn.row_factory = sqlite3.Row
+    _apply_connection_pragmas(conn)
+    _local.conn = conn
+    _local.path = DATABASE_PATH
+    with _connections_lock:
+        _local.generation = _generation
+        _connections.append(conn)
     return conn
 
 
-def init_database():
-    """Initialize database with all required tables"""
+def _discard_connection(conn):
+    """Close a pooled connection and forget it"""
+    with _connections_lock:
+        if conn in _connections:
+            _connections.remove(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_connection():
+    """Close the current thread's connection"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _discard_connection(conn)
+        _local.conn = None
+
+
+def close_all_connections():
+    """
+    Close every pooled connection (on application exit, or to reopen them
+    with new settings). Other threads get a new connection on their next
+    get_connection().
+    """
+    global _generation
+    with _connections_lock:
+        _generation += 1
+        conns = list(_connections)
+        _connections.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _local.conn = None
+
+
+def init_database(profile=None, progress=None):
+    """
+    Initialize the database and bring its schema up to date.
+
+    The schema version is kept in PRAGMA user_version, so on an up-to-date
+    database this is a single integer comparison (see run_migrations).
+
+    Args:
+        profile: Name of a DB_PROFILES entry to switch to (default: keep DB_PROFILE)
+        progress: Optional callback(version, description, done, total) for
+                  chunked migrations
+
+    Returns:
+        Dict of the effective SQLite settings (see get_database_settings)
+    """
+    global DB_PROFILE
+    if profile is not None and profile != DB_PROFILE:
+        if profile not in DB_PROFILES:
+            raise ValueError(f"Unknown database profile: {profile}")
+        DB_PROFILE = profile
+        # Reopen connections so they pick up the new per-connection pragmas
+        close_all_connections()
+
     conn = get_connection()
+
+    # journal_mode is stored in the database file, so set it once here
+    conn.execute(f"PRAGMA journal_mode={DB_PROFILES[DB_PROFILE]['journal_mode']}")
+
+    current = get_schema_version()
+    if current < SCHEMA_VERSION:
+        run_migrations(progress)
+    elif current > SCHEMA_VERSION:
+        print(f"Warning: database schema v{current} is newer than this application (v{SCHEMA_VERSION})")
+
+    _initialized.add(DATABASE_PATH)
+    return get_database_settings()
+
+
+# Database paths init_database has already run against in this process
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def ensure_database():
+    """
+    Initialize the database once per process (call before first use).
+
+    Importing this module does not touch the disk; the application calls
+    this on startup. Later calls return immediately.
+    """
+    if DATABASE_PATH in _initialized:
+        return
+    with _init_lock:
+        if DATABASE_PATH not in _initialized:
+            init_database()
+
+
+# ============ SCHEMA MIGRATIONS ============
+#
+# Every schema change is a numbered migration. Never edit a migration that
+# has shipped; append a new one instead. A migration is either a plain
+# function (runs in one transaction) or a generator that yields
+# (done, total) after each chunk - every chunk is committed separately so
+# large tables can be migrated without holding the write lock for long.
+
+# Rows per transaction for chunked migrations
+MIGRATION_CHUNK_SIZE = 5000
+
+# Columns added to members after the first release: (name, definition)
+_MEMBER_EXTRA_COLUMNS = [
+    ("last_payment_date", "TEXT"),
+    ("amount_paid", "REAL DEFAULT 0"),
+    ("pending_amount", "REAL DEFAULT 0"),
+    ("status", "TEXT DEFAULT 'Active'"),
+    ("photo_path", "TEXT"),
+]
+
+
+def _migration_1_base_schema(conn):
+    """Create the tables, add late members columns and the default admin"""
     cursor = conn.cursor()
-    
+
     # Members table with enhanced payment tracking
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS members (
@@ -61,27 +257,12 @@ def init_database():
         )
     ''')
     
-    # Add new columns to existing members table if they don't exist
-    try:
-        cursor.execute("ALTER TABLE members ADD COLUMN last_payment_date TEXT")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE members ADD COLUMN amount_paid REAL DEFAULT 0")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE members ADD COLUMN pending_amount REAL DEFAULT 0")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE members ADD COLUMN status TEXT DEFAULT 'Active'")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE members ADD COLUMN photo_path TEXT")
-    except:
-        pass
+    # Databases created before these columns existed
+    cursor.execute("PRAGMA table_info(members)")
+    existing = {row[1] for row in cursor.fetchall()}
+    for column, definition in _MEMBER_EXTRA_COLUMNS:
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE members ADD COLUMN {column} {definition}")
     
     # Payments table for tracking all payment transactions
     cursor.execute('''
@@ -142,50 +323,369 @@ def init_database():
         default_password = hashlib.sha256("admin123".encode()).hexdigest()
         cursor.execute("INSERT INTO admin (username, password_hash) VALUES (?, ?)", 
                       ("admin", default_password))
+
+
+def _migration_2_indexes(conn):
+    """Secondary indexes for the hot queries"""
+    _ensure_indexes(conn.cursor())
+
+
+def _migration_3_backfill_member_status(conn):
+    """
+    Recompute members.status from end_date.
+
+    The status column was added with DEFAULT 'Active', so members that
+    already existed in older databases were all marked Active.
+    """
+    today = date.today().strftime('%Y-%m-%d')
+    for done, total, low, high in _iter_id_chunks(conn, "members"):
+        conn.execute('''
+            UPDATE members SET status = CASE WHEN end_date < ? THEN 'Expired' ELSE 'Active' END
+            WHERE id BETWEEN ? AND ?
+        ''', (today, low, high))
+        yield done, total
+
+
+def _migration_5_dashboard_indexes(conn):
+    """Swap the members payment indexes for covering ones (see INDEXES)"""
+    _ensure_indexes(conn.cursor())
+
+
+def _migration_6_payment_history_index(conn):
+    """Order payments by (payment_date, id) for keyset paging (see INDEXES)"""
+    _ensure_indexes(conn.cursor())
+
+
+def _fts5_trigram_supported(conn):
+    """FTS5 compiled in and SQLite new enough for the trigram tokenizer (3.34)"""
+    if sqlite3.sqlite_version_info < (3, 34, 0):
+        return False
+    options = {row[0] for row in conn.execute("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+
+def _migration_4_member_search_index(conn):
+    """
+    Full-text index over members name/phone/address for search_members.
+
+    An external-content FTS5 table with the trigram tokenizer, so any
+    substring of 3+ characters (including the last digits of a phone
+    number) is an index lookup. Triggers keep it in sync row by row.
+    Without FTS5 support nothing is created and search uses LIKE. Safe to
+    run again after an interruption (the backfill starts from scratch).
+    """
+    if not _fts5_trigram_supported(conn):
+        print("FTS5 trigram tokenizer not available - member search will use LIKE")
+        return
+
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS members_fts USING fts5(
+            name, phone, address,
+            content='members', content_rowid='id', tokenize='trigram'
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS members_fts_ai AFTER INSERT ON members BEGIN
+            INSERT INTO members_fts(rowid, name, phone, address)
+            VALUES (new.id, new.name, new.phone, new.address);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS members_fts_ad AFTER DELETE ON members BEGIN
+            INSERT INTO members_fts(members_fts, rowid, name, phone, address)
+            VALUES ('delete', old.id, old.name, old.phone, old.address);
+        END
+    ''')
+    # Only the indexed columns - payment/status updates don't touch the index
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS members_fts_au AFTER UPDATE OF name, phone, address ON members BEGIN
+            INSERT INTO members_fts(members_fts, rowid, name, phone, address)
+            VALUES ('delete', old.id, old.name, old.phone, old.address);
+            INSERT INTO members_fts(rowid, name, phone, address)
+            VALUES (new.id, new.name, new.phone, new.address);
+        END
+    ''')
+
+    # Index the existing members in chunks. Chunks commit one by one but
+    # user_version only moves at the end, so a resumed run starts over:
+    # empty the index first, or rows indexed last time would go in twice
+    # and corrupt it
+    conn.execute("INSERT INTO members_fts(members_fts) VALUES('delete-all')")
+    for done, total, low, high in _iter_id_chunks(conn, "members"):
+        conn.execute('''
+            INSERT INTO members_fts(rowid, name, phone, address)
+            SELECT id, name, phone, address FROM members WHERE id BETWEEN ? AND ?
+        ''', (low, high))
+        yield done, total
+
+
+def _iter_id_chunks(conn, table, chunk_size=None):
+    """
+    Split a table into rowid ranges of at most chunk_size rows.
+
+    Yields (done, total, low_id, high_id); done counts the rows up to and
+    including this chunk.
+    """
+    chunk_size = chunk_size or MIGRATION_CHUNK_SIZE
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    done = 0
+    last_id = 0
+    while done < total:
+        ids = conn.execute(
+            f"SELECT id FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, chunk_size)
+        ).fetchall()
+        if not ids:
+            break
+        low, high = ids[0][0], ids[-1][0]
+        done += len(ids)
+        last_id = high
+        yield done, total, low, high
+
+
+# (version, description, migration) - versions must be consecutive
+MIGRATIONS = [
+    (1, "Base schema", _migration_1_base_schema),
+    (2, "Secondary indexes", _migration_2_indexes),
+    (3, "Backfill member status", _migration_3_backfill_member_status),
+    (4, "Member search index", _migration_4_member_search_index),
+    (5, "Covering indexes for dashboard stats", _migration_5_dashboard_indexes),
+    (6, "Keyset index for payment history", _migration_6_payment_history_index),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version():
+    """Get the schema version stored in the database file"""
+    return get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(progress=None):
+    """
+    Apply every migration newer than the database's user_version.
+
+    Each migration (or each chunk of a chunked migration) runs in its own
+    BEGIN IMMEDIATE transaction; user_version is bumped in the same
+    transaction as the migration's last statement, so a crash leaves the
+    database at a consistent version and the migration resumes on next start.
+
+    Args:
+        progress: Optional callback(version, description, done, total)
+
+    Returns:
+        The new schema version
+    """
+    conn = get_connection()
+    current = get_schema_version()
+
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            steps = migration(conn)
+            if steps is not None:
+                # Chunked migration: commit after every chunk
+                for done, total in steps:
+                    conn.commit()
+                    if progress:
+                        progress(version, description, done, total)
+                    conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"PRAGMA user_version={version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            print(f"Error applying migration {version} ({description})")
+            raise
+
+        current = version
+
+    return current
+
+
+# Secondary indexes, as (name, table(columns)).
+# Index names carry a version suffix: when an index definition changes, give
+# it a new suffix and add a migration that calls _ensure_indexes, which drops
+# the old one automatically.
+INDEXES = [
+    # query_attendance by date range, get_today_attendance_count
+    ("idx_attendance_date_time_v1", "attendance(date, check_in_time)"),
+    # query_attendance by trainer (optionally with a date range)
+    ("idx_attendance_trainer_date_v1", "attendance(trainer_name, date, check_in_time)"),
+    # query_attendance by member, check_already_checked_in
+    ("idx_attendance_member_date_v1", "attendance(member_id, date, check_in_time)"),
+    # get_member_payments
+    ("idx_payments_member_date_v1", "payments(member_id, payment_date)"),
+    # get_all_payments, get_payments_page (the implicit trailing rowid orders ties by id),
+    # get_today_collections, get_monthly_collections
+    ("idx_payments_date_v2", "payments(payment_date)"),
+    # get_active_training, get_member_training, get_member_fee_details
+    ("idx_training_member_status_end_v1", "personal_training(member_id, status, end_date)"),
+    # get_all_training
+    ("idx_training_end_date_v1", "personal_training(end_date)"),
+    # get_monthly_revenue (training part)
+    ("idx_training_start_date_v1", "personal_training(start_date)"),
+    # active/expired counts, update_member_status
+    ("idx_members_end_date_v1", "members(end_date)"),
+    # get_all_members, search_members ordering
+    ("idx_members_name_v1", "members(name)"),
+    # Phone lookups (older databases were created without the UNIQUE constraint)
+    ("idx_members_phone_v1", "members(phone)"),
+    # get_monthly_revenue (membership part), get_pending_payments, get_dashboard_stats
+    # (fees makes the revenue sum index-only)
+    ("idx_members_payment_status_v2", "members(payment_status, start_date, fees)"),
+    # get_pending_payments, get_dashboard_stats
+    ("idx_members_pending_amount_v2", "members(pending_amount, payment_status)"),
+]
+
+
+def _ensure_indexes(cursor):
+    """Create missing indexes from INDEXES and drop ones from older index sets"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx\\_%' ESCAPE '\\'")
+    existing = {row[0] for row in cursor.fetchall()}
+    wanted = {name for name, _ in INDEXES}
+
+    for name in existing - wanted:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for name, definition in INDEXES:
+        if name not in existing:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+    # Refresh planner statistics so the new indexes are actually chosen
+    # (analysis_limit keeps this fast on large tables)
+    if wanted - existing:
+        cursor.execute("PRAGMA analysis_limit=1000")
+        cursor.execute("ANALYZE")
+
+
+def get_data_version():
+    """
+    Token that changes whenever the database content changes.
+
+    PRAGMA data_version moves when another connection (thread or process)
+    commits, total_changes when this thread's connection writes. Compare
+    tokens from the same thread only.
+    """
+    conn = get_connection()
+    return (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+
+
+def get_database_settings():
+    """
+    Report the SQLite settings actually in effect on this thread's connection.
     
-    conn.commit()
-    conn.close()
+    SQLite silently ignores some requests (e.g. WAL on a network drive),
+    so this reads every pragma back instead of trusting the profile.
+    """
+    conn = get_connection()
+    settings = {"profile": DB_PROFILE, "sqlite_version": sqlite3.sqlite_version}
+    for name in DB_PROFILES[DB_PROFILE]:
+        settings[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+    settings["user_version"] = conn.execute("PRAGMA user_version").fetchone()[0]
+    return settings
+
+
+# ============ TRANSACTIONS ============
+
+# Events of a transaction() beyond this many are collapsed to one
+# row_id=None event per table and operation
+BATCH_EVENT_LIMIT = 50
+
+
+@contextmanager
+def transaction():
+    """
+    Run several writes in one transaction (one commit, one fsync).
+
+        with db.transaction():
+            for member_id in ids:
+                db.add_attendance(member_id)
+
+    Every write function of this module joins the open transaction
+    instead of committing on its own. Change events are held back until
+    the commit and dropped on rollback. Nested calls join the outer
+    transaction.
+    """
+    conn = get_connection()
+    if getattr(_local, 'pending_events', None) is not None:
+        yield conn
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    _local.pending_events = []
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        pending, _local.pending_events = _local.pending_events, None
+
+    if len(pending) > BATCH_EVENT_LIMIT:
+        pending = list(dict.fromkeys((table, None, operation) for table, _, operation in pending))
+    for table, row_id, operation in pending:
+        events.publish(table, row_id, operation)
+
+
+@contextmanager
+def _write_transaction():
+    """Commit the enclosed writes, unless they are part of a transaction()"""
+    conn = get_connection()
+    if getattr(_local, 'pending_events', None) is not None:
+        yield conn
+    else:
+        with conn:
+            yield conn
+
+
+def _publish(table, row_id, operation):
+    """Publish a change event now, or at the commit of the open transaction()"""
+    pending = getattr(_local, 'pending_events', None)
+    if pending is not None:
+        pending.append((table, row_id, operation))
+    else:
+        events.publish(table, row_id, operation)
 
 
 # ============ MEMBER OPERATIONS ============
 
 def add_member(name, phone, address, age, gender, membership_type, start_date, end_date, fees, payment_status):
     """Add a new member"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO members (name, phone, address, age, gender, membership_type, 
-                           start_date, end_date, fees, payment_status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (name, phone, address, age, gender, membership_type, start_date, end_date, fees, payment_status))
-    member_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO members (name, phone, address, age, gender, membership_type, 
+                               start_date, end_date, fees, payment_status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, phone, address, age, gender, membership_type, start_date, end_date, fees, payment_status))
+        member_id = cursor.lastrowid
+    _publish("members", member_id, events.INSERT)
     return member_id
 
 
 def update_member(member_id, name, phone, address, age, gender, membership_type, 
                   start_date, end_date, fees, payment_status):
     """Update member details"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE members SET name=?, phone=?, address=?, age=?, gender=?, 
-               membership_type=?, start_date=?, end_date=?, fees=?, payment_status=?
-        WHERE id=?
-    ''', (name, phone, address, age, gender, membership_type, start_date, end_date, 
-          fees, payment_status, member_id))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE members SET name=?, phone=?, address=?, age=?, gender=?, 
+                   membership_type=?, start_date=?, end_date=?, fees=?, payment_status=?
+            WHERE id=?
+        ''', (name, phone, address, age, gender, membership_type, start_date, end_date, 
+              fees, payment_status, member_id))
+    _publish("members", member_id, events.UPDATE)
 
 
 def delete_member(member_id):
     """Delete a member"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM members WHERE id=?", (member_id,))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM members WHERE id=?", (member_id,))
+    _publish("members", member_id, events.DELETE)
 
 
 def get_all_members():
@@ -194,7 +694,6 @@ def get_all_members():
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM members ORDER BY name")
     members = cursor.fetchall()
-    conn.close()
     return members
 
 
@@ -204,22 +703,69 @@ def get_member_by_id(member_id):
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM members WHERE id=?", (member_id,))
     member = cursor.fetchone()
-    conn.close()
     return member
 
 
-def search_members(query):
-    """Search members by name or phone"""
+def search_members(query, limit=None):
+    """
+    Search members by name, phone or address (limit: max rows, default all).
+
+    Uses the members_fts trigram index for queries of 3+ characters; results
+    are ranked name-prefix matches first, then phone-suffix matches (the
+    last digits of a number), then by FTS relevance. Shorter queries, and
+    databases without FTS5, fall back to a LIKE scan of the same columns
+    ordered by name.
+    """
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
+    limit = -1 if limit is None else limit
+    
+    if len(query) >= 3 and _has_member_search_index(conn):
+        return _search_members_fts(conn, query, limit)
+    return _search_members_like(conn, query, limit)
+
+
+def _like_escape(text):
+    """Escape LIKE wildcards in user input (use with ESCAPE '\\')"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _search_members_fts(conn, query, limit):
+    """search_members through the members_fts trigram index"""
+    # A quoted FTS5 string is matched as a substring by the trigram tokenizer
+    fts_query = '"' + query.replace('"', '""') + '"'
+    pattern = _like_escape(query)
+    cursor = conn.execute('''
+        SELECT m.* FROM members_fts f
+        JOIN members m ON m.id = f.rowid
+        WHERE members_fts MATCH ?
+        ORDER BY
+            CASE
+                WHEN m.name LIKE ? ESCAPE '\\' THEN 0
+                WHEN m.phone LIKE ? ESCAPE '\\' THEN 1
+                ELSE 2
+            END,
+            f.rank, m.name
+        LIMIT ?
+    ''', (fts_query, f'{pattern}%', f'%{pattern}', limit))
+    return cursor.fetchall()
+
+
+def _search_members_like(conn, query, limit):
+    """search_members as a LIKE scan over the columns members_fts indexes"""
+    pattern = f'%{_like_escape(query)}%'
+    cursor = conn.execute('''
         SELECT * FROM members 
-        WHERE name LIKE ? OR phone LIKE ?
+        WHERE name LIKE ?1 ESCAPE '\\' OR phone LIKE ?1 ESCAPE '\\' OR address LIKE ?1 ESCAPE '\\'
         ORDER BY name
-    ''', (f'%{query}%', f'%{query}%'))
-    members = cursor.fetchall()
-    conn.close()
-    return members
+        LIMIT ?2
+    ''', (pattern, limit))
+    return cursor.fetchall()
+
+
+def _has_member_search_index(conn):
+    """True if migration 4 could create members_fts on this database"""
+    cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='members_fts'")
+    return cursor.fetchone() is not None
 
 
 def get_active_members_count():
@@ -229,7 +775,6 @@ def get_active_members_count():
     today = date.today().strftime('%Y-%m-%d')
     cursor.execute("SELECT COUNT(*) FROM members WHERE end_date >= ?", (today,))
     count = cursor.fetchone()[0]
-    conn.close()
     return count
 
 
@@ -240,7 +785,6 @@ def get_expired_members_count():
     today = date.today().strftime('%Y-%m-%d')
     cursor.execute("SELECT COUNT(*) FROM members WHERE end_date < ?", (today,))
     count = cursor.fetchone()[0]
-    conn.close()
     return count
 
 
@@ -250,7 +794,6 @@ def get_total_members_count():
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(*) FROM members")
     count = cursor.fetchone()[0]
-    conn.close()
     return count
 
 
@@ -258,38 +801,35 @@ def get_total_members_count():
 
 def add_personal_training(member_id, trainer_name, plan_duration, fee, start_date, end_date):
     """Add personal training for a member"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO personal_training (member_id, trainer_name, plan_duration, fee, start_date, end_date)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (member_id, trainer_name, plan_duration, fee, start_date, end_date))
-    training_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO personal_training (member_id, trainer_name, plan_duration, fee, start_date, end_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (member_id, trainer_name, plan_duration, fee, start_date, end_date))
+        training_id = cursor.lastrowid
+    _publish("personal_training", training_id, events.INSERT)
     return training_id
 
 
 def update_personal_training(training_id, trainer_name, plan_duration, fee, start_date, end_date, status):
     """Update personal training details"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE personal_training 
-        SET trainer_name=?, plan_duration=?, fee=?, start_date=?, end_date=?, status=?
-        WHERE id=?
-    ''', (trainer_name, plan_duration, fee, start_date, end_date, status, training_id))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE personal_training 
+            SET trainer_name=?, plan_duration=?, fee=?, start_date=?, end_date=?, status=?
+            WHERE id=?
+        ''', (trainer_name, plan_duration, fee, start_date, end_date, status, training_id))
+    _publish("personal_training", training_id, events.UPDATE)
 
 
 def delete_personal_training(training_id):
     """Delete personal training record"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM personal_training WHERE id=?", (training_id,))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM personal_training WHERE id=?", (training_id,))
+    _publish("personal_training", training_id, events.DELETE)
 
 
 def get_member_training(member_id):
@@ -300,7 +840,6 @@ def get_member_training(member_id):
         SELECT * FROM personal_training WHERE member_id=? ORDER BY start_date DESC
     ''', (member_id,))
     training = cursor.fetchall()
-    conn.close()
     return training
 
 
@@ -315,7 +854,6 @@ def get_active_training(member_id):
         ORDER BY end_date DESC LIMIT 1
     ''', (member_id, today))
     training = cursor.fetchone()
-    conn.close()
     return training
 
 
@@ -330,7 +868,6 @@ def get_all_training():
         ORDER BY pt.end_date DESC
     ''')
     training = cursor.fetchall()
-    conn.close()
     return training
 
 
@@ -338,60 +875,132 @@ def get_all_training():
 
 def add_attendance(member_id, trainer_name=None):
     """Add attendance record"""
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        now = datetime.now()
+        cursor.execute('''
+            INSERT INTO attendance (member_id, check_in_time, date, trainer_name)
+            VALUES (?, ?, ?, ?)
+        ''', (member_id, now.strftime('%H:%M:%S'), now.strftime('%Y-%m-%d'), trainer_name))
+        attendance_id = cursor.lastrowid
+    _publish("attendance", attendance_id, events.INSERT)
+    return attendance_id
+
+
+def get_attendance_record(attendance_id):
+    """Get one attendance record with member name/phone (same columns as get_today_attendance)"""
     conn = get_connection()
     cursor = conn.cursor()
-    now = datetime.now()
     cursor.execute('''
-        INSERT INTO attendance (member_id, check_in_time, date, trainer_name)
-        VALUES (?, ?, ?, ?)
-    ''', (member_id, now.strftime('%H:%M:%S'), now.strftime('%Y-%m-%d'), trainer_name))
-    conn.commit()
-    conn.close()
+        SELECT a.*, m.name as member_name, m.phone as member_phone
+        FROM attendance a
+        JOIN members m ON a.member_id = m.id
+        WHERE a.id = ?
+    ''', (attendance_id,))
+    return cursor.fetchone()
+
 
+def query_attendance(date_from=None, date_to=None, trainer_name=None, member_id=None,
+                     after=None, limit=None):
+    """
+    Attendance records with member name/phone, latest first.
+
+    Every filter is optional and pushed into SQL, so each combination is
+    one range scan of a matching index (see INDEXES): trainer and member
+    filters use their (..., date, check_in_time) indexes, a date range
+    alone uses the date index.
+
+    Args:
+        date_from: First date to include ('YYYY-MM-DD'), or None
+        date_to: Last date to include ('YYYY-MM-DD'), or None
+        trainer_name: Only check-ins with this trainer
+        member_id: Only this member's check-ins
+        after: Keyset cursor of the last row of the previous page
+               (see attendance_cursor), or None to start from the latest
+        limit: Max rows (default all)
+    """
+    conditions = []
+    params = []
+    if trainer_name is not None:
+        conditions.append("a.trainer_name = ?")
+        params.append(trainer_name)
+    if member_id is not None:
+        conditions.append("a.member_id = ?")
+        params.append(member_id)
+    if date_from is not None:
+        conditions.append("a.date >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("a.date <= ?")
+        params.append(date_to)
+    if after is not None:
+        conditions.append("(a.date, a.check_in_time, a.id) < (?, ?, ?)")
+        params.extend(after)
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    params.append(-1 if limit is None else limit)
 
-def get_today_attendance():
-    """Get today's attendance"""
     conn = get_connection()
     cursor = conn.cursor()
-    today = date.today().strftime('%Y-%m-%d')
-    cursor.execute('''
+    cursor.execute(f'''
         SELECT a.*, m.name as member_name, m.phone as member_phone
         FROM attendance a
         JOIN members m ON a.member_id = m.id
-        WHERE a.date = ?
-        ORDER BY a.check_in_time DESC
-    ''', (today,))
-    attendance = cursor.fetchall()
-    conn.close()
-    return attendance
+        {where}
+        ORDER BY a.date DESC, a.check_in_time DESC, a.id DESC
+        LIMIT ?
+    ''', params)
+    return cursor.fetchall()
+
+
+def attendance_cursor(record):
+    """Keyset cursor of an attendance row, for the after= argument of the attendance queries"""
+    return (record['date'], record['check_in_time'], record['id'])
+
+
+def get_today_attendance(limit=None, trainer_name=None):
+    """Get today's attendance, latest first (limit: max rows, default all)"""
+    today = date.today().strftime('%Y-%m-%d')
+    return query_attendance(date_from=today, date_to=today, trainer_name=trainer_name, limit=limit)
 
 
 def get_member_attendance(member_id):
     """Get attendance history for a member"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM attendance WHERE member_id=? ORDER BY date DESC, check_in_time DESC
-    ''', (member_id,))
-    attendance = cursor.fetchall()
-    conn.close()
-    return attendance
+    return query_attendance(member_id=member_id)
 
 
 def get_attendance_by_trainer(trainer_name):
     """Get attendance by trainer"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT a.*, m.name as member_name
-        FROM attendance a
-        JOIN members m ON a.member_id = m.id
-        WHERE a.trainer_name = ?
-        ORDER BY a.date DESC, a.check_in_time DESC
-    ''', (trainer_name,))
-    attendance = cursor.fetchall()
-    conn.close()
-    return attendance
+    return query_attendance(trainer_name=trainer_name)
+
+
+# Rows per page of the payment / attendance history queries
+HISTORY_PAGE_SIZE = 50
+
+
+def get_member_attendance_page(member_id, after=None, limit=None):
+    """
+    One page of a member's attendance history, latest first.
+
+    Keyset pagination: pass the cursor of the last row of the previous page
+    as after, so every page is one index range scan however long the
+    history is (see attendance_cursor).
+
+    Args:
+        member_id: Member to list
+        after: (date, check_in_time, id) cursor, or None for the first page
+        limit: Rows per page (default HISTORY_PAGE_SIZE)
+    """
+    return query_attendance(member_id=member_id, after=after, limit=limit or HISTORY_PAGE_SIZE)
+
+
+def get_trainer_attendance_page(trainer_name, after=None, limit=None):
+    """
+    One page of a trainer's attendance history, latest first.
+
+    Same columns as get_attendance_by_trainer; after and limit work as in
+    get_member_attendance_page.
+    """
+    return query_attendance(trainer_name=trainer_name, after=after, limit=limit or HISTORY_PAGE_SIZE)
 
 
 def get_today_attendance_count():
@@ -401,7 +1010,6 @@ def get_today_attendance_count():
     today = date.today().strftime('%Y-%m-%d')
     cursor.execute("SELECT COUNT(*) FROM attendance WHERE date=?", (today,))
     count = cursor.fetchone()[0]
-    conn.close()
     return count
 
 
@@ -412,10 +1020,25 @@ def check_already_checked_in(member_id):
     today = date.today().strftime('%Y-%m-%d')
     cursor.execute("SELECT COUNT(*) FROM attendance WHERE member_id=? AND date=?", (member_id, today))
     count = cursor.fetchone()[0]
-    conn.close()
     return count > 0
 
 
+def get_checked_in_member_ids(member_ids):
+    """Get the subset of member_ids that already checked in today (one query)"""
+    member_ids = list(member_ids)
+    if not member_ids:
+        return set()
+    conn = get_connection()
+    cursor = conn.cursor()
+    today = date.today().strftime('%Y-%m-%d')
+    placeholders = ",".join("?" * len(member_ids))
+    cursor.execute(f'''
+        SELECT DISTINCT member_id FROM attendance
+        WHERE date=? AND member_id IN ({placeholders})
+    ''', [today] + member_ids)
+    return {row[0] for row in cursor.fetchall()}
+
+
 # ============ REVENUE OPERATIONS ============
 
 def get_monthly_revenue():
@@ -435,10 +1058,53 @@ def get_monthly_revenue():
     ''', (first_day,))
     training_revenue = cursor.fetchone()[0]
     
-    conn.close()
     return membership_revenue + training_revenue
 
 
+def get_dashboard_stats():
+    """
+    Get every dashboard figure in one query.
+
+    Each figure is a scalar subquery answered from a covering index (see
+    INDEXES). The result is cached per thread until get_data_version()
+    changes, so a refresh with nothing new costs one pragma.
+
+    Returns:
+        Dict with total_members, active_members, expired_members,
+        today_attendance, monthly_revenue, pending_payments, today_collections
+    """
+    conn = get_connection()
+    today = date.today().strftime('%Y-%m-%d')
+    cache_key = (DATABASE_PATH, today, get_data_version())
+    
+    cached = getattr(_local, 'dashboard_stats', None)
+    if cached is not None and cached[0] == cache_key:
+        return dict(cached[1])
+    
+    cursor = conn.cursor()
+    first_day = date.today().replace(day=1).strftime('%Y-%m-%d')
+    cursor.execute('''
+        SELECT
+            (SELECT COUNT(*) FROM members) AS total_members,
+            (SELECT COUNT(*) FROM members WHERE end_date >= :today) AS active_members,
+            (SELECT COUNT(*) FROM attendance WHERE date = :today) AS today_attendance,
+            (SELECT COALESCE(SUM(fees), 0) FROM members
+                WHERE payment_status = 'Paid' AND start_date >= :first_day)
+            + (SELECT COALESCE(SUM(fee), 0) FROM personal_training
+                WHERE start_date >= :first_day) AS monthly_revenue,
+            (SELECT COUNT(*) FROM members WHERE payment_status = 'Pending')
+            + (SELECT COUNT(*) FROM members
+                WHERE pending_amount > 0 AND payment_status != 'Pending') AS pending_payments,
+            (SELECT COALESCE(SUM(amount), 0) FROM payments
+                WHERE payment_date = :today) AS today_collections
+    ''', {"today": today, "first_day": first_day})
+    stats = dict(cursor.fetchone())
+    stats["expired_members"] = stats["total_members"] - stats["active_members"]
+    
+    _local.dashboard_stats = (cache_key, stats)
+    return dict(stats)
+
+
 # ============ ADMIN OPERATIONS ============
 
 def verify_admin(username, password):
@@ -449,23 +1115,17 @@ def verify_admin(username, password):
     cursor.execute("SELECT * FROM admin WHERE username=? AND password_hash=?", 
                   (username, password_hash))
     admin = cursor.fetchone()
-    conn.close()
     return admin is not None
 
 
 def change_admin_password(username, new_password):
     """Change admin password"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    password_hash = hashlib.sha256(new_password.encode()).hexdigest()
-    cursor.execute("UPDATE admin SET password_hash=? WHERE username=?", 
-                  (password_hash, username))
-    conn.commit()
-    conn.close()
-
-
-# Initialize database on import
-init_database()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        password_hash = hashlib.sha256(new_password.encode()).hexdigest()
+        cursor.execute("UPDATE admin SET password_hash=? WHERE username=?", 
+                      (password_hash, username))
+    _publish("admin", None, events.UPDATE)
 
 
 # ============ PHONE VERIFICATION OPERATIONS ============
@@ -477,7 +1137,6 @@ def get_member_by_phone(phone):
     phone = phone.strip().replace(" ", "").replace("-", "")
     cursor.execute("SELECT * FROM members WHERE phone=?", (phone,))
     member = cursor.fetchone()
-    conn.close()
     return member
 
 
@@ -491,7 +1150,6 @@ def check_phone_exists(phone, exclude_member_id=None):
     else:
         cursor.execute("SELECT COUNT(*) FROM members WHERE phone=?", (phone,))
     count = cursor.fetchone()[0]
-    conn.close()
     return count > 0
 
 
@@ -514,67 +1172,66 @@ def get_member_fee_details(phone):
         FROM members m WHERE m.phone=?
     ''', (phone,))
     member = cursor.fetchone()
-    conn.close()
     return member
 
 
 def update_member_status():
     """Update membership status based on end_date (Active/Expired)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    today = date.today().strftime('%Y-%m-%d')
-    cursor.execute("UPDATE members SET status='Expired' WHERE end_date < ?", (today,))
-    cursor.execute("UPDATE members SET status='Active' WHERE end_date >= ?", (today,))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        today = date.today().strftime('%Y-%m-%d')
+        # Only touch rows whose status actually changes
+        cursor.execute("UPDATE members SET status='Expired' WHERE end_date < ? AND status IS NOT 'Expired'", (today,))
+        changed = cursor.rowcount
+        cursor.execute("UPDATE members SET status='Active' WHERE end_date >= ? AND status IS NOT 'Active'", (today,))
+        changed += cursor.rowcount
+    if changed:
+        _publish("members", None, events.UPDATE)
 
 
 # ============ PAYMENT OPERATIONS ============
 
 def add_payment(member_id, phone, amount, payment_type, notes=""):
     """Add a payment record"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    today = date.today().strftime('%Y-%m-%d')
-    cursor.execute('''
-        INSERT INTO payments (member_id, phone, amount, payment_date, payment_type, notes)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (member_id, phone, amount, today, payment_type, notes))
-    payment_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        today = date.today().strftime('%Y-%m-%d')
+        cursor.execute('''
+            INSERT INTO payments (member_id, phone, amount, payment_date, payment_type, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (member_id, phone, amount, today, payment_type, notes))
+        payment_id = cursor.lastrowid
+    _publish("payments", payment_id, events.INSERT)
     return payment_id
 
 
 def update_member_payment(member_id, amount_paid, pending_amount, new_end_date=None):
     """Update member's payment information after payment"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    today = date.today().strftime('%Y-%m-%d')
-    
-    if new_end_date:
-        cursor.execute('''
-            UPDATE members SET 
-                amount_paid = amount_paid + ?,
-                pending_amount = ?,
-                last_payment_date = ?,
-                payment_status = 'Paid',
-                end_date = ?,
-                status = 'Active'
-            WHERE id = ?
-        ''', (amount_paid, pending_amount, today, new_end_date, member_id))
-    else:
-        cursor.execute('''
-            UPDATE members SET 
-                amount_paid = amount_paid + ?,
-                pending_amount = ?,
-                last_payment_date = ?,
-                payment_status = CASE WHEN ? = 0 THEN 'Paid' ELSE 'Pending' END
-            WHERE id = ?
-        ''', (amount_paid, pending_amount, today, pending_amount, member_id))
-    
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        today = date.today().strftime('%Y-%m-%d')
+
+        if new_end_date:
+            cursor.execute('''
+                UPDATE members SET 
+                    amount_paid = amount_paid + ?,
+                    pending_amount = ?,
+                    last_payment_date = ?,
+                    payment_status = 'Paid',
+                    end_date = ?,
+                    status = 'Active'
+                WHERE id = ?
+            ''', (amount_paid, pending_amount, today, new_end_date, member_id))
+        else:
+            cursor.execute('''
+                UPDATE members SET 
+                    amount_paid = amount_paid + ?,
+                    pending_amount = ?,
+                    last_payment_date = ?,
+                    payment_status = CASE WHEN ? = 0 THEN 'Paid' ELSE 'Pending' END
+                WHERE id = ?
+            ''', (amount_paid, pending_amount, today, pending_amount, member_id))
+    _publish("members", member_id, events.UPDATE)
 
 
 def get_member_payments(member_id):
@@ -585,10 +1242,22 @@ def get_member_payments(member_id):
         SELECT * FROM payments WHERE member_id=? ORDER BY payment_date DESC
     ''', (member_id,))
     payments = cursor.fetchall()
-    conn.close()
     return payments
 
 
+def get_payment(payment_id):
+    """Get one payment record with member name (same columns as get_all_payments)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT p.*, m.name as member_name 
+        FROM payments p
+        JOIN members m ON p.member_id = m.id
+        WHERE p.id = ?
+    ''', (payment_id,))
+    return cursor.fetchone()
+
+
 def get_all_payments():
     """Get all payment records with member names"""
     conn = get_connection()
@@ -597,24 +1266,68 @@ def get_all_payments():
         SELECT p.*, m.name as member_name 
         FROM payments p
         JOIN members m ON p.member_id = m.id
-        ORDER BY p.payment_date DESC, p.created_at DESC
+        ORDER BY p.payment_date DESC, p.id DESC
     ''')
     payments = cursor.fetchall()
-    conn.close()
     return payments
 
 
+def get_payments_page(after=None, limit=None):
+    """
+    One page of payment records with member names, latest first.
+
+    Keyset pagination: pass the cursor of the last row of the previous page
+    as after, so fetching page 100 costs the same as page 1 (see
+    payment_cursor). Ordered like get_all_payments.
+
+    Args:
+        after: (payment_date, id) cursor, or None for the first page
+        limit: Rows per page (default HISTORY_PAGE_SIZE)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    limit = limit or HISTORY_PAGE_SIZE
+    if after is None:
+        cursor.execute('''
+            SELECT p.*, m.name as member_name
+            FROM payments p
+            JOIN members m ON p.member_id = m.id
+            ORDER BY p.payment_date DESC, p.id DESC
+            LIMIT ?
+        ''', (limit,))
+    else:
+        cursor.execute('''
+            SELECT p.*, m.name as member_name
+            FROM payments p
+            JOIN members m ON p.member_id = m.id
+            WHERE (p.payment_date, p.id) < (?, ?)
+            ORDER BY p.payment_date DESC, p.id DESC
+            LIMIT ?
+        ''', (*after, limit))
+    return cursor.fetchall()
+
+
+def payment_cursor(payment):
+    """Keyset cursor of a payment row, for the after= argument of get_payments_page"""
+    return (payment['payment_date'], payment['id'])
+
+
 def get_pending_payments():
     """Get members with pending payments"""
     conn = get_connection()
     cursor = conn.cursor()
+    # UNION instead of OR so each branch can use its own index; the ids are
+    # collected first because with ORDER BY name on the UNION itself SQLite
+    # scans the name index for the second branch
     cursor.execute('''
-        SELECT * FROM members 
-        WHERE payment_status = 'Pending' OR pending_amount > 0
+        SELECT * FROM members WHERE id IN (
+            SELECT id FROM members WHERE payment_status = 'Pending'
+            UNION
+            SELECT id FROM members WHERE pending_amount > 0
+        )
         ORDER BY name
     ''')
     members = cursor.fetchall()
-    conn.close()
     return members
 
 
@@ -627,7 +1340,6 @@ def get_today_collections():
         SELECT COALESCE(SUM(amount), 0) FROM payments WHERE payment_date = ?
     ''', (today,))
     total = cursor.fetchone()[0]
-    conn.close()
     return total
 
 
@@ -640,17 +1352,15 @@ def get_monthly_collections():
         SELECT COALESCE(SUM(amount), 0) FROM payments WHERE payment_date >= ?
     ''', (first_day,))
     total = cursor.fetchone()[0]
-    conn.close()
     return total
 
 
 def update_member_photo(member_id, photo_path):
     """Update member's photo path"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('UPDATE members SET photo_path = ? WHERE id = ?', (photo_path, member_id))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('UPDATE members SET photo_path = ? WHERE id = ?', (photo_path, member_id))
+    _publish("members", member_id, events.UPDATE)
 
 
 def get_member_photo(member_id):
@@ -659,5 +1369,163 @@ def get_member_photo(member_id):
     cursor = conn.cursor()
     cursor.execute('SELECT photo_path FROM members WHERE id = ?', (member_id,))
     result = cursor.fetchone()
-    conn.close()
     return result['photo_path'] if result else None
+
+
+# ============ BULK OPERATIONS ============
+#
+# Batch variants of the add_* functions for imports and replayed offline
+# queues: one executemany() in one transaction instead of one commit per
+# row. They join an open transaction() like every other write, and
+# publish a single row_id=None event per table.
+
+# Phones per IN (...) query in get_existing_phones (below SQLite's variable limit)
+PHONE_LOOKUP_CHUNK = 500
+
+
+def _normalize_phone(phone):
+    return phone.strip().replace(" ", "").replace("-", "")
+
+
+def get_member_ids_by_phone(phones):
+    """Map the registered ones of phones (normalized like check_phone_exists) to member ids"""
+    phones = list(dict.fromkeys(_normalize_phone(phone) for phone in phones))
+    conn = get_connection()
+    member_ids = {}
+    for i in range(0, len(phones), PHONE_LOOKUP_CHUNK):
+        chunk = phones[i:i + PHONE_LOOKUP_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = conn.execute(f"SELECT phone, id FROM members WHERE phone IN ({placeholders})", chunk)
+        member_ids.update(cursor.fetchall())
+    return member_ids
+
+
+def get_existing_phones(phones):
+    """Get the subset of phones (normalized like check_phone_exists) already registered"""
+    return set(get_member_ids_by_phone(phones))
+
+
+def _insert_many(table, sql, rows):
+    """
+    executemany() an INSERT and return the new row ids.
+
+    The rows are inserted in one write transaction, so nobody else can
+    insert in between and AUTOINCREMENT hands out consecutive ids ending
+    at last_insert_rowid().
+    """
+    with _write_transaction() as conn:
+        cursor = conn.executemany(sql, rows)
+        count = cursor.rowcount
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    if count <= 0:
+        return []
+    _publish(table, None, events.INSERT)
+    return list(range(last_id - count + 1, last_id + 1))
+
+
+def add_members_batch(members):
+    """
+    Add many members in one transaction.
+
+    Phone numbers are normalized (spaces and dashes removed) and checked
+    up front: if any is already registered, or appears twice in members,
+    nothing is inserted.
+
+    Args:
+        members: Iterable of tuples in add_member argument order
+
+    Returns:
+        List of the new member ids, in input order
+
+    Raises:
+        ValueError: Duplicate phone numbers (listed in the message)
+    """
+    members = list(members)
+    phones = [_normalize_phone(member[1]) for member in members]
+    seen = set()
+    duplicates = {phone for phone in phones if phone in seen or seen.add(phone)}
+    duplicates |= get_existing_phones(phones)
+    if duplicates:
+        raise ValueError(f"Phone numbers already registered: {', '.join(sorted(duplicates))}")
+
+    return _insert_many("members", '''
+        INSERT INTO members (name, phone, address, age, gender, membership_type,
+                           start_date, end_date, fees, payment_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', ((member[0], phone, *member[2:]) for member, phone in zip(members, phones)))
+
+
+def add_payments_batch(payments):
+    """
+    Add many payment records in one transaction.
+
+    Args:
+        payments: Iterable of (member_id, phone, amount, payment_type, notes,
+                  payment_date) tuples; payment_date None means today
+
+    Returns:
+        List of the new payment ids, in input order
+    """
+    today = date.today().strftime('%Y-%m-%d')
+    return _insert_many("payments", '''
+        INSERT INTO payments (member_id, phone, amount, payment_type, notes, payment_date)
+        VALUES (?, ?, ?, ?, ?, COALESCE(?, ?))
+    ''', ((*payment, today) for payment in payments))
+
+
+def add_personal_training_batch(plans):
+    """
+    Add many personal training plans in one transaction.
+
+    Args:
+        plans: Iterable of tuples in add_personal_training argument order
+
+    Returns:
+        List of the new training ids, in input order
+    """
+    return _insert_many("personal_training", '''
+        INSERT INTO personal_training (member_id, trainer_name, plan_duration, fee, start_date, end_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', plans)
+
+
+def add_attendance_batch(records):
+    """
+    Add many attendance records in one transaction (e.g. an offline queue).
+
+    Args:
+        records: Iterable of (member_id, trainer_name, date, check_in_time)
+                 tuples; date / check_in_time None means now
+
+    Returns:
+        List of the new attendance ids, in input order
+    """
+    now = datetime.now()
+    today, time_now = now.strftime('%Y-%m-%d'), now.strftime('%H:%M:%S')
+    return _insert_many("attendance", '''
+        INSERT INTO attendance (member_id, trainer_name, date, check_in_time)
+        VALUES (?, ?, COALESCE(?, ?), COALESCE(?, ?))
+    ''', ((member_id, trainer, day, today, check_in, time_now)
+          for member_id, trainer, day, check_in in records))
+
+
+def set_member_payments_batch(payments):
+    """
+    Set the paid / pending amounts of many members in one transaction
+    (e.g. imported members with their payment history).
+
+    Unlike update_member_payment, payment_status is left as it is and
+    last_payment_date is set from the data instead of today.
+
+    Args:
+        payments: Iterable of (member_id, amount_paid, pending_amount,
+                  last_payment_date) tuples
+    """
+    with _write_transaction() as conn:
+        cursor = conn.executemany('''
+            UPDATE members SET amount_paid = ?2, pending_amount = ?3, last_payment_date = ?4
+            WHERE id = ?1
+        ''', payments)
+        count = cursor.rowcount
+    if count > 0:
+        _publish("members", None, events.UPDATE)
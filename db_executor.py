@@ -0,0 +1,192 @@
+"""
+Database executor for Horsepower Gym Management System
+Runs slow database reads on worker threads and hands the results back to
+the Tk thread, so a busy disk or a lock wait never freezes the window
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import time
+
+
+# Reads run on this many threads (each keeps its own pooled connection)
+MAX_WORKERS = 2
+
+# How often the Tk thread collects finished queries
+POLL_MS = 25
+
+# Main-loop pauses longer than this are logged
+STALL_THRESHOLD_MS = 50
+
+
+class DatabaseExecutor:
+    """
+    Thread pool for database reads with Tk-safe result delivery.
+
+    submit() runs fn(*args) on a worker thread and returns a
+    concurrent.futures.Future. Tk widgets may only be touched from the
+    thread running mainloop(), so finished futures are queued and their
+    callbacks are run on the Tk thread by a loop scheduled with after().
+
+    The same loop doubles as a stall detector: it expects to run every
+    POLL_MS, and logs whenever it runs more than STALL_THRESHOLD_MS late,
+    i.e. whenever the main loop was blocked that long.
+
+    Only reads should be submitted. Writes stay on the Tk thread, so the
+    change events database.py publishes after a write (see events.py) are
+    delivered on the Tk thread as well.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._done = queue.Queue()
+        self._lock = threading.Lock()
+        self._outstanding = set()   # Submitted futures not yet delivered
+        self._latest = {}           # (widget, tag) -> newest future for that tag
+        self._root = None
+        self._poll_id = None
+        self._last_tick = None
+        self.stats = {"submitted": 0, "superseded": 0, "stalls": 0, "longest_stall_ms": 0.0}
+
+    # ---------- Tk thread ----------
+
+    def install(self, root):
+        """Start delivering results (and watching for stalls) on root's main loop"""
+        self._root = root
+        self._last_tick = time.perf_counter()
+        if self._poll_id is None:
+            self._poll_id = root.after(POLL_MS, self._tick)
+
+    def submit(self, widget, fn, *args, callback=None, on_error=None, tag=None):
+        """
+        Run fn(*args) on a worker thread.
+
+        Args:
+            widget: Widget the result is for; callbacks are skipped if it
+                    was destroyed in the meantime (None to always deliver)
+            fn: Function to run; must not touch Tk widgets
+            callback: callback(result), run on the Tk thread
+            on_error: callback(exception), run on the Tk thread (default: print)
+            tag: If given, a newer submit() for the same widget and tag
+                 supersedes this one: its result is dropped (and the query
+                 skipped if it has not started yet)
+
+        Returns:
+            concurrent.futures.Future
+        """
+        future = self._pool.submit(fn, *args)
+        key = (widget, tag) if tag is not None else None
+        with self._lock:
+            self.stats["submitted"] += 1
+            self._outstanding.add(future)
+            if key is not None:
+                previous = self._latest.get(key)
+                if previous is not None:
+                    previous.cancel()
+                    self.stats["superseded"] += 1
+                self._latest[key] = future
+        future.add_done_callback(
+            lambda f: self._done.put((f, fn, widget, callback, on_error, key))
+        )
+        return future
+
+    def is_pending(self, widget, tag):
+        """True if a submit() for widget/tag has not been delivered yet"""
+        with self._lock:
+            return (widget, tag) in self._latest
+
+    def _tick(self):
+        self._poll_id = None
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            late_ms = (now - self._last_tick) * 1000 - POLL_MS
+            if late_ms > STALL_THRESHOLD_MS:
+                self.stats["stalls"] += 1
+                self.stats["longest_stall_ms"] = max(self.stats["longest_stall_ms"], late_ms)
+                print(f"Main loop stalled for {late_ms:.0f} ms")
+        # Time spent in the callbacks below shows up as lateness of the next tick
+        self._last_tick = now
+
+        self._deliver_finished()
+
+        try:
+            self._poll_id = self._root.after(POLL_MS, self._tick)
+        except Exception:
+            pass   # Root window destroyed
+
+    def _deliver_finished(self):
+        while True:
+            try:
+                future, fn, widget, callback, on_error, key = self._done.get_nowait()
+            except queue.Empty:
+                return
+
+            with self._lock:
+                self._outstanding.discard(future)
+                if key is not None:
+                    if self._latest.get(key) is not future:
+                        continue   # Superseded by a newer query
+                    del self._latest[key]
+
+            if future.cancelled():
+                continue
+            if widget is not None and not widget.winfo_exists():
+                continue
+
+            try:
+                error = future.exception()
+                if error is None:
+                    if callback is not None:
+                        callback(future.result())
+                elif on_error is not None:
+                    on_error(error)
+                else:
+                    print(f"Error in {getattr(fn, '__name__', fn)}: {error}")
+            except Exception as e:
+                # One broken callback must not stop delivery of the others
+                print(f"Error delivering {getattr(fn, '__name__', fn)} result: {e}")
+
+    def shutdown(self):
+        """Drop queued queries and wait for running ones (call on application exit)"""
+        if self._poll_id is not None:
+            try:
+                self._root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        with self._lock:
+            for future in self._outstanding:
+                future.cancel()
+        self._pool.shutdown(wait=True)
+
+    def get_stats(self):
+        """Submission and stall counters"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["outstanding"] = len(self._outstanding)
+        return stats
+
+
+# Shared executor used by the views
+executor = DatabaseExecutor()
+
+
+def install(root):
+    """Deliver results of the shared executor on root's main loop"""
+    executor.install(root)
+
+
+def submit(widget, fn, *args, callback=None, on_error=None, tag=None):
+    """Run a read on the shared executor (see DatabaseExecutor.submit)"""
+    return executor.submit(widget, fn, *args, callback=callback, on_error=on_error, tag=tag)
+
+
+def is_pending(widget, tag):
+    """True if the widget's query with this tag is still running"""
+    return executor.is_pending(widget, tag)
+
+
+def shutdown():
+    """Stop the shared executor"""
+    executor.shutdown()
@@ -0,0 +1,54 @@
+"""
+Data change events for Horsepower Gym Management System
+database.py publishes one event per changed row so views can update just
+that row instead of reloading everything
+"""
+
+from collections import namedtuple
+import threading
+
+
+# Operations
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+# table: "members", "payments", "personal_training", "attendance" or "admin"
+# row_id: id of the changed row, or None when many rows changed at once
+# operation: INSERT, UPDATE or DELETE
+ChangeEvent = namedtuple("ChangeEvent", ["table", "row_id", "operation"])
+
+_subscribers = []   # (callback, set of tables or None for all)
+_lock = threading.Lock()
+
+
+def subscribe(callback, *tables):
+    """
+    Call callback(event) for every change to the given tables (all if none given).
+
+    Callbacks run synchronously on the thread that made the change, right
+    after it was committed. Every write in the app happens on the Tk
+    thread, so views may update widgets directly. Views must unsubscribe
+    when destroyed.
+    """
+    with _lock:
+        _subscribers.append((callback, set(tables) or None))
+
+
+def unsubscribe(callback):
+    """Stop delivering events to callback"""
+    with _lock:
+        _subscribers[:] = [(cb, tables) for cb, tables in _subscribers if cb != callback]
+
+
+def publish(table, row_id, operation):
+    """Notify subscribers that a row changed (called by database.py after commit)"""
+    event = ChangeEvent(table, row_id, operation)
+    with _lock:
+        targets = [cb for cb, tables in _subscribers if tables is None or table in tables]
+    for callback in targets:
+        try:
+            callback(event)
+        except Exception as e:
+            # A broken subscriber must not turn a successful write into an error
+            print(f"Error handling {event}: {e}")
@@ -0,0 +1,176 @@
+"""
+Data export for Horsepower Gym Management System
+Streams members, payments and attendance out of the database to CSV or
+compressed JSON Lines files
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+from datetime import date
+
+import database as db
+
+
+# Rows fetched from SQLite per fetchmany() call; memory use depends on
+# this, not on the table size
+EXPORT_FETCH_SIZE = 2000
+
+# Tables that can be exported: (query, date column used by the date range filter)
+EXPORT_TABLES = {
+    "members": ("SELECT * FROM members", "start_date"),
+    "payments": ('''
+        SELECT p.*, m.name AS member_name
+        FROM payments p
+        LEFT JOIN members m ON m.id = p.member_id
+    ''', "p.payment_date"),
+    "attendance": ('''
+        SELECT a.*, m.name AS member_name, m.phone AS member_phone
+        FROM attendance a
+        LEFT JOIN members m ON m.id = a.member_id
+    ''', "a.date"),
+}
+
+# Format -> file extension
+EXPORT_FORMATS = {
+    "csv": ".csv",
+    "jsonl.gz": ".jsonl.gz",
+    "jsonl.zst": ".jsonl.zst",
+}
+
+
+class ExportCancelled(Exception):
+    """Raised by export() when its cancel event is set"""
+
+
+def zstd_available():
+    """True if the optional zstandard package is installed"""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    """Export formats usable in this installation"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "jsonl.zst" or zstd_available()]
+
+
+def _open_output(path, fmt):
+    """Open a text file for writing, compressed according to fmt"""
+    if fmt == "csv":
+        # utf-8-sig so Excel shows names and the rupee sign correctly
+        return open(path, "w", newline="", encoding="utf-8-sig")
+    if fmt == "jsonl.gz":
+        return gzip.open(path, "wt", compresslevel=6, encoding="utf-8")
+    if fmt == "jsonl.zst":
+        import zstandard
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, "wb")), encoding="utf-8")
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def _query(table, date_from, date_to):
+    """SQL and parameters for one table with the date range applied"""
+    sql, date_column = EXPORT_TABLES[table]
+    conditions, params = [], []
+    if date_from:
+        conditions.append(f"{date_column} >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append(f"{date_column} <= ?")
+        params.append(date_to)
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return sql, params
+
+
+def export_table(table, path, fmt="csv", date_from=None, date_to=None, progress=None, cancel=None):
+    """
+    Stream one table to a file.
+
+    Rows are read with fetchmany(EXPORT_FETCH_SIZE) and written straight
+    out, so memory use stays flat however large the table is.
+
+    Args:
+        table: Key of EXPORT_TABLES
+        path: Output file
+        fmt: Key of EXPORT_FORMATS
+        date_from / date_to: Optional 'YYYY-MM-DD' range on the table's date column
+        progress: Optional callback(table, rows_done, rows_total) after every batch
+        cancel: Optional threading.Event; when set, the export stops with
+                ExportCancelled and the partial file is removed
+
+    Returns:
+        Number of rows written
+    """
+    sql, params = _query(table, date_from, date_to)
+    conn = db.get_connection()
+    total = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+
+    done = 0
+    try:
+        with _open_output(path, fmt) as f:
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                write_rows = writer.writerows
+            else:
+                def write_rows(rows):
+                    f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                if not rows:
+                    break
+                write_rows(rows)
+                done += len(rows)
+                if progress:
+                    progress(table, done, total)
+    except BaseException:
+        cursor.close()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return done
+
+
+def export(directory, tables=None, fmt="csv", date_from=None, date_to=None, progress=None, cancel=None):
+    """
+    Export several tables into a directory, one file per table.
+
+    Files are named <table>_<today><extension>. Safe to run on a worker
+    thread: it only reads, and in WAL mode it neither blocks nor is blocked
+    by check-ins recorded meanwhile (each table is one consistent
+    snapshot). On a worker thread the thread's connection is closed at
+    the end.
+
+    Args:
+        directory: Output directory (created if missing)
+        tables: Keys of EXPORT_TABLES (default: all)
+        fmt, date_from, date_to, progress, cancel: As for export_table
+
+    Returns:
+        Dict of table -> (path, rows written)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    tables = list(tables or EXPORT_TABLES)
+    os.makedirs(directory, exist_ok=True)
+    stamp = date.today().strftime('%Y-%m-%d')
+
+    results = {}
+    try:
+        for table in tables:
+            path = os.path.join(directory, f"{table}_{stamp}{EXPORT_FORMATS[fmt]}")
+            results[table] = (path, export_table(table, path, fmt, date_from, date_to, progress, cancel))
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            db.close_connection()
+    return results
@@ -0,0 +1,361 @@
+"""
+CSV import for Horsepower Gym Management System
+Streams members and payments from legacy registers (CSV as saved by Excel
+or any spreadsheet) into the database in batches
+"""
+
+import csv
+import os
+from datetime import datetime
+
+import database as db
+from utils import (
+    validate_phone, validate_age, calculate_end_date, calculate_pending_fee,
+    MEMBERSHIP_TYPES, PAYMENT_STATUS, PAYMENT_TYPES, FEE_MAP
+)
+
+
+# Rows validated and inserted per transaction
+IMPORT_CHUNK_SIZE = 500
+
+# Date formats accepted in date columns (ISO, Excel's usual Indian/UK forms, format_date output)
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y', '%d-%b-%Y', '%d %b %Y')
+
+# Header spellings found in registers -> column name used here
+COLUMN_ALIASES = {
+    "full_name": "name", "member_name": "name", "member": "name",
+    "mobile": "phone", "phone_number": "phone", "mobile_number": "phone", "contact": "phone",
+    "type": "membership_type", "membership": "membership_type", "plan": "membership_type",
+    "start": "start_date", "joined": "start_date", "joining_date": "start_date", "date_of_joining": "start_date",
+    "end": "end_date", "expiry": "end_date", "expiry_date": "end_date", "valid_till": "end_date",
+    "fee": "fees", "status": "payment_status",
+    "paid": "amount_paid", "paid_amount": "amount_paid",
+    "date": "payment_date", "paid_on": "payment_date",
+    "mode": "payment_type", "remarks": "notes",
+}
+
+MEMBER_COLUMNS = ("name", "phone", "membership_type", "start_date")
+PAYMENT_COLUMNS = ("phone", "amount")
+
+
+class RowError(ValueError):
+    """A CSV row that cannot be imported (the message goes into the report)"""
+
+
+def _column_name(header):
+    name = header.strip().lower().replace(" ", "_").replace("-", "_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _parse_date(value, column):
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise RowError(f"Invalid {column}: {value!r}")
+
+
+def _parse_amount(value, column):
+    try:
+        amount = float(value.replace(",", "").replace("₹", "").strip())
+    except ValueError:
+        raise RowError(f"Invalid {column}: {value!r}") from None
+    if amount < 0:
+        raise RowError(f"Negative {column}: {value!r}")
+    return amount
+
+
+def _choice(value, choices, column):
+    """Match value case-insensitively against choices"""
+    for choice in choices:
+        if value.strip().lower() == choice.lower():
+            return choice
+    raise RowError(f"Unknown {column}: {value!r} (expected {', '.join(choices)})")
+
+
+def _normalize_phone(value):
+    """Normalize and check a phone number the way MembersView.save_member does"""
+    phone = value.strip().replace(" ", "").replace("-", "")
+    if not validate_phone(phone):
+        raise RowError(f"Invalid phone: {value!r}")
+    return phone
+
+
+def parse_member(row):
+    """
+    Turn a members CSV row into an add_member tuple plus its payment state.
+
+    Follows MembersView.save_member: the end date comes from
+    calculate_end_date unless the register has one, a Paid member has paid
+    the fees, and a Pending member owes the standard fee for the plan
+    minus any amount_paid.
+
+    Returns:
+        (member tuple, amount_paid, pending_amount)
+    """
+    name = row.get("name", "").strip()
+    if not name:
+        raise RowError("Missing name")
+    phone = _normalize_phone(row.get("phone", ""))
+    membership_type = _choice(row.get("membership_type", ""), MEMBERSHIP_TYPES, "membership type")
+    start_date = _parse_date(row.get("start_date", ""), "start date")
+    if row.get("end_date", "").strip():
+        end_date = _parse_date(row["end_date"], "end date")
+    else:
+        end_date = calculate_end_date(start_date, membership_type)
+
+    age = row.get("age", "").strip()
+    if age and not validate_age(age):
+        raise RowError(f"Invalid age: {age!r}")
+    age = int(age) if age else None
+
+    fees = row.get("fees", "").strip()
+    fees = _parse_amount(fees, "fees") if fees else FEE_MAP[membership_type]
+
+    amount_paid = row.get("amount_paid", "").strip()
+    amount_paid = _parse_amount(amount_paid, "amount paid") if amount_paid else None
+    if row.get("payment_status", "").strip():
+        payment_status = _choice(row["payment_status"], PAYMENT_STATUS, "payment status")
+    else:
+        payment_status = "Paid" if amount_paid is not None and amount_paid >= fees else "Pending"
+    if amount_paid is None:
+        amount_paid = fees if payment_status == "Paid" else 0
+    pending_amount = 0 if payment_status == "Paid" else calculate_pending_fee(membership_type, amount_paid)
+
+    member = (name, phone, row.get("address", "").strip(), age, row.get("gender", "").strip() or None,
+              membership_type, start_date, end_date, fees, payment_status)
+    return member, amount_paid, pending_amount
+
+
+def parse_payment(row):
+    """
+    Turn a payments CSV row into (phone, amount, payment_type, notes, payment_date).
+
+    A missing payment date means today, a missing type "Membership".
+    """
+    phone = _normalize_phone(row.get("phone", ""))
+    amount = _parse_amount(row.get("amount", ""), "amount")
+    if amount == 0:
+        raise RowError("Zero amount")
+    payment_type = row.get("payment_type", "").strip()
+    payment_type = _choice(payment_type, PAYMENT_TYPES, "payment type") if payment_type else "Membership"
+    payment_date = row.get("payment_date", "").strip()
+    payment_date = _parse_date(payment_date, "payment date") if payment_date else None
+    return phone, amount, payment_type, row.get("notes", "").strip(), payment_date
+
+
+def _read_rows(f, result, size):
+    """
+    Yield (line number, raw values, {column: value}) for every data row.
+
+    Updates result["fraction"] with the share of the file read so far.
+    """
+    sample = f.read(4096)
+    f.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+
+    def lines():
+        read = 0
+        for line in f:
+            read += len(line)
+            result["fraction"] = min(1.0, read / size) if size else 1.0
+            yield line
+
+    reader = csv.reader(lines(), dialect)
+    header = next(reader, None)
+    if header is None:
+        return
+    result["header"] = header
+    result["columns"] = [_column_name(column) for column in header]
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue   # Blank line (Excel leaves them at the end)
+        yield reader.line_num, values, dict(zip(result["columns"], values))
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _RejectReport:
+    """CSV of rejected rows (line, reason, original values), created on the first rejection"""
+
+    def __init__(self, path, result):
+        self.path = path
+        self.result = result
+        self._file = None
+        self._writer = None
+
+    def add(self, line, reason, values):
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", "reason"] + self.result.get("header", []))
+            self.result["report_path"] = self.path
+        self._writer.writerow([line, reason] + values)
+        self.result["rejected"] += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def detect_kind(path):
+    """"members" or "payments", from the CSV header"""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        result = {}
+        next(_read_rows(f, result, 0), None)
+    columns = set(result.get("columns", []))
+    if set(MEMBER_COLUMNS) <= columns:
+        return "members"
+    if set(PAYMENT_COLUMNS) <= columns:
+        return "payments"
+    raise ValueError(
+        "Unrecognised CSV header. Members need columns: " + ", ".join(MEMBER_COLUMNS)
+        + "; payments need: " + ", ".join(PAYMENT_COLUMNS)
+    )
+
+
+def iter_import(path, kind=None, report_path=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import a members or payments CSV one chunk at a time.
+
+    A generator: each step reads, validates and inserts one chunk of rows
+    in one transaction, then yields the running result, so the caller
+    decides how to interleave the work (the members screen runs one step
+    per Tk idle callback). Memory use depends on chunk_size, not on the
+    file size; only the phone numbers seen so far are kept, to catch
+    duplicates within the file.
+
+    Members: columns name, phone, membership_type, start_date, and
+    optionally address, age, gender, end_date, fees, payment_status,
+    amount_paid. Each member with amount_paid > 0 also gets a
+    "Membership" payment dated on the start date.
+
+    Payments: columns phone, amount, and optionally payment_date,
+    payment_type, notes. Payments are added to the history only; member
+    balances are not changed.
+
+    Args:
+        path: CSV file
+        kind: "members" or "payments" (default: detect_kind)
+        report_path: Where to write rejected rows
+                     (default: <path without .csv>_rejected.csv)
+        chunk_size: Rows per transaction
+
+    Yields:
+        Dict with kind, rows, imported, payments, rejected, fraction (share
+        of the file processed) and report_path (None if nothing was
+        rejected); the last one yielded is the final result
+    """
+    kind = kind or detect_kind(path)
+    if kind not in ("members", "payments"):
+        raise ValueError(f"Unknown import kind: {kind}")
+    report_path = report_path or os.path.splitext(path)[0] + "_rejected.csv"
+    result = {"kind": kind, "rows": 0, "imported": 0, "payments": 0, "rejected": 0,
+              "fraction": 0.0, "report_path": None}
+    report = _RejectReport(report_path, result)
+    import_chunk = _import_member_chunk if kind == "members" else _import_payment_chunk
+    seen_phones = set()
+
+    try:
+        with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+            rows = _read_rows(f, result, os.path.getsize(path))
+            for chunk in _chunks(rows, chunk_size):
+                result["rows"] += len(chunk)
+                import_chunk(chunk, report, result, seen_phones)
+                yield result
+    finally:
+        report.close()
+    result["fraction"] = 1.0
+    yield result
+
+
+def import_csv(path, kind=None, report_path=None, progress=None):
+    """
+    Import a members or payments CSV (see iter_import) in one go.
+
+    Args:
+        progress: Optional callback(result) after every chunk
+
+    Returns:
+        The final result dict of iter_import
+    """
+    result = None
+    for result in iter_import(path, kind, report_path):
+        if progress:
+            progress(result)
+    return result
+
+
+def _import_member_chunk(chunk, report, result, seen_phones):
+    parsed = []
+    for line, values, row in chunk:
+        try:
+            member, amount_paid, pending_amount = parse_member(row)
+        except RowError as e:
+            report.add(line, str(e), values)
+            continue
+        if member[1] in seen_phones:
+            report.add(line, "Phone repeated in file", values)
+            continue
+        seen_phones.add(member[1])
+        parsed.append((line, values, member, amount_paid, pending_amount))
+
+    existing = db.get_existing_phones(p[2][1] for p in parsed)
+    accepted = []
+    for line, values, member, amount_paid, pending_amount in parsed:
+        if member[1] in existing:
+            report.add(line, "Phone already registered", values)
+        else:
+            accepted.append((member, amount_paid, pending_amount))
+    if not accepted:
+        return
+
+    with db.transaction():
+        member_ids = db.add_members_batch(member for member, _, _ in accepted)
+        balances, payments = [], []
+        for member_id, (member, amount_paid, pending_amount) in zip(member_ids, accepted):
+            if amount_paid or pending_amount:
+                # Paid on the start date; payment_status stays as in the file
+                balances.append((member_id, amount_paid, pending_amount, member[6] if amount_paid else None))
+            if amount_paid:
+                payments.append((member_id, member[1], amount_paid, "Membership", "Imported", member[6]))
+        db.set_member_payments_batch(balances)
+        db.add_payments_batch(payments)
+    result["imported"] += len(member_ids)
+    result["payments"] += len(payments)
+
+
+def _import_payment_chunk(chunk, report, result, seen_phones):
+    parsed = []
+    for line, values, row in chunk:
+        try:
+            parsed.append((line, values, parse_payment(row)))
+        except RowError as e:
+            report.add(line, str(e), values)
+
+    member_ids = db.get_member_ids_by_phone(payment[0] for _, _, payment in parsed)
+    payments = []
+    for line, values, (phone, amount, payment_type, notes, payment_date) in parsed:
+        member_id = member_ids.get(phone)
+        if member_id is None:
+            report.add(line, "No member with this phone", values)
+        else:
+            payments.append((member_id, phone, amount, payment_type, notes, payment_date))
+    if payments:
+        db.add_payments_batch(payments)
+    result["imported"] += len(payments)
+    result["payments"] += len(payments)
@@ -14,8 +14,16 @@ Owner: Manikandan
 Trainers: Suriya, Ganesh
 """
 
+import time
+
+# Taken before any other import so --startup-benchmark covers import time too
+_STARTUP_T0 = time.perf_counter()
+
 import customtkinter as ctk
 from tkinter import messagebox
+from collections import OrderedDict
+from datetime import date
+import importlib
 import sys
 import os
 
@@ -24,17 +32,41 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import views
 from views.login import LoginView
-from views.dashboard import DashboardView
-from views.members import MembersView
-from views.training import TrainingView
-from views.attendance import AttendanceView
-from views.payment import PaymentView
 from utils import GYM_INFO
+import database as db
+import db_executor
+import backup
 
 # Configure CustomTkinter
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
 
+# Sidebar views as (module, class). Only the login screen is imported at
+# startup; each view module is imported on first navigation (see
+# get_view_class), so the login window does not wait for them
+VIEW_CLASSES = {
+    "dashboard": ("views.dashboard", "DashboardView"),
+    "members": ("views.members", "MembersView"),
+    "payment": ("views.payment", "PaymentView"),
+    "training": ("views.training", "TrainingView"),
+    "attendance": ("views.attendance", "AttendanceView"),
+}
+
+
+def get_view_class(view_name):
+    """Import a sidebar view's module (once) and return its class"""
+    module_name, class_name = VIEW_CLASSES[view_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+# Built views kept alive for fast switching; the least recently used
+# one beyond this is destroyed
+MAX_CACHED_VIEWS = 3
+
+# First scheduled backup check after startup (ms), so it never competes with
+# the first paint; and how long closing the app waits for a running backup
+BACKUP_START_DELAY_MS = 5000
+BACKUP_STOP_TIMEOUT_S = 2
+
 
 class HorsepowerGymApp(ctk.CTk):
     """Main Application Class"""
@@ -67,8 +99,20 @@ class HorsepowerGymApp(ctk.CTk):
         # Initialize logged in state
         self.is_logged_in = False
         self.current_view = None
-        self.views = {}
+        self.views = OrderedDict()   # view name -> live view, least recently used first
+        self.view_versions = {}      # view name -> get_view_version() when last loaded
         self.nav_buttons = {}
+        self.print_timing = "--timing" in sys.argv
+        
+        # Create tables / run pending migrations (no-op when up to date)
+        db.ensure_database()
+        
+        # Deliver background query results (and log main-loop stalls) on this window
+        db_executor.install(self)
+        
+        # Periodic online snapshots, started once the window is up
+        self.backup_scheduler = backup.BackupScheduler()
+        self.after(BACKUP_START_DELAY_MS, self.backup_scheduler.start)
         
         # Show login first
         self.show_login()
@@ -209,6 +253,26 @@ class HorsepowerGymApp(ctk.CTk):
             command=self.refresh_current_view
         ).pack(fill="x", pady=3)
         
+        # Export button
+        ctk.CTkButton(
+            bottom_frame,
+            text="📤 Export",
+            height=35,
+            fg_color="#9b59b6",
+            hover_color="#8e44ad",
+            command=self.open_export
+        ).pack(fill="x", pady=3)
+        
+        # Backups button
+        ctk.CTkButton(
+            bottom_frame,
+            text="💾 Backups",
+            height=35,
+            fg_color="#f39c12",
+            hover_color="#d68910",
+            command=self.open_backups
+        ).pack(fill="x", pady=3)
+        
         # Logout button
         ctk.CTkButton(
             bottom_frame,
@@ -235,7 +299,16 @@ class HorsepowerGymApp(ctk.CTk):
         ).pack()
     
     def show_view(self, view_name):
-        """Show a specific view using clear-and-load pattern"""
+        """
+        Show a specific view.
+
+        Views are built once and then hidden with grid_remove instead of
+        being destroyed, so switching back is instant. A cached view is
+        refreshed only if the database changed since it was last loaded
+        (see get_view_version).
+        """
+        start = time.perf_counter()
+        
         # Update navigation button styles
         for name, btn in self.nav_buttons.items():
             if name == view_name:
@@ -243,36 +316,41 @@ class HorsepowerGymApp(ctk.CTk):
             else:
                 btn.configure(fg_color="transparent", text_color=self.colors["text"])
         
-        # Clear current view from content frame
+        # Hide current view (error screens are not cached)
         if self.current_view_widget is not None:
-            self.current_view_widget.destroy()
+            if self.current_view_widget in self.views.values():
+                self.current_view_widget.grid_remove()
+            else:
+                self.current_view_widget.destroy()
             self.current_view_widget = None
         
-        # Create new view instance
+        view = self.views.get(view_name)
+        cached = view is not None
+        
         try:
-            if view_name == "dashboard":
-                self.current_view_widget = DashboardView(self.content_frame)
-            elif view_name == "members":
-                self.current_view_widget = MembersView(self.content_frame)
-            elif view_name == "payment":
-                self.current_view_widget = PaymentView(self.content_frame)
-            elif view_name == "training":
-                self.current_view_widget = TrainingView(self.content_frame)
-            elif view_name == "attendance":
-                self.current_view_widget = AttendanceView(self.content_frame)
+            if view is not None:
+                self.views.move_to_end(view_name)
+                version = self.get_view_version(view)
+                if self.view_versions.get(view_name) != version or getattr(view, "REFRESH_ON_SHOW", False):
+                    view.refresh()
+                    self.view_versions[view_name] = version
+            elif view_name in VIEW_CLASSES:
+                view = get_view_class(view_name)(self.content_frame)
+                self.views[view_name] = view
+                self.view_versions[view_name] = self.get_view_version(view)
             else:
                 # Fallback - show error label
-                self.current_view_widget = ctk.CTkLabel(
+                view = ctk.CTkLabel(
                     self.content_frame,
                     text=f"View '{view_name}' not found",
                     font=ctk.CTkFont(size=20),
                     text_color="#e74c3c"
                 )
             
-            # Pack the view to fill content frame
-            if self.current_view_widget:
-                self.current_view_widget.grid(row=0, column=0, sticky="nsew")
-                self.current_view = view_name
+            view.grid(row=0, column=0, sticky="nsew")
+            self.current_view_widget = view
+            self.current_view = view_name
+            self.evict_views()
                 
         except Exception as e:
             # Show error message if view fails to load
@@ -293,24 +371,81 @@ class HorsepowerGymApp(ctk.CTk):
                 text_color="#ffffff"
             ).pack(pady=10)
             
+            # Don't keep a view that failed to build or refresh
+            broken = self.views.pop(view_name, None)
+            if broken is not None:
+                broken.destroy()
+            self.view_versions.pop(view_name, None)
+            
             self.current_view_widget = error_frame
             print(f"Error loading view {view_name}: {e}")
+        
+        if self.print_timing:
+            self.update_idletasks()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"Switch to {view_name}: {elapsed:.1f} ms ({'cached' if cached else 'built'})")
+    
+    def get_view_version(self, view):
+        """
+        Data version a cached view depends on.
+
+        Views with LIVE_UPDATES apply this app's own writes through change
+        events, so they only need a refresh for commits made elsewhere
+        (PRAGMA data_version, the first half of the token). The date is
+        part of it too: views built yesterday show yesterday's check-ins,
+        expiry days and collections.
+        """
+        version = db.get_data_version()
+        return (date.today(), version[0] if getattr(view, "LIVE_UPDATES", False) else version)
+    
+    def evict_views(self):
+        """
+        Destroy least recently used views beyond MAX_CACHED_VIEWS.
+
+        The current view and views whose is_busy() is true (e.g. members
+        during a CSV import) are kept; they are evicted on a later switch.
+        """
+        for name, view in list(self.views.items()):
+            if len(self.views) <= MAX_CACHED_VIEWS:
+                break
+            if view is self.current_view_widget or getattr(view, "is_busy", lambda: False)():
+                continue
+            del self.views[name]
+            self.view_versions.pop(name, None)
+            view.destroy()
     
     def refresh_current_view(self):
-        """Refresh the current view by reloading it"""
-        if self.current_view:
-            # Re-show the current view (will destroy and recreate)
+        """Reload the current view's data in place"""
+        view = self.views.get(self.current_view)
+        if view is not None:
+            view.refresh()
+            self.view_versions[self.current_view] = self.get_view_version(view)
+        elif self.current_view:
             self.show_view(self.current_view)
     
+    def open_export(self):
+        """Open the export dialog"""
+        from views.export import ExportDialog
+        ExportDialog(self)
+    
+    def open_backups(self):
+        """Open the backups dialog"""
+        from views.backup import BackupDialog
+        BackupDialog(self, self.backup_scheduler)
+    
     def logout(self):
         """Handle logout"""
         if messagebox.askyesno("Confirm Logout", "Are you sure you want to logout?"):
             self.is_logged_in = False
             
-            # Clear current view
-            if self.current_view_widget:
+            # Clear current view and the view cache
+            if self.current_view_widget and self.current_view_widget not in self.views.values():
                 self.current_view_widget.destroy()
-                self.current_view_widget = None
+            self.current_view_widget = None
+            for view in self.views.values():
+                view.destroy()
+            self.views.clear()
+            self.view_versions.clear()
             
             self.current_view = None
             
@@ -324,12 +459,26 @@ class HorsepowerGymApp(ctk.CTk):
     def on_close(self):
         """Handle window close"""
         if messagebox.askyesno("Exit", "Are you sure you want to exit?"):
+            db_executor.shutdown()
+            self.backup_scheduler.stop(timeout=BACKUP_STOP_TIMEOUT_S)
+            db.close_all_connections()
             self.destroy()
 
 
 def main():
     """Main entry point"""
     app = HorsepowerGymApp()
+    
+    if "--startup-benchmark" in sys.argv:
+        # Measure import-to-first-paint, then exit
+        app.update()
+        elapsed = (time.perf_counter() - _STARTUP_T0) * 1000
+        print(f"Startup (import to first paint): {elapsed:.0f} ms")
+        db_executor.shutdown()
+        db.close_all_connections()
+        app.destroy()
+        return
+    
     app.mainloop()
 
 
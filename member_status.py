@@ -0,0 +1,138 @@
+"""
+Membership status for Horsepower Gym Management System
+Classifies whole member lists at once: a columnar snapshot of the rows a
+list query returned, with remaining days, expiry flags and colour buckets
+computed in one NumPy pass instead of two strptime calls per row
+"""
+
+from datetime import date, datetime
+
+
+# Colour buckets of the "days left" column (ERROR / WARNING / SUCCESS in the lists)
+EXPIRY_DUE = 0          # Expired, or expires today
+EXPIRY_NEAR = 1         # 1 to EXPIRY_NEAR_DAYS days left
+EXPIRY_FAR = 2
+
+# Days left up to which a membership counts as about to expire
+EXPIRY_NEAR_DAYS = 7
+
+
+def expiry_bucket(remaining):
+    """Colour bucket for a number of remaining days (the per-row rule)"""
+    if remaining > EXPIRY_NEAR_DAYS:
+        return EXPIRY_FAR
+    return EXPIRY_NEAR if remaining > 0 else EXPIRY_DUE
+
+
+class MemberSnapshot:
+    """
+    Status columns of a list of member (or training) rows.
+
+    Built from rows already fetched by one list query: the end dates are
+    parsed in one go into a datetime64 array, and valid / remaining /
+    bucket are derived from it with array arithmetic. The arrays are
+    aligned with the rows, so lists rebuilt from those rows index them by
+    position; lists that change row by row look members up with find().
+
+    Building and classifying only needs the rows, so do it on the database
+    worker thread; that thread also pays for importing NumPy.
+    """
+
+    def __init__(self, rows, end_column="end_date"):
+        """
+        Args:
+            rows: sqlite3.Row objects (or dicts) with an id and end_column;
+                  pending_amount and payment_status are used when present
+            end_column: Column holding the 'YYYY-MM-DD' end date
+        """
+        import numpy as np
+
+        keys = rows[0].keys() if rows else ()
+        self.ids = np.fromiter((row["id"] for row in rows), np.int64, len(rows))
+        self.end = _parse_dates([row[end_column] for row in rows])
+        if "pending_amount" in keys:
+            self.pending = np.fromiter((row["pending_amount"] or 0 for row in rows), np.float64, len(rows))
+        else:
+            self.pending = np.zeros(len(rows))
+        if "payment_status" in keys:
+            self.paid = np.array([row["payment_status"] == "Paid" for row in rows], dtype=bool)
+        else:
+            self.paid = np.ones(len(rows), dtype=bool)
+        self._order = np.argsort(self.ids, kind="stable")
+        self._sorted_ids = self.ids[self._order]
+        self._stale = set()
+        self.today = None
+        self.classify()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def classify(self, today=None):
+        """
+        Recompute valid / remaining / bucket for a day (default: today).
+
+        valid: end date is today or later (is_membership_valid)
+        remaining: days left, at least 0 (get_remaining_days)
+        bucket: EXPIRY_DUE / EXPIRY_NEAR / EXPIRY_FAR (expiry_bucket)
+        """
+        import numpy as np
+
+        self.today = today or date.today()
+        days = (self.end - np.datetime64(self.today, "D")).astype(np.int64)
+        days[np.isnat(self.end)] = -1      # Unreadable end date: expired
+        self.valid = days >= 0
+        self.remaining = np.maximum(days, 0)
+        self.bucket = np.where(self.remaining > EXPIRY_NEAR_DAYS, EXPIRY_FAR,
+                               np.where(self.remaining > 0, EXPIRY_NEAR, EXPIRY_DUE)).astype(np.int8)
+
+    def refresh_day(self):
+        """Reclassify if the date has changed since the last classify()"""
+        if self.today != date.today():
+            self.classify()
+
+    def find(self, row_id):
+        """Position of a row by id, or None if it isn't in the snapshot or was discarded"""
+        if row_id in self._stale:
+            return None
+        pos = int(self._sorted_ids.searchsorted(row_id))
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == row_id:
+            return int(self._order[pos])
+        return None
+
+    def discard(self, row_id):
+        """Forget a row whose data changed after the snapshot was taken"""
+        self._stale.add(row_id)
+
+    def status(self, i):
+        """(is_valid, remaining_days, bucket) of row i as Python values"""
+        return bool(self.valid[i]), int(self.remaining[i]), int(self.bucket[i])
+
+
+def _parse_dates(values):
+    """'YYYY-MM-DD' strings to a datetime64[D] array; unreadable ones become NaT"""
+    import numpy as np
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except (ValueError, TypeError):
+        parsed = np.empty(len(values), dtype="datetime64[D]")
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, "D") if value else np.datetime64("NaT")
+            except (ValueError, TypeError):
+                parsed[i] = np.datetime64("NaT")
+        return parsed
+
+
+def row_status(end_date):
+    """
+    (is_valid, remaining_days, bucket) of a single end date, for rows that
+    aren't in a snapshot. A missing or unreadable date counts as expired,
+    as in MemberSnapshot.
+    """
+    try:
+        if isinstance(end_date, str):
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        remaining = (end_date - date.today()).days
+    except (ValueError, TypeError):
+        return False, 0, EXPIRY_DUE
+    return remaining >= 0, max(0, remaining), expiry_bucket(max(0, remaining))
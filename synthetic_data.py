@@ -0,0 +1,236 @@
+"""
+Synthetic data generator for Horsepower Gym Management System
+Fills a database with realistic members, payments, personal training and
+years of daily attendance, for load testing and benchmarks
+
+Usage:
+    python synthetic_data.py scratch.db --members 5000 --years 3 --seed 42
+
+Never point this at the real horsepower_gym.db.
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import database as db
+from utils import (
+    FEE_MAP, MEMBERSHIP_DURATION, TRAINERS, GENDERS,
+    calculate_end_date, calculate_training_end_date
+)
+
+
+# Share of members per membership type
+MEMBERSHIP_MIX = {"Monthly": 0.6, "Quarterly": 0.3, "Yearly": 0.1}
+
+# Share of members with a personal training plan, and plan lengths in months
+TRAINING_SHARE = 0.15
+TRAINING_MONTHS = [1, 1, 1, 3, 3, 6]
+TRAINING_FEE_PER_MONTH = 2500
+
+# Share of members still owing part of their fee
+PENDING_SHARE = 0.1
+
+# Average check-ins per member per week while the membership is active
+VISITS_PER_WEEK = 3.5
+
+# Opening hours used for check-in times
+OPEN_HOUR, CLOSE_HOUR = 5, 22
+
+# Members (with all their rows) per db.transaction() on the bulk path
+BULK_CHUNK_SIZE = 1000
+
+FIRST_NAMES = ["Arun", "Bala", "Deepa", "Divya", "Ganesh", "Hari", "Kavya", "Karthik",
+               "Lakshmi", "Manoj", "Meena", "Naveen", "Priya", "Ravi", "Sanjay", "Sneha",
+               "Suresh", "Tamil", "Vijay", "Yamini"]
+LAST_NAMES = ["Kumar", "Raj", "Sundaram", "Murugan", "Pillai", "Iyer", "Nair", "Reddy",
+              "Selvam", "Babu"]
+STREETS = ["Koodapakkam Road", "Villianur Main Road", "MG Road", "Mission Street",
+           "Lawspet", "Muthialpet", "Reddiarpalayam"]
+
+
+def _members(rng, count, years, today, first_id):
+    """Yield member tuples (without id) in add_member argument order"""
+    types = list(MEMBERSHIP_MIX)
+    weights = [MEMBERSHIP_MIX[t] for t in types]
+    history_days = max(1, int(years * 365))
+    for i in range(first_id, first_id + count):
+        membership_type = rng.choices(types, weights)[0]
+        # Joined some time in the window and renewed back to back for a while,
+        # so some memberships run past today and the rest have expired
+        duration = MEMBERSHIP_DURATION[membership_type]
+        start = today - timedelta(days=rng.randrange(history_days))
+        renewals = rng.randrange((today - start).days // duration + 1)
+        end_date = calculate_end_date(start + timedelta(days=renewals * duration), membership_type)
+        pending = rng.random() < PENDING_SHARE
+        yield (
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            f"9{i:09d}",
+            f"{rng.randrange(1, 200)}, {rng.choice(STREETS)}, Pondicherry",
+            rng.randrange(16, 65),
+            rng.choice(GENDERS),
+            membership_type,
+            start.strftime('%Y-%m-%d'),
+            end_date,
+            FEE_MAP[membership_type],
+            "Pending" if pending else "Paid",
+        )
+
+
+def _payments(member_id, member):
+    """Yield payment tuples in db.add_payments_batch order"""
+    phone, membership_type, start_date, end_date = member[1], member[5], member[6], member[7]
+    fee = FEE_MAP[membership_type]
+    day = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    payment_type = "Membership"
+    while day < end:
+        yield (member_id, phone, fee, payment_type, "", day.strftime('%Y-%m-%d'))
+        payment_type = "Renewal"
+        day += timedelta(days=MEMBERSHIP_DURATION[membership_type])
+
+
+def _training(rng, member_id, member):
+    """A personal training tuple in add_personal_training argument order, or None"""
+    if rng.random() >= TRAINING_SHARE:
+        return None
+    months = rng.choice(TRAINING_MONTHS)
+    start = date.fromisoformat(member[6]) + timedelta(days=rng.randrange(30))
+    start_date = start.strftime('%Y-%m-%d')
+    return (member_id, rng.choice(TRAINERS), months, months * TRAINING_FEE_PER_MONTH,
+            start_date, calculate_training_end_date(start_date, months))
+
+
+def _attendance(rng, member_id, member, training, today):
+    """Yield attendance tuples in db.add_attendance_batch order"""
+    day = date.fromisoformat(member[6])
+    end = min(date.fromisoformat(member[7]), today)
+    visit_chance = VISITS_PER_WEEK / 7
+    while day <= end:
+        if rng.random() < visit_chance:
+            trainer = None
+            if training and training[4] <= day.strftime('%Y-%m-%d') <= training[5]:
+                trainer = training[1]
+            check_in = f"{rng.randrange(OPEN_HOUR, CLOSE_HOUR):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+            yield (member_id, trainer, day.strftime('%Y-%m-%d'), check_in)
+        day += timedelta(days=1)
+
+
+def generate(members=1000, years=2, seed=0, bulk=True, progress=None):
+    """
+    Fill the current database (db.DATABASE_PATH) with synthetic data.
+
+    The same seed always produces the same rows. Call db.ensure_database()
+    first.
+
+    Args:
+        members: Number of members to create
+        years: How far back memberships, payments and attendance reach
+        seed: Random seed
+        bulk: Write through the db.add_*_batch functions, BULK_CHUNK_SIZE
+              members per transaction (fast). With bulk=False every row
+              goes through the per-row add_* functions, one transaction
+              each; add_payment and add_attendance always stamp today's
+              date, so that path writes one payment and at most one
+              check-in per member.
+        progress: Optional callback(done, total) after every member chunk
+
+    Returns:
+        Dict of row counts per table
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    counts = {"members": 0, "payments": 0, "personal_training": 0, "attendance": 0}
+
+    # Phone numbers are numbered on from the highest existing member id
+    next_id = db.get_connection().execute("SELECT COALESCE(MAX(id), 0) FROM members").fetchone()[0] + 1
+    generated = _members(rng, members, years, today, next_id)
+
+    if not bulk:
+        for i, member in enumerate(generated, 1):
+            member_id = db.add_member(*member)
+            db.add_payment(member_id, member[1], member[8], "Membership")
+            counts["members"] += 1
+            counts["payments"] += 1
+            training = _training(rng, member_id, member)
+            if training:
+                db.add_personal_training(*training)
+                counts["personal_training"] += 1
+            if member[7] >= today.strftime('%Y-%m-%d') and rng.random() < VISITS_PER_WEEK / 7:
+                db.add_attendance(member_id, training[1] if training else None)
+                counts["attendance"] += 1
+            if progress and i % BULK_CHUNK_SIZE == 0:
+                progress(i, members)
+        return counts
+
+    chunk = []
+    for i, member in enumerate(generated, 1):
+        chunk.append(member)
+        if len(chunk) == BULK_CHUNK_SIZE or i == members:
+            _write_chunk(rng, chunk, today, counts)
+            chunk = []
+            if progress:
+                progress(i, members)
+
+    return counts
+
+
+def _write_chunk(rng, chunk, today, counts):
+    """Insert a chunk of members and all their rows in one transaction"""
+    with db.transaction():
+        member_ids = db.add_members_batch(chunk)
+        payments, plans, attendance = [], [], []
+        for member_id, member in zip(member_ids, chunk):
+            payments.extend(_payments(member_id, member))
+            training = _training(rng, member_id, member)
+            if training:
+                plans.append(training)
+            attendance.extend(_attendance(rng, member_id, member, training, today))
+            if member[9] == "Pending":
+                # Half paid, the way the payment screen records a part payment
+                db.update_member_payment(member_id, member[8] / 2, member[8] / 2)
+        db.add_payments_batch(payments)
+        db.add_personal_training_batch(plans)
+        db.add_attendance_batch(attendance)
+
+    counts["members"] += len(member_ids)
+    counts["payments"] += len(payments)
+    counts["personal_training"] += len(plans)
+    counts["attendance"] += len(attendance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a scratch database with synthetic gym data")
+    parser.add_argument("database", help="Database file to create or extend (not the real one!)")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--per-row", action="store_true",
+                        help="Insert through the public database.py functions instead of the bulk path")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.database) == os.path.abspath(db.DATABASE_PATH):
+        print("Refusing to write synthetic data into the application database")
+        return 1
+
+    db.DATABASE_PATH = os.path.abspath(args.database)
+    db.ensure_database()
+
+    start = time.perf_counter()
+    counts = generate(args.members, args.years, args.seed, bulk=not args.per_row,
+                      progress=lambda done, total: print(f"  {done}/{total} members"))
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts.values())
+    print(", ".join(f"{table}: {n}" for table, n in counts.items()))
+    print(f"{total} rows in {elapsed:.1f} s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    db.close_all_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
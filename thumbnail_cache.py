@@ -0,0 +1,261 @@
+"""
+Thumbnail cache for Horsepower Gym Management System
+Keeps ready-to-display member thumbnails (photo + payment badge) in memory
+and on disk so lists don't decode and resize the original JPEGs every time
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+from utils import get_data_path
+
+
+# In-memory budget (a 40x40 RGB thumbnail is ~5 KB, so this holds ~1700)
+MEMORY_BUDGET_BYTES = 8 * 1024 * 1024
+
+# Ready-made thumbnails are stored here, next to the member photos
+DISK_CACHE_DIR = os.path.join("assets", "thumbnail_cache")
+
+# Disk budget (a 40x40 PNG is ~4 KB, so this holds ~8000); the least
+# recently used files beyond it are deleted every DISK_PRUNE_INTERVAL saves
+DISK_BUDGET_BYTES = 32 * 1024 * 1024
+DISK_PRUNE_INTERVAL = 200
+
+
+def _image_bytes(img):
+    """Approximate memory used by a PIL image"""
+    return img.width * img.height * len(img.getbands())
+
+
+class ThumbnailCache:
+    """
+    Two-level cache of rendered thumbnails.
+
+    Entries are keyed by (photo path, file mtime, file size, pending/paid
+    state, variant). Replacing a photo changes its mtime/size and a payment
+    changes the pending state, so stale thumbnails are never returned.
+    Storing a thumbnail drops the other versions of that photo and variant
+    (the other payment state, an older photo), and invalidate() drops all
+    of a photo's entries, e.g. when the member is deleted.
+
+    Level 1 is an LRU dict limited to memory_budget bytes, level 2 is a
+    directory of PNG files that survives restarts, limited to disk_budget
+    bytes by prune_disk().
+    """
+
+    def __init__(self, memory_budget=MEMORY_BUDGET_BYTES, disk_dir=None, disk_budget=DISK_BUDGET_BYTES):
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.disk_dir = disk_dir or get_data_path(DISK_CACHE_DIR)
+        self._memory = OrderedDict()   # key -> PIL image
+        self._memory_bytes = 0
+        self._saves = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    # ---------- keys ----------
+
+    def _make_key(self, photo_path, pending_amount, variant):
+        """Build the cache key, or None if the photo file is missing"""
+        is_pending = (pending_amount or 0) > 0
+        if not photo_path:
+            return (None, 0, 0, is_pending, variant)
+        try:
+            st = os.stat(os.path.join(get_data_path(), photo_path))
+        except OSError:
+            return (None, 0, 0, is_pending, variant)
+        return (photo_path, st.st_mtime_ns, st.st_size, is_pending, variant)
+
+    def _disk_prefix(self, photo_path, variant=None):
+        """
+        File name prefix of a photo's thumbnails (of one variant), so
+        invalidate() and _save_to_disk() can find them
+        """
+        stem = os.path.splitext(os.path.basename(photo_path))[0] if photo_path else "_default"
+        return f"{stem}__{variant}__" if variant is not None else f"{stem}__"
+
+    def _disk_path(self, key):
+        """Disk file for a key"""
+        photo_path, mtime, size, is_pending, variant = key
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self.disk_dir, f"{self._disk_prefix(photo_path, variant)}{digest}.png")
+
+    # ---------- lookups ----------
+
+    def get(self, photo_path, pending_amount, variant, build):
+        """
+        Get a thumbnail, building it on a miss.
+
+        Args:
+            photo_path: Relative photo path from the database (or None)
+            pending_amount: Member's pending amount (only >0 vs 0 matters)
+            variant: Name of the rendering (e.g. size/badge style)
+            build: callback(photo_path, pending_amount) -> PIL image, used on a miss
+
+        Returns:
+            PIL Image (shared - callers must not modify it)
+        """
+        key = self._make_key(photo_path, pending_amount, variant)
+
+        with self._lock:
+            img = self._memory.get(key)
+            if img is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return img
+
+        # Default avatars are cheap to draw and identical for everyone, so
+        # only photo thumbnails go to disk
+        on_disk = key[0] is not None
+        img = self._load_from_disk(key) if on_disk else None
+        if img is not None:
+            self.stats["disk_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            img = build(key[0], pending_amount or 0)
+            if on_disk:
+                self._save_to_disk(key, img)
+
+        self._remember(key, img)
+        return img
+
+    def _remember(self, key, img):
+        with self._lock:
+            if key in self._memory:
+                return
+            if key[0] is not None:
+                # Other versions of this thumbnail are stale now
+                for old in [k for k in self._memory if k[0] == key[0] and k[4] == key[4]]:
+                    self._memory_bytes -= _image_bytes(self._memory.pop(old))
+            self._memory[key] = img
+            self._memory_bytes += _image_bytes(img)
+            while self._memory_bytes > self.memory_budget and len(self._memory) > 1:
+                _, old = self._memory.popitem(last=False)
+                self._memory_bytes -= _image_bytes(old)
+                self.stats["evictions"] += 1
+
+    def _load_from_disk(self, key):
+        from PIL import Image
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as img:
+                img.load()
+                img = img.convert("RGB")
+            # The modification time is the last use, for prune_disk()
+            os.utime(path)
+            return img
+        except Exception:
+            # Truncated/corrupt cache file - rebuild it
+            return None
+
+    def _save_to_disk(self, key, img):
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            img.save(tmp_path, "PNG")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing thumbnail cache: {e}")
+            return
+
+        # Drop the other versions of this thumbnail (payment state, older photo)
+        photo_path, _, _, _, variant = key
+        self._remove_files(self._disk_prefix(photo_path, variant), keep=os.path.basename(path))
+        with self._lock:
+            self._saves += 1
+            prune = self._saves % DISK_PRUNE_INTERVAL == 1
+        if prune:
+            self.prune_disk()
+
+    # ---------- maintenance ----------
+
+    def invalidate(self, photo_path):
+        """Drop every cached thumbnail of a photo (memory and disk)"""
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == photo_path]:
+                self._memory_bytes -= _image_bytes(self._memory.pop(key))
+
+        self._remove_files(self._disk_prefix(photo_path))
+
+    def _remove_files(self, prefix, keep=None):
+        """Delete the disk files whose name starts with prefix (except keep)"""
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(prefix) and name.endswith(".png") and name != keep:
+                try:
+                    os.remove(os.path.join(self.disk_dir, name))
+                except OSError:
+                    pass
+
+    def prune_disk(self):
+        """
+        Delete the least recently used disk files beyond disk_budget bytes
+        (the first save of a run and every DISK_PRUNE_INTERVAL-th after it
+        call this).
+
+        Returns:
+            Number of files deleted
+        """
+        try:
+            entries = []
+            with os.scandir(self.disk_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".png"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        except OSError:
+            return 0
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.disk_budget:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+        return deleted
+
+    def clear(self):
+        """Empty the in-memory level (disk files are kept)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self):
+        """Hit/miss counters plus current memory use"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+# Shared cache used by the views
+thumbnail_cache = ThumbnailCache()
+
+
+def get_thumbnail(photo_path, pending_amount, variant, build):
+    """Get a thumbnail from the shared cache (see ThumbnailCache.get)"""
+    return thumbnail_cache.get(photo_path, pending_amount, variant, build)
+
+
+def invalidate_thumbnails(photo_path):
+    """Forget cached thumbnails of a photo that was replaced, or of a deleted member"""
+    thumbnail_cache.invalidate(photo_path)
+
+
+def get_thumbnail_stats():
+    """Hit/miss counters of the shared cache"""
+    return thumbnail_cache.get_stats()
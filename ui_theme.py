@@ -137,3 +137,6 @@ TABLE_ROW_ODD = BG_SECONDARY
 TABLE_ROW_EVEN = "#424649"
 TABLE_ROW_EXPIRED = "#5C3030"  # Dark red tint for expired
 TABLE_ROW_HOVER = BG_HOVER
+
+# "Days left" colour by member_status bucket (EXPIRY_DUE, EXPIRY_NEAR, EXPIRY_FAR)
+EXPIRY_COLORS = (ERROR, WARNING, SUCCESS)
@@ -3,6 +3,7 @@ Utility functions for Horsepower Gym Management System
 """
 
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 import os
 import sys
 
@@ -245,62 +246,48 @@ def resize_image_pil(pil_image, target_size=(200, 200)):
     return new_image
 
 
-def create_badge_overlay(pil_image, pending_amount, badge_position="bottom"):
+# Rendered badges, fonts and default avatars kept by the lru_caches below
+# (a handful of sizes are used in the app, so these stay tiny)
+IMAGE_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _badge_font(size):
+    """Bold badge font of the given size (Arial on Windows, PIL's default elsewhere)"""
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype("arialbd.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _badge_sprite(size, is_pending, badge_position):
     """
-    Overlay a PROMINENT payment status indicator on a PIL image.
-    
-    VISUAL RULES:
-    - If pending_amount > 0: 
-      * Apply semi-transparent DARK overlay
-      * Show ORANGE/RED "FEE PENDING" badge
-    - If pending_amount == 0:
-      * NO dark overlay (normal photo)
-      * Show GREEN "PAID" badge
-    
-    Args:
-        pil_image: PIL Image object
-        pending_amount: Amount pending (0 = paid, >0 = pending)
-        badge_position: 'top', 'bottom', 'top-right', 'bottom-right'
-    
-    Returns:
-        PIL Image with status overlay
+    RGBA layer with everything create_badge_overlay puts on a photo of this
+    size: the dark veil (pending only), the banner, its text and warning
+    triangles. Shared - never modify it.
     """
-    from PIL import Image, ImageDraw, ImageFont, ImageEnhance
-    
-    # Make a copy to avoid modifying original
-    img = pil_image.copy().convert("RGBA")
-    img_width, img_height = img.size
+    from PIL import Image, ImageDraw
     
-    if pending_amount > 0:
-        # ========== PENDING STATUS ==========
-        # Apply semi-transparent dark overlay
-        dark_overlay = Image.new("RGBA", (img_width, img_height), (0, 0, 0, 120))  # 47% opacity black
-        img = Image.alpha_composite(img, dark_overlay)
-        
-        # Badge configuration for PENDING
-        badge_bg_color = (231, 76, 60, 240)  # Red with slight transparency
-        badge_border_color = (255, 255, 255, 255)
+    img_width, img_height = size
+    if is_pending:
+        # Semi-transparent dark overlay (47% opacity black)
+        sprite = Image.new("RGBA", size, (0, 0, 0, 120))
+        badge_bg_color = (231, 76, 60, 255)  # Red
         badge_text = "FEE PENDING"
-        text_color = (255, 255, 255, 255)
-        icon_text = "⚠"
-        
     else:
-        # ========== PAID STATUS ==========
         # No dark overlay - keep photo bright
-        
-        # Badge configuration for PAID
-        badge_bg_color = (46, 204, 113, 240)  # Green with slight transparency
-        badge_border_color = (255, 255, 255, 255)
+        sprite = Image.new("RGBA", size, (0, 0, 0, 0))
+        badge_bg_color = (46, 204, 113, 255)  # Green
         badge_text = "PAID ✓"
-        text_color = (255, 255, 255, 255)
-        icon_text = None
+    badge_border_color = (255, 255, 255, 255)
+    text_color = (255, 255, 255, 255)
     
-    # Create drawing context
-    draw = ImageDraw.Draw(img)
+    draw = ImageDraw.Draw(sprite)
     
     # Calculate badge dimensions
     badge_height = max(36, img_height // 5)
-    badge_padding = 8
     corner_radius = badge_height // 3
     
     # Calculate badge position (full width banner at bottom)
@@ -322,37 +309,51 @@ def create_badge_overlay(pil_image, pending_amount, badge_position="bottom"):
         width=2
     )
     
-    # Load font
-    try:
-        font_size = max(14, badge_height // 2)
-        font = ImageFont.truetype("arial.ttf", font_size)
-        font_bold = ImageFont.truetype("arialbd.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
-        font_bold = font
-    
-    # Calculate text position (centered in badge)
+    # Draw text centered in the badge
+    font_bold = _badge_font(max(14, badge_height // 2))
     text_bbox = draw.textbbox((0, 0), badge_text, font=font_bold)
     text_width = text_bbox[2] - text_bbox[0]
     text_height = text_bbox[3] - text_bbox[1]
-    
     text_x = badge_x + (badge_width - text_width) // 2
     text_y = badge_y + (badge_height - text_height) // 2 - 2
-    
-    # Draw text
     draw.text((text_x, text_y), badge_text, fill=text_color, font=font_bold)
     
     # For pending: add warning triangles on sides
-    if pending_amount > 0:
-        # Draw warning indicators on left and right
+    if is_pending:
         warn_size = badge_height - 12
         _draw_warning_triangle(draw, badge_x + 10, badge_y + 6, warn_size)
         _draw_warning_triangle(draw, badge_x + badge_width - warn_size - 10, badge_y + 6, warn_size)
     
-    # Convert back to RGB
-    img = img.convert("RGB")
+    return sprite
+
+
+def create_badge_overlay(pil_image, pending_amount, badge_position="bottom"):
+    """
+    Overlay a PROMINENT payment status indicator on a PIL image.
+    
+    VISUAL RULES:
+    - If pending_amount > 0: 
+      * Apply semi-transparent DARK overlay
+      * Show ORANGE/RED "FEE PENDING" badge
+    - If pending_amount == 0:
+      * NO dark overlay (normal photo)
+      * Show GREEN "PAID" badge
+    
+    The overlay is rendered once per (image size, status, position) and
+    then laid over each photo with a single alpha_composite.
     
-    return img
+    Args:
+        pil_image: PIL Image object
+        pending_amount: Amount pending (0 = paid, >0 = pending)
+        badge_position: 'top', 'bottom', 'top-right', 'bottom-right'
+    
+    Returns:
+        PIL Image with status overlay
+    """
+    from PIL import Image
+    
+    sprite = _badge_sprite(pil_image.size, pending_amount > 0, badge_position)
+    return Image.alpha_composite(pil_image.convert("RGBA"), sprite).convert("RGB")
 
 
 def _draw_rounded_rectangle(draw, coords, radius, fill=None, outline=None, width=1):
@@ -405,23 +406,13 @@ def _draw_warning_triangle(draw, x, y, size):
     draw.ellipse([exc_x - 2, exc_bottom - 2, exc_x + 2, exc_bottom + 2], fill=(0, 0, 0, 255))
 
 
-def create_mini_badge_overlay(pil_image, pending_amount):
-    """
-    Create a small payment status badge overlay for thumbnail images.
-    Used in the members list to show PENDING/PAID status at a glance.
-    
-    Args:
-        pil_image: PIL Image object (small thumbnail, e.g., 40x40)
-        pending_amount: Amount pending (0 = paid, >0 = pending)
-    
-    Returns:
-        PIL Image with mini status badge in top-right corner
-    """
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _mini_badge_sprite(size, is_pending):
+    """RGBA layer with the status dot of create_mini_badge_overlay. Shared - never modify it."""
     from PIL import Image, ImageDraw
     
-    # Make a copy to avoid modifying original
-    img = pil_image.copy().convert("RGBA")
-    img_width, img_height = img.size
+    sprite = Image.new("RGBA", size, (0, 0, 0, 0))
+    img_width, img_height = size
     
     # Badge size - proportional to image (for 40x40 image, badge is about 14x14)
     badge_size = max(12, img_width // 3)
@@ -431,10 +422,9 @@ def create_mini_badge_overlay(pil_image, pending_amount):
     badge_x = img_width - badge_size - badge_padding
     badge_y = badge_padding
     
-    # Create badge
-    draw = ImageDraw.Draw(img)
+    draw = ImageDraw.Draw(sprite)
     
-    if pending_amount > 0:
+    if is_pending:
         # PENDING - Orange/Red circle with exclamation
         badge_color = (231, 76, 60, 255)  # Red
         draw.ellipse(
@@ -469,24 +459,34 @@ def create_mini_badge_overlay(pil_image, pending_amount):
         draw.line([(check_start_x, check_y1), (check_mid_x, check_y2)], fill=(255, 255, 255, 255), width=2)
         draw.line([(check_mid_x, check_y2), (check_end_x, check_y3)], fill=(255, 255, 255, 255), width=2)
     
-    # Convert back to RGB
-    img = img.convert("RGB")
-    return img
+    return sprite
 
 
-def create_default_avatar(size=(200, 200), pending_amount=None):
+def create_mini_badge_overlay(pil_image, pending_amount):
     """
-    Create a default avatar image when no photo is available.
-    Optionally applies payment status badge.
+    Create a small payment status badge overlay for thumbnail images.
+    Used in the members list to show PENDING/PAID status at a glance.
     
     Args:
-        size: Tuple of (width, height)
-        pending_amount: If provided, applies badge overlay
+        pil_image: PIL Image object (small thumbnail, e.g., 40x40)
+        pending_amount: Amount pending (0 = paid, >0 = pending)
     
     Returns:
-        PIL Image object.
+        PIL Image with mini status badge in top-right corner
+    """
+    from PIL import Image
+    
+    sprite = _mini_badge_sprite(pil_image.size, pending_amount > 0)
+    return Image.alpha_composite(pil_image.convert("RGBA"), sprite).convert("RGB")
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _default_avatar(size, badge_state):
     """
-    from PIL import Image, ImageDraw, ImageFont
+    Default avatar, with the badge of badge_state (None, "paid" or
+    "pending") applied. Shared - create_default_avatar hands out copies.
+    """
+    from PIL import Image, ImageDraw
     
     # Create image with dark gray background
     img = Image.new("RGB", size, (60, 60, 60))
@@ -523,13 +523,34 @@ def create_default_avatar(size=(200, 200), pending_amount=None):
         fill=icon_color
     )
     
-    # Apply badge if pending_amount is provided
-    if pending_amount is not None:
-        img = create_badge_overlay(img, pending_amount)
+    if badge_state is not None:
+        img = create_badge_overlay(img, 1 if badge_state == "pending" else 0)
     
     return img
 
 
+def create_default_avatar(size=(200, 200), pending_amount=None):
+    """
+    Create a default avatar image when no photo is available.
+    Optionally applies payment status badge.
+    
+    The drawing is cached per size and payment state; each call returns a
+    fresh copy.
+    
+    Args:
+        size: Tuple of (width, height)
+        pending_amount: If provided, applies badge overlay
+    
+    Returns:
+        PIL Image object.
+    """
+    if pending_amount is None:
+        badge_state = None
+    else:
+        badge_state = "pending" if pending_amount > 0 else "paid"
+    return _default_avatar(tuple(size), badge_state).copy()
+
+
 def save_member_photo(pil_image, phone, resize=True):
     """
     Save a member's photo to disk.
@@ -559,7 +580,13 @@ def save_member_photo(pil_image, phone, resize=True):
     
     # Return relative path for database storage
     clean_phone = phone.strip().replace(" ", "").replace("-", "")
-    return f"assets/member_photos/member_{clean_phone}.jpg"
+    photo_path = f"assets/member_photos/member_{clean_phone}.jpg"
+    
+    # Drop thumbnails rendered from the previous photo
+    from thumbnail_cache import invalidate_thumbnails
+    invalidate_thumbnails(photo_path)
+    
+    return photo_path
 
 
 def load_member_photo_with_badge(photo_path, pending_amount, size=(200, 200)):
@@ -583,14 +610,145 @@ def load_member_photo_with_badge(photo_path, pending_amount, size=(200, 200)):
             if os.path.exists(full_path):
                 img = Image.open(full_path)
                 img = resize_image_pil(img, size)
-            else:
-                img = create_default_avatar(size)
-        else:
-            img = create_default_avatar(size)
+                
+                # Apply badge overlay
+                return create_badge_overlay(img, pending_amount)
     except Exception:
-        img = create_default_avatar(size)
+        pass
     
-    # Apply badge overlay
-    img = create_badge_overlay(img, pending_amount)
-    
-    return img
+    # No usable photo: the default avatar comes with its badge cached
+    return create_default_avatar(size, pending_amount)
+
+
+# Login background: the darkened, blurred image is rendered at each of these
+# widths (or the source's own width if it is narrower than the last), each
+# the first time a window size needs it, and kept on disk in
+# LOGIN_BG_CACHE_DIR, keyed by the source file's modification time. A window
+# size is served by scaling the nearest larger rendering.
+LOGIN_BG_WIDTHS = (960, 1440, 1920, 2560)
+LOGIN_BG_CACHE_DIR = "cache"
+LOGIN_BG_BRIGHTNESS = 0.45
+LOGIN_BG_BLUR_RADIUS = 1
+LOGIN_BG_FILL = (13, 13, 13)
+
+
+def _login_bg_cache_path(cache_dir, source, mtime_ns, width):
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, f"{name}_{mtime_ns}_{width}.jpg")
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _login_bg_levels(source, mtime_ns):
+    """((width, height), ...) of the renderings of source, smallest first"""
+    from PIL import Image
+    with Image.open(source) as img:
+        src_w, src_h = img.size
+    widths = [w for w in LOGIN_BG_WIDTHS if w < src_w] + [min(src_w, LOGIN_BG_WIDTHS[-1])]
+    return tuple((w, max(1, round(w * src_h / src_w))) for w in widths)
+
+
+def _render_login_bg_level(source, mtime_ns, width, height, cache_dir):
+    """
+    Darken and blur the source at one level, save the rendering to
+    cache_dir (dropping those of older versions of the source) and return
+    it. Saving is best effort.
+    """
+    from PIL import Image, ImageEnhance, ImageFilter
+
+    with Image.open(source) as img:
+        # JPEG sources are decoded at the smallest scale still >= the level
+        img.draft("RGB", (width, height))
+        img = img.convert("RGB")
+    if img.size != (width, height):
+        img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    darkened = ImageEnhance.Brightness(img).enhance(LOGIN_BG_BRIGHTNESS)
+    rendered = darkened.filter(ImageFilter.GaussianBlur(radius=LOGIN_BG_BLUR_RADIUS))
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        prefix = os.path.splitext(os.path.basename(source))[0] + "_"
+        current = f"{prefix}{mtime_ns}_"
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name.endswith(".jpg") and not name.startswith(current):
+                os.remove(os.path.join(cache_dir, name))
+        path = _login_bg_cache_path(cache_dir, source, mtime_ns, width)
+        rendered.save(path + ".tmp", "JPEG", quality=92)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Background cache error: {e}")
+    return rendered
+
+
+# Full-window images: only the level in use and its neighbour stay in memory
+@lru_cache(maxsize=2)
+def _login_bg_level(source, mtime_ns, width, cache_dir):
+    """One rendering, from the disk cache or rendered now (that level only)"""
+    from PIL import Image
+    try:
+        with Image.open(_login_bg_cache_path(cache_dir, source, mtime_ns, width)) as img:
+            return img.convert("RGB")
+    except OSError:
+        height = dict(_login_bg_levels(source, mtime_ns))[width]
+        return _render_login_bg_level(source, mtime_ns, width, height, cache_dir)
+
+
+@lru_cache(maxsize=1)
+def _login_bg_fill():
+    """LOGIN_BG_FILL after the same darkening as the image"""
+    from PIL import Image, ImageEnhance
+    pixel = Image.new("RGB", (1, 1), LOGIN_BG_FILL)
+    return ImageEnhance.Brightness(pixel).enhance(LOGIN_BG_BRIGHTNESS).getpixel((0, 0))
+
+
+def render_login_background(source, width, height, cache_dir=None):
+    """
+    The login screen background for a window of width x height.
+
+    The image is fitted inside the window without cropping and centred on
+    a dark canvas, darkened and lightly blurred for text readability. The
+    first call after the source changes renders only the LOGIN_BG_WIDTHS
+    level this size needs, and other levels are rendered when a window size
+    first needs them; later calls, also in later runs, only scale the
+    nearest larger level and paste it.
+
+    Args:
+        source: Path of the background image
+        width, height: Window size in pixels
+        cache_dir: Folder for the renderings (default: LOGIN_BG_CACHE_DIR
+                   in the data directory)
+
+    Returns:
+        PIL Image, or None if the size is empty or the image can't be read
+    """
+    from PIL import Image
+
+    if width <= 1 or height <= 1:
+        return None
+    cache_dir = cache_dir or get_data_path(LOGIN_BG_CACHE_DIR)
+    try:
+        mtime_ns = os.stat(source).st_mtime_ns
+        levels = _login_bg_levels(source, mtime_ns)
+
+        # Scaling to FIT the entire image (contain mode - no cropping)
+        level_w, level_h = levels[-1]
+        img_ratio = level_w / level_h
+        if width / height > img_ratio:
+            # Window is wider - fit by height
+            new_width, new_height = max(1, int(height * img_ratio)), height
+        else:
+            # Window is taller - fit by width
+            new_width, new_height = width, max(1, int(width / img_ratio))
+
+        level_w = next((w for w, h in levels if w >= new_width), levels[-1][0])
+        img = _login_bg_level(source, mtime_ns, level_w, cache_dir)
+        if img.size != (new_width, new_height):
+            # The image is already blurred: bilinear is indistinguishable
+            # from LANCZOS here at half the cost
+            img = img.resize((new_width, new_height), Image.Resampling.BILINEAR)
+    except OSError as e:
+        print(f"Background image error: {e}")
+        return None
+
+    canvas = Image.new("RGB", (width, height), _login_bg_fill())
+    canvas.paste(img, ((width - new_width) // 2, (height - new_height) // 2))
+    return canvas
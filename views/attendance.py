@@ -10,6 +10,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import database as db
+import events
+import member_status
 from utils import (
     format_date, format_currency, get_remaining_days, is_membership_valid, 
     validate_phone, get_membership_status, FEE_MAP, calculate_pending_fee, TRAINERS,
@@ -21,14 +23,21 @@ from ui_theme import (
     SUCCESS, SUCCESS_DARK, ERROR, ERROR_DARK, WARNING, INFO, INFO_DARK,
     BORDER_COLOR, TABLE_ROW_ODD, TABLE_ROW_EVEN
 )
+from views.search_controller import SearchController
 
 
 class AttendanceView(ctk.CTkFrame):
+    # Kept current through change events (see on_data_change)
+    LIVE_UPDATES = True
+    
     def __init__(self, parent):
         super().__init__(parent, fg_color=BG_PRIMARY)
         # Store image references to prevent garbage collection
         self._photo_images = {}
+        self._attendance_rows = []  # Row frames, newest first
+        self._search = SearchController(self, self._search_members, self._on_search_results)
         self.create_widgets()
+        events.subscribe(self.on_data_change, "attendance", "members")
         
     def create_widgets(self):
         # Main container
@@ -359,23 +368,30 @@ class AttendanceView(ctk.CTkFrame):
             f"Membership: {remaining} days remaining")
         
         self.phone_checkin_var.set("")
-        self.load_attendance()
     
     def on_search(self, *args):
-        """Search for members"""
-        for widget in self.search_results.winfo_children():
-            widget.destroy()
-            
+        """Search for members (debounced, runs in the background)"""
         query = self.search_var.get().strip()
         if not query:
+            self._search.cancel()
+            for widget in self.search_results.winfo_children():
+                widget.destroy()
             return
-            
-        members = db.search_members(query)
+        self._search.schedule(query)
+    
+    def _search_members(self, query):
+        """Search query - runs on the search worker thread"""
+        members = db.search_members(query, limit=8)  # Show max 8 results
+        checked_in = db.get_checked_in_member_ids(m['id'] for m in members)
+        statuses = member_status.MemberSnapshot(members)
+        return [(member, member['id'] in checked_in, statuses.status(i)) for i, member in enumerate(members)]
+    
+    def _on_search_results(self, query, results):
+        """Show search results"""
+        for widget in self.search_results.winfo_children():
+            widget.destroy()
         
-        for member in members[:8]:  # Show max 8 results
-            is_valid = is_membership_valid(member['end_date'])
-            remaining = get_remaining_days(member['end_date'])
-            already_checked = db.check_already_checked_in(member['id'])
+        for member, already_checked, (is_valid, remaining, _) in results:
             has_pending = member['payment_status'] == 'Pending'
             
             result_frame = ctk.CTkFrame(self.search_results, fg_color=BG_HOVER, corner_radius=5)
@@ -584,8 +600,6 @@ class AttendanceView(ctk.CTkFrame):
             text_color=TEXT_MUTED
         )
         self.member_info_label.pack(pady=20)
-        
-        self.load_attendance()
     
     def on_filter_change(self, value):
         """Handle trainer filter change"""
@@ -595,83 +609,142 @@ class AttendanceView(ctk.CTkFrame):
         """Load today's attendance"""
         for widget in self.attendance_list.winfo_children():
             widget.destroy()
+        self._attendance_rows = []
         
         filter_trainer = self.filter_var.get()
-        
-        if filter_trainer == "All":
-            attendance = db.get_today_attendance()
-        else:
-            attendance = db.get_attendance_by_trainer(filter_trainer)
-            # Filter to today only
-            from datetime import date
-            today = date.today().strftime('%Y-%m-%d')
-            attendance = [a for a in attendance if a['date'] == today]
+        today = datetime.now().strftime('%Y-%m-%d')
+        attendance = db.query_attendance(
+            date_from=today, date_to=today,
+            trainer_name=None if filter_trainer == "All" else filter_trainer
+        )
         
         self.stats_label.configure(text=f"Total Check-ins Today: {len(attendance)}")
         
+        self.no_attendance_label = ctk.CTkLabel(
+            self.attendance_list,
+            text="No check-ins yet today",
+            font=ctk.CTkFont(size=14),
+            text_color=TEXT_MUTED
+        )
         if not attendance:
-            ctk.CTkLabel(
-                self.attendance_list,
-                text="No check-ins yet today",
-                font=ctk.CTkFont(size=14),
-                text_color=TEXT_MUTED
-            ).pack(pady=50)
+            self.no_attendance_label.pack(pady=50)
             return
         
+        # Numbered in check-in order, so a new check-in never renumbers the rows below it
         for i, record in enumerate(attendance):
-            row_bg = TABLE_ROW_ODD if i % 2 == 0 else TABLE_ROW_EVEN
-            row = ctk.CTkFrame(self.attendance_list, fg_color=row_bg, corner_radius=5)
+            row = self._create_attendance_row(record, len(attendance) - i)
             row.pack(fill="x", pady=2)
-            
-            # Number
-            ctk.CTkLabel(
-                row,
-                text=str(i + 1),
-                font=ctk.CTkFont(size=12),
-                text_color=TEXT_MUTED,
-                width=40
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Name
-            ctk.CTkLabel(
-                row,
-                text=record['member_name'],
-                font=ctk.CTkFont(size=12),
-                text_color=TEXT_PRIMARY,
-                width=180,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Phone
-            ctk.CTkLabel(
-                row,
-                text=record['member_phone'],
-                font=ctk.CTkFont(size=12),
-                text_color=TEXT_MUTED,
-                width=120,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Time
-            ctk.CTkLabel(
-                row,
-                text=record['check_in_time'],
-                font=ctk.CTkFont(size=12),
-                text_color=SUCCESS,
-                width=100,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Trainer
-            ctk.CTkLabel(
-                row,
-                text=record['trainer_name'] or "-",
-                font=ctk.CTkFont(size=12),
-                text_color=WARNING if record['trainer_name'] else TEXT_MUTED,
-                width=100,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
+            self._attendance_rows.append(row)
+    
+    def _create_attendance_row(self, record, number):
+        """Build one attendance row (not packed)"""
+        row_bg = TABLE_ROW_ODD if number % 2 == 1 else TABLE_ROW_EVEN
+        row = ctk.CTkFrame(self.attendance_list, fg_color=row_bg, corner_radius=5)
+        row.attendance_id = record['id']
+        row.member_id = record['member_id']
+        
+        # Number
+        ctk.CTkLabel(
+            row,
+            text=str(number),
+            font=ctk.CTkFont(size=12),
+            text_color=TEXT_MUTED,
+            width=40
+        ).pack(side="left", padx=5, pady=10)
+        
+        # Name
+        ctk.CTkLabel(
+            row,
+            text=record['member_name'],
+            font=ctk.CTkFont(size=12),
+            text_color=TEXT_PRIMARY,
+            width=180,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        # Phone
+        ctk.CTkLabel(
+            row,
+            text=record['member_phone'],
+            font=ctk.CTkFont(size=12),
+            text_color=TEXT_MUTED,
+            width=120,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        # Time
+        ctk.CTkLabel(
+            row,
+            text=record['check_in_time'],
+            font=ctk.CTkFont(size=12),
+            text_color=SUCCESS,
+            width=100,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        # Trainer
+        ctk.CTkLabel(
+            row,
+            text=record['trainer_name'] or "-",
+            font=ctk.CTkFont(size=12),
+            text_color=WARNING if record['trainer_name'] else TEXT_MUTED,
+            width=100,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        return row
+    
+    def on_data_change(self, event):
+        """
+        Apply a change event: a new check-in adds one row at the top, and
+        only changes to today's records reload the list
+        """
+        if event.table == "members":
+            # Reload only if a listed member was edited or deleted (name/phone may have changed)
+            if event.operation != events.INSERT and any(
+                    row.member_id == event.row_id for row in self._attendance_rows):
+                self.load_attendance()
+            return
+        
+        if event.row_id is None:
+            # Bulk change (a batch of queued check-ins, a restored backup):
+            # which rows changed isn't known, and it's rare, so rebuild
+            self.load_attendance()
+            return
+        
+        listed = any(row.attendance_id == event.row_id for row in self._attendance_rows)
+        if event.operation == events.DELETE:
+            if listed:
+                self.load_attendance()
+            return
+        
+        record = db.get_attendance_record(event.row_id)
+        is_today = record is not None and record['date'] == datetime.now().strftime('%Y-%m-%d')
+        if event.operation != events.INSERT:
+            # Edited record: only matters if it is, or was, in today's list
+            if listed or is_today:
+                self.load_attendance()
+            return
+        if not is_today:
+            return
+        filter_trainer = self.filter_var.get()
+        if filter_trainer != "All" and record['trainer_name'] != filter_trainer:
+            return
+        
+        row = self._create_attendance_row(record, len(self._attendance_rows) + 1)
+        if self._attendance_rows:
+            row.pack(fill="x", pady=2, before=self._attendance_rows[0])
+        else:
+            self.no_attendance_label.pack_forget()
+            row.pack(fill="x", pady=2)
+        self._attendance_rows.insert(0, row)
+        self.stats_label.configure(text=f"Total Check-ins Today: {len(self._attendance_rows)}")
     
     def refresh(self):
         """Refresh the view"""
         self.load_attendance()
+    
+    def destroy(self):
+        events.unsubscribe(self.on_data_change)
+        self._search.cancel()
+        super().destroy()
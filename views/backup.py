@@ -0,0 +1,244 @@
+"""
+Backup Dialog for Horsepower Gym Management System
+Lists database snapshots, takes one on demand and restores a chosen one
+"""
+
+import customtkinter as ctk
+from tkinter import messagebox
+import threading
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import backup
+from ui_theme import (
+    BG_SECONDARY, BG_TERTIARY, ACCENT_GOLD, ACCENT_GOLD_HOVER, TEXT_PRIMARY,
+    TEXT_MUTED, TEXT_DARK, ERROR, ERROR_DARK, WARNING, WARNING_DARK,
+    TABLE_ROW_ODD, TABLE_ROW_EVEN
+)
+
+
+# How often the dialog picks up progress from the backup thread (ms)
+PROGRESS_POLL_MS = 100
+
+
+class BackupDialog(ctk.CTkToplevel):
+    """Dialog listing snapshots with Back up now / Restore"""
+
+    def __init__(self, parent, scheduler=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self._thread = None
+        self._task = None       # ("backup", None) or ("restore", taken) while a thread runs
+        self._progress = None   # (pages done, pages total), written by the backup thread
+        self._outcome = None    # ("done", path) or ("error", exception)
+        self._poll_id = None
+
+        # Window configuration
+        self.title("💾 Backups")
+        self.geometry("560x520")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+
+        # Center window
+        self.update_idletasks()
+        x = (self.winfo_screenwidth() // 2) - 280
+        y = (self.winfo_screenheight() // 2) - 260
+        self.geometry(f"+{x}+{y}")
+
+        self.configure(fg_color=BG_SECONDARY)
+
+        # Header
+        ctk.CTkLabel(
+            self,
+            text="💾 Database Backups",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            text_color=ACCENT_GOLD
+        ).pack(pady=(15, 5))
+
+        ctk.CTkLabel(
+            self,
+            text=f"Taken automatically every {backup.BACKUP_INTERVAL_HOURS} hours into {backup.get_backup_dir()}",
+            font=ctk.CTkFont(size=11),
+            text_color=TEXT_MUTED,
+            wraplength=500
+        ).pack(padx=20)
+
+        # Snapshot list
+        self.snapshot_list = ctk.CTkScrollableFrame(self, fg_color=BG_TERTIARY, height=280)
+        self.snapshot_list.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # Progress
+        self.progress_bar = ctk.CTkProgressBar(self, progress_color=ACCENT_GOLD)
+        self.progress_bar.pack(fill="x", padx=20, pady=(0, 5))
+        self.progress_bar.set(0)
+
+        self.status_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=12), text_color=TEXT_MUTED)
+        self.status_label.pack()
+        if scheduler is not None and scheduler.last_error:
+            self.status_label.configure(text=f"Last automatic backup failed: {scheduler.last_error}",
+                                        text_color=ERROR)
+
+        # Buttons
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(pady=10)
+
+        self.backup_btn = ctk.CTkButton(
+            btn_frame,
+            text="💾 Back Up Now",
+            command=self.start_backup,
+            fg_color=ACCENT_GOLD,
+            hover_color=ACCENT_GOLD_HOVER,
+            text_color=TEXT_DARK,
+            width=140,
+            height=40,
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        self.backup_btn.pack(side="left", padx=10)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="❌ Close",
+            command=self.close,
+            fg_color=ERROR,
+            hover_color=ERROR_DARK,
+            width=120,
+            height=40,
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).pack(side="left", padx=10)
+
+        self.bind("<Escape>", lambda e: self.close())
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.load_snapshots()
+
+    def load_snapshots(self):
+        for widget in self.snapshot_list.winfo_children():
+            widget.destroy()
+
+        snapshots = backup.list_snapshots()
+        if not snapshots:
+            ctk.CTkLabel(self.snapshot_list, text="No backups yet", text_color=TEXT_MUTED).pack(pady=20)
+            return
+
+        for i, snapshot in enumerate(snapshots):
+            row = ctk.CTkFrame(self.snapshot_list, fg_color=TABLE_ROW_ODD if i % 2 else TABLE_ROW_EVEN)
+            row.pack(fill="x", pady=1)
+            taken = snapshot["taken"].strftime('%d-%m-%Y %H:%M')
+            label = f"  ({snapshot['label']})" if snapshot["label"] else ""
+            ctk.CTkLabel(
+                row,
+                text=f"{taken}{label}",
+                text_color=TEXT_PRIMARY,
+                anchor="w",
+                width=250
+            ).pack(side="left", padx=10, pady=5)
+            ctk.CTkLabel(
+                row,
+                text=f"{snapshot['size'] / 2 ** 20:.1f} MB",
+                text_color=TEXT_MUTED,
+                width=80
+            ).pack(side="left")
+            ctk.CTkButton(
+                row,
+                text="↩ Restore",
+                width=90,
+                height=28,
+                fg_color=WARNING,
+                hover_color=WARNING_DARK,
+                command=lambda s=snapshot: self.restore(s)
+            ).pack(side="right", padx=10)
+
+    def start_backup(self):
+        """Take a snapshot on a background thread (it never blocks check-ins)"""
+        if self._thread is not None:
+            return
+        self._start(("backup", None), self._run_backup, "Backing up...")
+
+    def _start(self, task, target, text, args=()):
+        self._task = task
+        self._progress = None
+        self._outcome = None
+        self.backup_btn.configure(state="disabled", text=text)
+        self.progress_bar.set(0)
+        self.status_label.configure(text=text, text_color=TEXT_MUTED)
+        self._thread = threading.Thread(target=target, args=args, name=f"{task[0]}-now", daemon=True)
+        self._thread.start()
+        self._poll_id = self.after(PROGRESS_POLL_MS, self._poll)
+
+    def _set_progress(self, done, total):
+        self._progress = (done, total)
+
+    def _run_backup(self):
+        """Backup thread: never touches Tk, only the _progress/_outcome attributes"""
+        try:
+            self._outcome = ("done", backup.backup(progress=self._set_progress))
+        except Exception as e:
+            self._outcome = ("error", e)
+
+    def _run_restore(self, path):
+        """Restore thread: like _run_backup; _poll publishes the change events"""
+        try:
+            self._outcome = ("done", backup.restore(path, progress=self._set_progress, publish=False))
+        except Exception as e:
+            self._outcome = ("error", e)
+
+    def _poll(self):
+        self._poll_id = None
+        if self._progress is not None:
+            done, total = self._progress
+            self.progress_bar.set(done / total if total else 1)
+        if self._outcome is None:
+            self._poll_id = self.after(PROGRESS_POLL_MS, self._poll)
+            return
+
+        self._thread = None
+        self.backup_btn.configure(state="normal", text="💾 Back Up Now")
+        (task, taken), (status, value) = self._task, self._outcome
+        self._task = None
+        if task == "restore":
+            self._finish_restore(status, value, taken)
+        elif status == "done":
+            self.progress_bar.set(1)
+            self.status_label.configure(text=f"Saved {os.path.basename(value)}", text_color=ACCENT_GOLD)
+            self.load_snapshots()
+        else:
+            self.status_label.configure(text="Backup failed", text_color=ERROR)
+            messagebox.showerror("Backup Error", str(value), parent=self)
+
+    def restore(self, snapshot):
+        """Replace the database with a snapshot on a background thread (see backup.restore)"""
+        if self._thread is not None:
+            return
+        taken = snapshot["taken"].strftime('%d-%m-%Y %H:%M')
+        if not messagebox.askyesno(
+            "Confirm Restore",
+            f"Replace all current data with the backup from {taken}?\n\n"
+            "Changes made since then will be lost. The current data is saved "
+            "as a backup first, so this can be undone.",
+            parent=self
+        ):
+            return
+        self._start(("restore", taken), self._run_restore, "Restoring...", (snapshot["path"],))
+
+    def _finish_restore(self, status, value, taken):
+        if status != "done":
+            self.status_label.configure(text="Restore failed", text_color=ERROR)
+            messagebox.showerror("Restore Error", str(value), parent=self)
+            return
+        # Change events go out on the Tk thread, where the views handle them
+        backup.publish_restore()
+        self.progress_bar.set(1)
+        self.status_label.configure(text=f"Restored the backup from {taken}", text_color=ACCENT_GOLD)
+        self.load_snapshots()
+        messagebox.showinfo("Restore Complete", f"The data from {taken} has been restored.", parent=self)
+
+    def close(self):
+        """Close the dialog (a backup in progress finishes in the background)"""
+        if self._task is not None and self._task[0] == "restore":
+            return  # The views reload when the restore completes (see _poll)
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.grab_release()
+        self.destroy()
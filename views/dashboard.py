@@ -10,14 +10,29 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import database as db
+import db_executor
+import events
 from utils import format_currency, GYM_INFO
 from ui_theme import *
 
 
+# Rows shown in "Recent Check-ins Today"
+RECENT_CHECKINS = 10
+
+
 class DashboardView(ctk.CTkFrame):
+    # Refresh every time the view is shown (date/time labels; stats are cached)
+    REFRESH_ON_SHOW = True
+    
     def __init__(self, parent):
         super().__init__(parent, fg_color=BG_PRIMARY)
+        self._stat_labels = {}      # stats key -> value label
+        self._info_labels = {}      # info label text -> value label
+        self._checkin_rows = []     # Reusable (frame, name label, time label)
+        self._refresh_id = None
         self.create_widgets()
+        self.refresh()
+        events.subscribe(self.on_data_change, "members", "attendance", "payments", "personal_training")
         
     def create_widgets(self):
         # Header with gray theme
@@ -46,15 +61,15 @@ class DashboardView(ctk.CTkFrame):
         # Configure grid
         cards_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
         
-        # Create stat cards
+        # Create stat cards (values are filled in by refresh)
         self.create_stat_card(cards_frame, 0, "👥", "Total Members", 
-                             str(db.get_total_members_count()), "#3498db")
+                             "total_members", "#3498db")
         self.create_stat_card(cards_frame, 1, "✅", "Active Members", 
-                             str(db.get_active_members_count()), "#2ecc71")
+                             "active_members", "#2ecc71")
         self.create_stat_card(cards_frame, 2, "⚠️", "Expired Members", 
-                             str(db.get_expired_members_count()), "#e74c3c")
+                             "expired_members", "#e74c3c")
         self.create_stat_card(cards_frame, 3, "📅", "Today's Attendance", 
-                             str(db.get_today_attendance_count()), "#9b59b6")
+                             "today_attendance", "#9b59b6")
         
         # Second row of cards
         cards_frame2 = ctk.CTkFrame(self, fg_color="transparent")
@@ -62,17 +77,15 @@ class DashboardView(ctk.CTkFrame):
         cards_frame2.grid_columnconfigure((0, 1, 2), weight=1)
         
         self.create_stat_card(cards_frame2, 0, "💰", "Monthly Revenue", 
-                             format_currency(db.get_monthly_revenue()), "#f39c12")
+                             "monthly_revenue", "#f39c12")
         
         # Pending Payments card - shows members with outstanding dues
-        pending_members = db.get_pending_payments()
-        pending_count = len(pending_members) if pending_members else 0
         self.create_stat_card(cards_frame2, 1, "💳", "Pending Payments", 
-                             str(pending_count), "#e74c3c")
+                             "pending_payments", "#e74c3c")
         
         # Today's Collections
         self.create_stat_card(cards_frame2, 2, "📈", "Today's Collections", 
-                             format_currency(db.get_today_collections()), "#2ecc71")
+                             "today_collections", "#2ecc71")
         
         # Quick Actions - Gray theme
         actions_frame = ctk.CTkFrame(self, fg_color=BG_SECONDARY, corner_radius=RADIUS_MD)
@@ -113,12 +126,14 @@ class DashboardView(ctk.CTkFrame):
                 text_color=ACCENT_GOLD
             ).pack(anchor="w", padx=10, pady=(8, 2))
             
-            ctk.CTkLabel(
+            value_label = ctk.CTkLabel(
                 item_frame,
                 text=value,
                 font=ctk.CTkFont(size=12),
                 text_color=TEXT_PRIMARY
-            ).pack(anchor="w", padx=10, pady=(0, 8))
+            )
+            value_label.pack(anchor="w", padx=10, pady=(0, 8))
+            self._info_labels[label] = value_label
         
         # Today's Attendance Preview - Gray theme
         attendance_frame = ctk.CTkFrame(self, fg_color=BG_SECONDARY, corner_radius=RADIUS_MD)
@@ -132,39 +147,43 @@ class DashboardView(ctk.CTkFrame):
         ).pack(anchor="w", padx=20, pady=(15, 10))
         
         # Attendance list
-        attendance_list = ctk.CTkScrollableFrame(attendance_frame, fg_color=BG_TERTIARY, corner_radius=RADIUS_SM)
-        attendance_list.pack(fill="both", expand=True, padx=20, pady=(0, 15))
+        self.attendance_list = ctk.CTkScrollableFrame(attendance_frame, fg_color=BG_TERTIARY, corner_radius=RADIUS_SM)
+        self.attendance_list.pack(fill="both", expand=True, padx=20, pady=(0, 15))
         
-        today_attendance = db.get_today_attendance()
-        
-        if today_attendance:
-            for i, record in enumerate(today_attendance[:10]):  # Show last 10
-                item_frame = ctk.CTkFrame(attendance_list, fg_color=TABLE_ROW_ODD if i % 2 == 0 else TABLE_ROW_EVEN, corner_radius=5)
-                item_frame.pack(fill="x", padx=5, pady=2)
-                
-                ctk.CTkLabel(
-                    item_frame,
-                    text=f"✓ {record['member_name']}",
-                    font=ctk.CTkFont(size=13, weight="bold"),
-                    text_color=SUCCESS
-                ).pack(side="left", padx=10, pady=8)
-                
-                ctk.CTkLabel(
-                    item_frame,
-                    text=record['check_in_time'],
-                    font=ctk.CTkFont(size=12),
-                    text_color=TEXT_MUTED
-                ).pack(side="right", padx=10, pady=8)
-        else:
-            ctk.CTkLabel(
-                attendance_list,
-                text="No check-ins yet today",
-                font=ctk.CTkFont(size=14),
+        self.no_checkins_label = ctk.CTkLabel(
+            self.attendance_list,
+            text="No check-ins yet today",
+            font=ctk.CTkFont(size=14),
+            text_color=TEXT_MUTED
+        )
+    
+    def _get_checkin_row(self, i):
+        """Get the i-th check-in row, creating it on first use"""
+        while len(self._checkin_rows) <= i:
+            n = len(self._checkin_rows)
+            item_frame = ctk.CTkFrame(self.attendance_list, fg_color=TABLE_ROW_ODD if n % 2 == 0 else TABLE_ROW_EVEN, corner_radius=5)
+            
+            name_label = ctk.CTkLabel(
+                item_frame,
+                text="",
+                font=ctk.CTkFont(size=13, weight="bold"),
+                text_color=SUCCESS
+            )
+            name_label.pack(side="left", padx=10, pady=8)
+            
+            time_label = ctk.CTkLabel(
+                item_frame,
+                text="",
+                font=ctk.CTkFont(size=12),
                 text_color=TEXT_MUTED
-            ).pack(pady=30)
+            )
+            time_label.pack(side="right", padx=10, pady=8)
+            
+            self._checkin_rows.append((item_frame, name_label, time_label))
+        return self._checkin_rows[i]
     
-    def create_stat_card(self, parent, col, icon, title, value, color, wide=False):
-        """Create a statistics card with gray theme"""
+    def create_stat_card(self, parent, col, icon, title, stat_key, color, wide=False):
+        """Create a statistics card with gray theme (value comes from get_dashboard_stats()[stat_key])"""
         card = ctk.CTkFrame(parent, fg_color=BG_SECONDARY, corner_radius=RADIUS_MD)
         card.grid(row=0, column=col, padx=5, pady=5, sticky="ew", columnspan=2 if wide else 1)
         
@@ -176,12 +195,14 @@ class DashboardView(ctk.CTkFrame):
         ).pack(pady=(20, 5))
         
         # Value
-        ctk.CTkLabel(
+        value_label = ctk.CTkLabel(
             card,
-            text=value,
+            text="-",
             font=ctk.CTkFont(size=28, weight="bold"),
             text_color=color
-        ).pack(pady=5)
+        )
+        value_label.pack(pady=5)
+        self._stat_labels[stat_key] = value_label
         
         # Title
         ctk.CTkLabel(
@@ -192,8 +213,50 @@ class DashboardView(ctk.CTkFrame):
         ).pack(pady=(0, 20))
         
     def refresh(self):
-        """Refresh dashboard data"""
-        # Destroy and recreate widgets
-        for widget in self.winfo_children():
-            widget.destroy()
-        self.create_widgets()
+        """Refresh dashboard data in place (no widgets are rebuilt)"""
+        self._info_labels["📆 Date:"].configure(text=datetime.now().strftime('%d-%b-%Y'))
+        self._info_labels["⏰ Time:"].configure(text=datetime.now().strftime('%I:%M %p'))
+        
+        db_executor.submit(self, self._fetch_data, callback=self._show_data, tag="dashboard")
+    
+    def _fetch_data(self):
+        """Stats and recent check-ins - runs on a database worker thread"""
+        return db.get_dashboard_stats(), db.get_today_attendance(limit=RECENT_CHECKINS)
+    
+    def _show_data(self, result):
+        stats, today_attendance = result
+        for key, label in self._stat_labels.items():
+            if key in ("monthly_revenue", "today_collections"):
+                label.configure(text=format_currency(stats[key]))
+            else:
+                label.configure(text=str(stats[key]))
+        
+        # Recent check-ins - reuse the row widgets
+        for i, record in enumerate(today_attendance):
+            item_frame, name_label, time_label = self._get_checkin_row(i)
+            name_label.configure(text=f"✓ {record['member_name']}")
+            time_label.configure(text=record['check_in_time'])
+            if not item_frame.winfo_manager():
+                item_frame.pack(fill="x", padx=5, pady=2)
+        for item_frame, _, _ in self._checkin_rows[len(today_attendance):]:
+            item_frame.pack_forget()
+        
+        if today_attendance:
+            self.no_checkins_label.pack_forget()
+        elif not self.no_checkins_label.winfo_manager():
+            self.no_checkins_label.pack(pady=30)
+    
+    def on_data_change(self, event):
+        """Refresh the figures once after a burst of changes (e.g. a payment touches 2 tables)"""
+        if self._refresh_id is None:
+            self._refresh_id = self.after_idle(self._apply_refresh)
+    
+    def _apply_refresh(self):
+        self._refresh_id = None
+        self.refresh()
+    
+    def destroy(self):
+        events.unsubscribe(self.on_data_change)
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+        super().destroy()
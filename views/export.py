@@ -0,0 +1,269 @@
+"""
+Export Dialog for Horsepower Gym Management System
+Exports members, payments and attendance to files on a background thread
+"""
+
+import customtkinter as ctk
+from tkinter import messagebox, filedialog
+from datetime import datetime
+import threading
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import exporter
+from utils import get_data_path
+from ui_theme import (
+    BG_SECONDARY, BG_TERTIARY, ACCENT_GOLD, ACCENT_GOLD_HOVER, TEXT_PRIMARY,
+    TEXT_MUTED, TEXT_DARK, ERROR, ERROR_DARK, INFO, INFO_DARK, WARNING
+)
+
+
+# How often the dialog picks up progress from the export thread (ms)
+PROGRESS_POLL_MS = 100
+
+
+class ExportDialog(ctk.CTkToplevel):
+    """Dialog for exporting tables to CSV or compressed JSON Lines"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._thread = None
+        self._cancel = threading.Event()
+        self._progress = None   # (table, rows done, rows total), written by the export thread
+        self._outcome = None    # ("done", results) or ("error", exception)
+        self._poll_id = None
+
+        # Window configuration
+        self.title("📤 Export Data")
+        self.geometry("460x470")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+
+        # Center window
+        self.update_idletasks()
+        x = (self.winfo_screenwidth() // 2) - 230
+        y = (self.winfo_screenheight() // 2) - 235
+        self.geometry(f"+{x}+{y}")
+
+        self.configure(fg_color=BG_SECONDARY)
+
+        # Header
+        ctk.CTkLabel(
+            self,
+            text="📤 Export Data",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            text_color=ACCENT_GOLD
+        ).pack(pady=(15, 10))
+
+        # Tables
+        tables_frame = ctk.CTkFrame(self, fg_color="transparent")
+        tables_frame.pack(fill="x", padx=25, pady=5)
+        ctk.CTkLabel(tables_frame, text="Tables:", text_color=TEXT_MUTED).pack(side="left", padx=(0, 10))
+        self.table_vars = {}
+        for table in exporter.EXPORT_TABLES:
+            var = ctk.BooleanVar(value=True)
+            ctk.CTkCheckBox(
+                tables_frame,
+                text=table.capitalize(),
+                variable=var,
+                text_color=TEXT_PRIMARY,
+                width=20
+            ).pack(side="left", padx=5)
+            self.table_vars[table] = var
+
+        # Date range
+        range_frame = ctk.CTkFrame(self, fg_color="transparent")
+        range_frame.pack(fill="x", padx=25, pady=5)
+        ctk.CTkLabel(range_frame, text="From:", text_color=TEXT_MUTED).pack(side="left")
+        self.date_from_entry = ctk.CTkEntry(range_frame, width=120, placeholder_text="YYYY-MM-DD",
+                                            fg_color=BG_TERTIARY)
+        self.date_from_entry.pack(side="left", padx=(5, 15))
+        ctk.CTkLabel(range_frame, text="To:", text_color=TEXT_MUTED).pack(side="left")
+        self.date_to_entry = ctk.CTkEntry(range_frame, width=120, placeholder_text="YYYY-MM-DD",
+                                          fg_color=BG_TERTIARY)
+        self.date_to_entry.pack(side="left", padx=5)
+
+        ctk.CTkLabel(
+            self,
+            text="Leave empty for all dates (members filter on start date)",
+            font=ctk.CTkFont(size=11),
+            text_color=TEXT_MUTED
+        ).pack(padx=25, anchor="w")
+
+        # Format
+        format_frame = ctk.CTkFrame(self, fg_color="transparent")
+        format_frame.pack(fill="x", padx=25, pady=5)
+        ctk.CTkLabel(format_frame, text="Format:", text_color=TEXT_MUTED).pack(side="left")
+        self.format_var = ctk.StringVar(value="csv")
+        ctk.CTkComboBox(
+            format_frame,
+            values=exporter.available_formats(),
+            variable=self.format_var,
+            state="readonly",
+            width=140,
+            fg_color=BG_TERTIARY
+        ).pack(side="left", padx=5)
+
+        # Destination folder
+        folder_frame = ctk.CTkFrame(self, fg_color="transparent")
+        folder_frame.pack(fill="x", padx=25, pady=5)
+        self.folder = get_data_path("exports")
+        self.folder_label = ctk.CTkLabel(
+            folder_frame,
+            text=self.folder,
+            text_color=TEXT_PRIMARY,
+            font=ctk.CTkFont(size=11),
+            anchor="w",
+            wraplength=300
+        )
+        self.folder_label.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(
+            folder_frame,
+            text="📁 Change",
+            width=90,
+            fg_color=INFO,
+            hover_color=INFO_DARK,
+            command=self.choose_folder
+        ).pack(side="right")
+
+        # Progress
+        self.progress_bar = ctk.CTkProgressBar(self, progress_color=ACCENT_GOLD)
+        self.progress_bar.pack(fill="x", padx=25, pady=(20, 5))
+        self.progress_bar.set(0)
+
+        self.status_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=TEXT_MUTED
+        )
+        self.status_label.pack(pady=(0, 10))
+
+        # Buttons
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(pady=10)
+
+        self.export_btn = ctk.CTkButton(
+            btn_frame,
+            text="📤 Export",
+            command=self.start_export,
+            fg_color=ACCENT_GOLD,
+            hover_color=ACCENT_GOLD_HOVER,
+            text_color=TEXT_DARK,
+            width=120,
+            height=40,
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        self.export_btn.pack(side="left", padx=10)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="❌ Close",
+            command=self.close,
+            fg_color=ERROR,
+            hover_color=ERROR_DARK,
+            width=120,
+            height=40,
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).pack(side="left", padx=10)
+
+        self.bind("<Escape>", lambda e: self.close())
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    def choose_folder(self):
+        folder = filedialog.askdirectory(title="Export to folder", initialdir=self.folder, parent=self)
+        if folder:
+            self.folder = folder
+            self.folder_label.configure(text=folder)
+
+    def _get_date(self, entry, label):
+        """The entry's date as 'YYYY-MM-DD', None if empty; raises ValueError if invalid"""
+        value = entry.get().strip()
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"{label} date must be YYYY-MM-DD") from None
+
+    def start_export(self):
+        """Validate the form and run the export on a background thread"""
+        tables = [table for table, var in self.table_vars.items() if var.get()]
+        if not tables:
+            messagebox.showerror("Export", "Select at least one table", parent=self)
+            return
+        try:
+            date_from = self._get_date(self.date_from_entry, "From")
+            date_to = self._get_date(self.date_to_entry, "To")
+        except ValueError as e:
+            messagebox.showerror("Export", str(e), parent=self)
+            return
+
+        self._cancel.clear()
+        self._progress = None
+        self._outcome = None
+        self.export_btn.configure(state="disabled", text="Exporting...")
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Counting rows...", text_color=TEXT_MUTED)
+
+        # The export only reads; it runs on its own thread with its own
+        # connection so the UI stays responsive on multi-million-row tables
+        self._thread = threading.Thread(
+            target=self._run_export,
+            args=(self.folder, tables, self.format_var.get(), date_from, date_to),
+            name="export",
+            daemon=True
+        )
+        self._thread.start()
+        self._poll_id = self.after(PROGRESS_POLL_MS, self._poll)
+
+    def _run_export(self, folder, tables, fmt, date_from, date_to):
+        """Export thread: never touches Tk, only the _progress/_outcome attributes"""
+        def progress(table, done, total):
+            self._progress = (table, done, total)
+        try:
+            results = exporter.export(folder, tables, fmt, date_from, date_to, progress, self._cancel)
+            self._outcome = ("done", results)
+        except Exception as e:
+            self._outcome = ("error", e)
+
+    def _poll(self):
+        """Show the export thread's progress; finish once it has stopped"""
+        self._poll_id = None
+        if self._progress is not None:
+            table, done, total = self._progress
+            self.progress_bar.set(done / total if total else 1)
+            self.status_label.configure(text=f"{table.capitalize()}: {done:,} of {total:,} rows")
+        if self._outcome is None:
+            self._poll_id = self.after(PROGRESS_POLL_MS, self._poll)
+            return
+
+        self._thread = None
+        self.export_btn.configure(state="normal", text="📤 Export")
+        status, value = self._outcome
+        if status == "done":
+            self.progress_bar.set(1)
+            rows = sum(count for _, count in value.values())
+            self.status_label.configure(text=f"Exported {rows:,} rows", text_color=ACCENT_GOLD)
+            summary = "\n".join(f"{table}: {count:,} rows → {os.path.basename(path)}"
+                                for table, (path, count) in value.items())
+            messagebox.showinfo("Export Complete", f"{summary}\n\nSaved in {self.folder}", parent=self)
+        elif isinstance(value, exporter.ExportCancelled):
+            self.progress_bar.set(0)
+            self.status_label.configure(text="Export cancelled", text_color=WARNING)
+        else:
+            self.status_label.configure(text="Export failed", text_color=ERROR)
+            messagebox.showerror("Export Error", f"Export failed: {value}", parent=self)
+
+    def close(self):
+        """Close the dialog, cancelling a running export (its partial file is removed)"""
+        if self._thread is not None:
+            if not messagebox.askyesno("Cancel Export", "An export is running. Cancel it?", parent=self):
+                return
+            self._cancel.set()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.grab_release()
+        self.destroy()
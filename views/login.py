@@ -7,19 +7,27 @@ import customtkinter as ctk
 from tkinter import messagebox
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import database as db
-from utils import GYM_INFO, get_resource_path
-from PIL import Image, ImageFilter, ImageEnhance
+from utils import GYM_INFO, get_resource_path, render_login_background
+from PIL import Image
+
+
+# Quiet period after the last <Configure> event before the background is
+# re-rendered (ms), so dragging the window edge renders once, not per event
+RESIZE_SETTLE_MS = 120
 
 
 class LoginView(ctk.CTkFrame):
     def __init__(self, parent, on_login_success):
         super().__init__(parent, fg_color="#0d0d0d")
         self.on_login_success = on_login_success
-        self._bg_image = None
         self._bg_photo = None
-        self._original_bg = None
+        self._bg_path = None
+        self._bg_size = None          # Size the current background was rendered for
+        self._resize_id = None        # Pending _update_background after a resize
+        self._resize_events = 0       # <Configure> events since the last render
         self.create_widgets()
         
         # Bind resize event for responsive background
@@ -29,71 +37,27 @@ class LoginView(ctk.CTkFrame):
         self.after(50, self._initial_background_update)
     
     def _load_background_image(self):
-        """Load and prepare the background image"""
-        try:
-            bg_path = get_resource_path(os.path.join("assets", "login_bg.jpg"))
-            if os.path.exists(bg_path):
-                self._original_bg = Image.open(bg_path)
-                return True
-        except Exception as e:
-            print(f"Background image error: {e}")
+        """Locate the background image (rendered and cached by utils.render_login_background)"""
+        bg_path = get_resource_path(os.path.join("assets", "login_bg.jpg"))
+        if os.path.exists(bg_path):
+            self._bg_path = bg_path
+            return True
         return False
     
-    def _create_sized_background(self, width, height):
-        """Create background image sized to window with darkening effect"""
-        if self._original_bg is None:
-            return None
-        
-        if width <= 1 or height <= 1:
-            return None
-        
-        try:
-            # Calculate scaling to FIT entire image (contain mode - no cropping)
-            img_ratio = self._original_bg.width / self._original_bg.height
-            win_ratio = width / height
-            
-            if win_ratio > img_ratio:
-                # Window is wider - fit by height
-                new_height = height
-                new_width = int(height * img_ratio)
-            else:
-                # Window is taller - fit by width
-                new_width = width
-                new_height = int(width / img_ratio)
-            
-            # Resize to fit
-            resized = self._original_bg.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Create canvas with dark background and paste image centered
-            canvas = Image.new('RGB', (width, height), (13, 13, 13))
-            paste_x = (width - new_width) // 2
-            paste_y = (height - new_height) // 2
-            canvas.paste(resized, (paste_x, paste_y))
-            
-            # Darken the image for better text readability
-            enhancer = ImageEnhance.Brightness(canvas)
-            darkened = enhancer.enhance(0.45)
-            
-            # Add slight blur for depth effect
-            blurred = darkened.filter(ImageFilter.GaussianBlur(radius=1))
-            
-            return blurred
-        except Exception as e:
-            print(f"Background resize error: {e}")
-            return None
-    
     def _update_background(self):
         """Update background image to current window size"""
-        if not hasattr(self, 'bg_label'):
+        self._resize_id = None
+        if not hasattr(self, 'bg_label') or self._bg_path is None:
             return
         
         width = self.winfo_width()
         height = self.winfo_height()
         
-        if width <= 1 or height <= 1:
+        if width <= 1 or height <= 1 or (width, height) == self._bg_size:
             return
         
-        bg_img = self._create_sized_background(width, height)
+        start = time.perf_counter()
+        bg_img = render_login_background(self._bg_path, width, height)
         if bg_img:
             self._bg_photo = ctk.CTkImage(
                 light_image=bg_img,
@@ -101,15 +65,31 @@ class LoginView(ctk.CTkFrame):
                 size=(width, height)
             )
             self.bg_label.configure(image=self._bg_photo)
+            self._bg_size = (width, height)
+        
+        if "--timing" in sys.argv:
+            self.update_idletasks()
+            print(f"Login background {width}x{height}: {(time.perf_counter() - start) * 1000:.1f} ms "
+                  f"({self._resize_events} resize events)")
+        self._resize_events = 0
     
     def _on_resize(self, event):
-        """Handle window resize"""
+        """Handle window resize: render once the size has settled"""
         if event.widget == self:
-            self.after(10, self._update_background)
+            self._resize_events += 1
+            if self._resize_id is not None:
+                self.after_cancel(self._resize_id)
+            self._resize_id = self.after(RESIZE_SETTLE_MS, self._update_background)
     
     def _initial_background_update(self):
         """Initial background update after window is ready"""
         self._update_background()
+    
+    def destroy(self):
+        if self._resize_id is not None:
+            self.after_cancel(self._resize_id)
+            self._resize_id = None
+        super().destroy()
         
     def create_widgets(self):
         # ============================================================
@@ -4,15 +4,17 @@ Handles member registration, editing, and management with photo capture
 """
 
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 from datetime import date
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import database as db
+import events
+import importer
 from utils import (
-    calculate_end_date, format_date, format_currency, get_remaining_days,
-    is_membership_valid, validate_phone, validate_age, get_membership_fee,
+    calculate_end_date, format_date, format_currency,
+    validate_phone, validate_age, get_membership_fee,
     MEMBERSHIP_TYPES, PAYMENT_STATUS, GENDERS, FEE_MAP,
     load_member_photo_with_badge, save_member_photo, create_default_avatar,
     create_badge_overlay, get_member_photo_path
@@ -22,21 +24,38 @@ from ui_theme import (
     ACCENT_GOLD, ACCENT_GOLD_HOVER, TEXT_PRIMARY, TEXT_MUTED,
     SUCCESS, SUCCESS_DARK, ERROR, ERROR_DARK, WARNING, INFO, INFO_DARK,
     BORDER_COLOR, TABLE_ROW_ODD, TABLE_ROW_EVEN, PURPLE, PURPLE_DARK,
-    RADIUS_SM, RADIUS_MD
+    RADIUS_SM, RADIUS_MD, EXPIRY_COLORS
 )
+from views.virtual_list import VirtualList
+from views.search_controller import SearchController
+from thumbnail_cache import get_thumbnail, invalidate_thumbnails
 from PIL import Image
-import cv2
-import threading
+from bisect import bisect_right
+import tkinter as tk
+import time
+import webcam
+import member_status
 
 
 class MembersView(ctk.CTkFrame):
+    # Kept current through change events (see on_data_change)
+    LIVE_UPDATES = True
+    
+    # Default list avatars by size, shared by all instances
+    _mini_avatars = {}
+    
     def __init__(self, parent):
         super().__init__(parent, fg_color=BG_PRIMARY)
         self.selected_member_id = None
         self.captured_photo = None  # Store captured PIL image
         self._photo_image = None  # Store CTkImage reference to prevent GC
         self._photo_pil = None  # Store PIL image reference
+        self._search = SearchController(self, self._search_members, self._on_search_results)
+        self._statuses = None  # MemberSnapshot of the listed members
+        self._import = None  # iter_import generator while a CSV import is running
+        self._import_id = None
         self.create_widgets()
+        events.subscribe(self.on_data_change, "members")
         
     def create_widgets(self):
         # Main container with two panels
@@ -214,8 +233,7 @@ class MembersView(ctk.CTkFrame):
     
     def set_default_photo(self, pending_amount=0):
         """Set the default avatar with badge"""
-        default_img = create_default_avatar((150, 150))
-        default_img = create_badge_overlay(default_img, pending_amount)
+        default_img = create_default_avatar((150, 150), pending_amount)
         self._photo_pil = default_img
         self._photo_image = ctk.CTkImage(
             light_image=default_img,
@@ -237,8 +255,7 @@ class MembersView(ctk.CTkFrame):
                 # Load from file
                 img = load_member_photo_with_badge(photo_path, pending_amount, (150, 150))
         else:
-            img = create_default_avatar((150, 150))
-            img = create_badge_overlay(img, pending_amount)
+            img = create_default_avatar((150, 150), pending_amount)
         
         self._photo_pil = img
         self._photo_image = ctk.CTkImage(
@@ -300,6 +317,17 @@ class MembersView(ctk.CTkFrame):
             hover_color=INFO_DARK
         ).pack(side="left")
         
+        self.import_btn = ctk.CTkButton(
+            search_frame,
+            text="📥 Import CSV",
+            width=110,
+            height=35,
+            command=self.import_csv,
+            fg_color=PURPLE,
+            hover_color=PURPLE_DARK
+        )
+        self.import_btn.pack(side="left", padx=(5, 0))
+        
         # Column headers with Photo column
         headers_frame = ctk.CTkFrame(list_frame, fg_color=BG_TERTIARY, corner_radius=5)
         headers_frame.pack(fill="x", padx=20, pady=(10, 5))
@@ -316,142 +344,122 @@ class MembersView(ctk.CTkFrame):
                 width=width
             ).pack(side="left", padx=3, pady=8)
         
-        # Members list
-        self.members_list = ctk.CTkScrollableFrame(list_frame, fg_color=BG_TERTIARY, corner_radius=8)
+        # Members list - only the visible rows are built, and they are reused while scrolling
+        self.members_list = VirtualList(
+            list_frame,
+            create_row=self._create_member_row,
+            update_row=self._update_member_row,
+            row_height=54,
+            empty_text="No members found",
+            fg_color=BG_TERTIARY,
+            corner_radius=8
+        )
         self.members_list.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
-        # Store thumbnail image references to prevent garbage collection
-        self._thumbnail_images = []
+        # Fonts shared by every row
+        self._row_font = ctk.CTkFont(size=12)
+        self._row_font_small = ctk.CTkFont(size=11)
+        self._row_font_bold = ctk.CTkFont(size=12, weight="bold")
+        self._row_font_small_bold = ctk.CTkFont(size=11, weight="bold")
         
         self.load_members()
         
     def load_members(self, members=None):
         """Load members into the list with photo thumbnails and payment badges"""
-        # Clear existing
-        for widget in self.members_list.winfo_children():
-            widget.destroy()
-        
-        # Clear thumbnail references
-        self._thumbnail_images = []
-            
         if members is None:
-            members = db.get_all_members()
-        
-        if not members:
-            ctk.CTkLabel(
-                self.members_list,
-                text="No members found",
-                font=ctk.CTkFont(size=14),
-                text_color=TEXT_MUTED
-            ).pack(pady=50)
+            # Query in the background; _on_search_results fills the list.
+            # Going through the search controller keeps the current filter
+            # and means a full load can't overwrite a newer search.
+            self._search.search_now(self.search_var.get().strip())
             return
-            
-        for i, member in enumerate(members):
-            is_valid = is_membership_valid(member['end_date'])
-            remaining = get_remaining_days(member['end_date'])
-            
-            # Row frame - highlight expired members in red
-            row_bg = TABLE_ROW_ODD if i % 2 == 0 else TABLE_ROW_EVEN
-            if not is_valid:
-                row_bg = "#4a1a1a"  # Dark red for expired
-            
-            row = ctk.CTkFrame(self.members_list, fg_color=row_bg, corner_radius=5)
-            row.pack(fill="x", pady=2)
-            row.bind("<Button-1>", lambda e, m=member: self.select_member(m))
-            
-            # Make all children clickable
-            def make_clickable(widget, member):
-                widget.bind("<Button-1>", lambda e, m=member: self.select_member(m))
-            
-            # Photo thumbnail with badge
-            photo_path = member['photo_path'] if 'photo_path' in member.keys() else None
+        self.members_list.set_items(members)
+    
+    def _create_member_row(self, parent):
+        """Build one reusable member row (bound to a member by _update_member_row)"""
+        row = ctk.CTkFrame(parent, fg_color=TABLE_ROW_ODD, corner_radius=5)
+        row.member = None
+        row.thumb_image = None  # CTkImage reference to prevent garbage collection
+        
+        row.photo_label = ctk.CTkLabel(row, text="", width=50)
+        row.photo_label.pack(side="left", padx=3, pady=5)
+        
+        # (attribute, width, font)
+        columns = [
+            ("name_label", 130, self._row_font),
+            ("phone_label", 100, self._row_font),
+            ("type_label", 75, self._row_font),
+            ("end_label", 85, self._row_font_small),
+            ("days_label", 60, self._row_font_bold),
+            ("status_label", 70, self._row_font_small_bold),
+        ]
+        for attr, width, font in columns:
+            label = ctk.CTkLabel(row, text="", font=font, text_color=TEXT_MUTED, width=width, anchor="w")
+            label.pack(side="left", padx=3, pady=10)
+            setattr(row, attr, label)
+        
+        # Make the row and all children clickable
+        def select(event, row=row):
+            if row.member is not None:
+                self.select_member(row.member)
+        
+        row.bind("<Button-1>", select)
+        for child in (row.photo_label, row.name_label, row.phone_label, row.type_label,
+                      row.end_label, row.days_label, row.status_label):
+            child.bind("<Button-1>", select)
+        
+        return row
+    
+    def _update_member_row(self, row, member, index):
+        """Show a member in a pooled row"""
+        row.member = member
+        i = self._statuses.find(member['id']) if self._statuses is not None else None
+        if i is not None:
+            is_valid, remaining, bucket = self._statuses.status(i)
+            pending_amount = float(self._statuses.pending[i])
+            is_paid = bool(self._statuses.paid[i])
+        else:
+            # Added or changed since the list was loaded (see on_data_change)
+            is_valid, remaining, bucket = member_status.row_status(member['end_date'])
             pending_amount = member['pending_amount'] if 'pending_amount' in member.keys() else 0
-            
-            # Load thumbnail with payment badge overlay
-            thumb_img = self._create_list_thumbnail(photo_path, pending_amount or 0)
-            thumb_ctk = ctk.CTkImage(light_image=thumb_img, dark_image=thumb_img, size=(40, 40))
-            self._thumbnail_images.append(thumb_ctk)  # Prevent garbage collection
-            
-            photo_label = ctk.CTkLabel(row, image=thumb_ctk, text="", width=50)
-            photo_label.pack(side="left", padx=3, pady=5)
-            make_clickable(photo_label, member)
-            
-            # Name
-            name_label = ctk.CTkLabel(
-                row,
-                text=member['name'][:16] + "..." if len(member['name']) > 16 else member['name'],
-                font=ctk.CTkFont(size=12),
-                text_color=TEXT_PRIMARY if is_valid else ERROR,
-                width=130,
-                anchor="w"
-            )
-            name_label.pack(side="left", padx=3, pady=10)
-            make_clickable(name_label, member)
-            
-            # Phone
-            phone_label = ctk.CTkLabel(
-                row,
-                text=member['phone'],
-                font=ctk.CTkFont(size=12),
-                text_color=TEXT_MUTED,
-                width=100,
-                anchor="w"
-            )
-            phone_label.pack(side="left", padx=3, pady=10)
-            make_clickable(phone_label, member)
-            
-            # Type
-            type_label = ctk.CTkLabel(
-                row,
-                text=member['membership_type'][:7],
-                font=ctk.CTkFont(size=12),
-                text_color=TEXT_MUTED,
-                width=75,
-                anchor="w"
-            )
-            type_label.pack(side="left", padx=3, pady=10)
-            make_clickable(type_label, member)
-            
-            # End Date
-            end_label = ctk.CTkLabel(
-                row,
-                text=format_date(member['end_date']),
-                font=ctk.CTkFont(size=11),
-                text_color=TEXT_MUTED,
-                width=85,
-                anchor="w"
-            )
-            end_label.pack(side="left", padx=3, pady=10)
-            make_clickable(end_label, member)
-            
-            # Days Left
-            days_color = SUCCESS if remaining > 7 else WARNING if remaining > 0 else ERROR
-            days_label = ctk.CTkLabel(
-                row,
-                text=f"{remaining}d" if is_valid else "EXP",
-                font=ctk.CTkFont(size=12, weight="bold"),
-                text_color=days_color,
-                width=60,
-                anchor="w"
-            )
-            days_label.pack(side="left", padx=3, pady=10)
-            make_clickable(days_label, member)
-            
-            # Payment Status with icon
-            status_color = SUCCESS if member['payment_status'] == "Paid" else ERROR
-            status_text = "✓ Paid" if member['payment_status'] == "Paid" else "⚠ Due"
-            status_label = ctk.CTkLabel(
-                row,
-                text=status_text,
-                font=ctk.CTkFont(size=11, weight="bold"),
-                text_color=status_color,
-                width=70,
-                anchor="w"
-            )
-            status_label.pack(side="left", padx=3, pady=10)
-            make_clickable(status_label, member)
+            is_paid = member['payment_status'] == "Paid"
+        
+        # Highlight expired members in red
+        row_bg = TABLE_ROW_ODD if index % 2 == 0 else TABLE_ROW_EVEN
+        if not is_valid:
+            row_bg = "#4a1a1a"  # Dark red for expired
+        row.configure(fg_color=row_bg)
+        
+        # Photo thumbnail with payment badge
+        photo_path = member['photo_path'] if 'photo_path' in member.keys() else None
+        thumb_img = self._create_list_thumbnail(photo_path, pending_amount or 0)
+        row.thumb_image = ctk.CTkImage(light_image=thumb_img, dark_image=thumb_img, size=(40, 40))
+        row.photo_label.configure(image=row.thumb_image)
+        
+        name = member['name']
+        row.name_label.configure(
+            text=name[:16] + "..." if len(name) > 16 else name,
+            text_color=TEXT_PRIMARY if is_valid else ERROR
+        )
+        row.phone_label.configure(text=member['phone'])
+        row.type_label.configure(text=member['membership_type'][:7])
+        row.end_label.configure(text=format_date(member['end_date']))
+        
+        row.days_label.configure(
+            text=f"{remaining}d" if is_valid else "EXP",
+            text_color=EXPIRY_COLORS[bucket]
+        )
+        
+        # Payment Status with icon
+        row.status_label.configure(
+            text="✓ Paid" if is_paid else "⚠ Due",
+            text_color=SUCCESS if is_paid else ERROR
+        )
     
     def _create_list_thumbnail(self, photo_path, pending_amount):
+        """Get the members list thumbnail (cached, see thumbnail_cache)"""
+        return get_thumbnail(photo_path, pending_amount, "list_40", self._build_list_thumbnail)
+    
+    def _build_list_thumbnail(self, photo_path, pending_amount):
         """Create a small thumbnail with mini payment badge for the members list"""
         from utils import create_mini_badge_overlay
         
@@ -475,7 +483,14 @@ class MembersView(ctk.CTkFrame):
         return img
     
     def _create_mini_avatar(self, size=(40, 40)):
-        """Create a small default avatar"""
+        """Create a small default avatar (drawn once per size, then copied)"""
+        avatar = MembersView._mini_avatars.get(size)
+        if avatar is None:
+            avatar = MembersView._mini_avatars[size] = self._draw_mini_avatar(size)
+        return avatar.copy()
+    
+    def _draw_mini_avatar(self, size):
+        """Draw the small default avatar"""
         from PIL import ImageDraw
         img = Image.new("RGB", size, (60, 60, 60))
         draw = ImageDraw.Draw(img)
@@ -631,7 +646,6 @@ class MembersView(ctk.CTkFrame):
         db.update_member_status()
         
         self.clear_form()
-        self.load_members()
     
     def delete_member(self):
         """Delete selected member"""
@@ -640,10 +654,12 @@ class MembersView(ctk.CTkFrame):
             return
         
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this member?"):
+            photo_path = db.get_member_photo(self.selected_member_id)
             db.delete_member(self.selected_member_id)
+            if photo_path:
+                invalidate_thumbnails(photo_path)
             messagebox.showinfo("Success", "Member deleted successfully!")
             self.clear_form()
-            self.load_members()
     
     def clear_form(self):
         """Clear the form"""
@@ -679,17 +695,123 @@ class MembersView(ctk.CTkFrame):
             pass
     
     def on_search(self, *args):
-        """Handle search"""
-        query = self.search_var.get().strip()
-        if query:
-            members = db.search_members(query)
-        else:
-            members = db.get_all_members()
+        """Handle search (debounced, runs in the background)"""
+        self._search.schedule(self.search_var.get().strip())
+    
+    def _search_members(self, query):
+        """Search query - runs on a database worker thread"""
+        members = db.search_members(query) if query else db.get_all_members()
+        # Status of every listed member in one vectorized pass, off the Tk thread
+        return members, member_status.MemberSnapshot(members)
+    
+    def _on_search_results(self, query, result):
+        """Show search results"""
+        members, self._statuses = result
+        self._statuses.refresh_day()
         self.load_members(members)
     
+    def import_csv(self):
+        """Import members or payments from a CSV register, one chunk per Tk callback"""
+        path = filedialog.askopenfilename(
+            title="Import members or payments",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            kind = importer.detect_kind(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Error", str(e))
+            return
+        
+        self._import = importer.iter_import(path, kind)
+        self._import_result = None
+        self.import_btn.configure(state="disabled", text="Importing 0%")
+        self._import_id = self.after(1, self._import_step)
+    
+    def _import_step(self):
+        """Import one chunk, then give the main loop a turn before the next"""
+        self._import_id = None
+        try:
+            self._import_result = next(self._import)
+        except StopIteration:
+            self._finish_import()
+            return
+        except Exception as e:
+            self._finish_import(e)
+            return
+        self.import_btn.configure(text=f"Importing {self._import_result['fraction']:.0%}")
+        self._import_id = self.after(1, self._import_step)
+    
+    def _finish_import(self, error=None):
+        result = self._import_result
+        self._import = None
+        self.import_btn.configure(state="normal", text="📥 Import CSV")
+        self.refresh()
+        
+        if error is not None:
+            imported = f"\n\n{result['imported']} rows were imported before the error." if result else ""
+            messagebox.showerror("Import Error", f"Import stopped: {error}{imported}")
+            return
+        
+        message = f"Imported {result['imported']} {result['kind']} from {result['rows']} rows."
+        if result["kind"] == "members" and result["payments"]:
+            message += f"\n{result['payments']} payment records added."
+        if result["rejected"]:
+            message += (f"\n\n{result['rejected']} rows were rejected. "
+                        f"See {result['report_path']}")
+        messagebox.showinfo("Import Complete", message)
+    
     def refresh(self):
-        """Refresh the view"""
+        """Refresh the view (keeps the current search filter)"""
         self.load_members()
+    
+    def on_data_change(self, event):
+        """Apply a members change event to the list without reloading it"""
+        if self._import is not None:
+            return  # Reloaded once when the import finishes
+        if event.row_id is None or self.search_var.get().strip() or self._search.is_pending():
+            # Bulk change, a filtered list whose membership may change, or a
+            # list that is about to be replaced by a query that may predate
+            # this change
+            self.refresh()
+            return
+        
+        if self._statuses is not None:
+            self._statuses.discard(event.row_id)
+        items = list(self.members_list.get_items())
+        index = next((i for i, m in enumerate(items) if m['id'] == event.row_id), None)
+        member = None if event.operation == events.DELETE else db.get_member_by_id(event.row_id)
+        
+        if index is not None and member is not None and items[index]['name'] == member['name']:
+            # Same position - redraw just this row
+            self.members_list.update_item(index, member)
+            return
+        
+        if index is not None:
+            del items[index]
+        if member is not None:
+            # Keep the list sorted by name like get_all_members
+            items.insert(bisect_right([m['name'] for m in items], member['name']), member)
+        self.members_list.set_items(items, keep_position=True)
+    
+    def is_busy(self):
+        """True while a CSV import runs; the app doesn't evict busy views"""
+        return self._import is not None
+    
+    def destroy(self):
+        events.unsubscribe(self.on_data_change)
+        self._search.cancel()
+        if self._import is not None:
+            if self._import_id is not None:
+                self.after_cancel(self._import_id)
+            self._import.close()   # Chunks already imported stay committed
+        super().destroy()
+
+
+# How often the capture dialog checks for a new camera frame (ms); cheap
+# when there is none, so poll faster than the camera's ~30 fps
+PREVIEW_POLL_MS = 15
 
 
 class WebcamCaptureDialog(ctk.CTkToplevel):
@@ -700,8 +822,11 @@ class WebcamCaptureDialog(ctk.CTkToplevel):
         self.callback = callback
         self.captured_image = None
         self.is_running = True
-        self._preview_image = None  # Store CTkImage reference
-        self._preview_pil = None  # Store PIL image reference
+        self._preview_photo = None  # One PhotoImage, repainted in place every frame
+        self._video_label = None
+        self._shown_seq = 0  # Number of the frame on screen (FrameGrabber seq)
+        self._frames_shown = 0
+        self._ui_seconds = 0.0  # Tk thread time spent showing frames
         
         # Window configuration
         self.title("📷 Capture Photo")
@@ -794,74 +919,67 @@ class WebcamCaptureDialog(ctk.CTkToplevel):
         self.protocol("WM_DELETE_WINDOW", self.cancel)
         
         # Start webcam feed
-        self.cap = None
+        self.grabber = None
         self.start_webcam()
     
     def start_webcam(self):
-        """Start the webcam feed"""
-        try:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                self.show_error("Could not open webcam. Please check if camera is connected.")
-                return
-            
-            # Set resolution
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            
-            # Start update loop
-            self.update_preview()
-            
-        except Exception as e:
-            self.show_error(f"Webcam error: {str(e)}")
+        """Start the capture thread; the preview polls it from the Tk loop"""
+        self.grabber = webcam.FrameGrabber()
+        self.grabber.start()
+        self.after(PREVIEW_POLL_MS, self.update_preview)
     
     def update_preview(self):
-        """Update the preview with webcam feed"""
-        if not self.is_running or self.cap is None:
+        """
+        Show the newest frame, if there is one.
+
+        The capture thread has already converted and resized it, so the Tk
+        thread only copies it into the existing PhotoImage.
+        """
+        if not self.is_running or self.grabber is None:
+            return
+        if self.grabber.error:
+            self.show_error(self.grabber.error)
             return
         
-        try:
-            ret, frame = self.cap.read()
-            if ret:
-                # Convert BGR to RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Convert to PIL Image
-                pil_image = Image.fromarray(frame_rgb)
-                
-                # Resize for preview (maintain aspect ratio)
-                pil_image = pil_image.resize((400, 300), Image.Resampling.LANCZOS)
-                
-                # Store the full-resolution frame for capture
-                self.current_frame = Image.fromarray(frame_rgb)
-                
-                # Create CTkImage and update preview
-                self._preview_pil = pil_image
-                self._preview_image = ctk.CTkImage(
-                    light_image=pil_image,
-                    dark_image=pil_image,
-                    size=(400, 300)
-                )
-                self.preview_label.configure(image=self._preview_image, text="")
-            
-            # Schedule next update
-            if self.is_running:
-                self.after(30, self.update_preview)  # ~30 FPS
-                
-        except Exception as e:
-            if self.is_running:
-                self.after(100, self.update_preview)
+        latest = self.grabber.latest_preview(self._shown_seq)
+        if latest is not None:
+            start = time.perf_counter()
+            self._shown_seq, frame = latest
+            image = Image.fromarray(frame)
+            if self._preview_photo is None:
+                from PIL import ImageTk
+                self._preview_photo = ImageTk.PhotoImage(image)
+                self._video_label = tk.Label(self.preview_frame, image=self._preview_photo,
+                                             bd=0, bg=BG_TERTIARY)
+                self.preview_label.pack_forget()
+                self._video_label.pack(padx=10, pady=10)
+            else:
+                self._preview_photo.paste(image)
+            self._ui_seconds += time.perf_counter() - start
+            self._frames_shown += 1
+        
+        self.after(PREVIEW_POLL_MS, self.update_preview)
+    
+    def stop_webcam(self):
+        """Stop the capture thread (and print frame statistics with --timing)"""
+        self.is_running = False
+        if self.grabber is None:
+            return
+        self.grabber.stop()
+        if "--timing" in sys.argv and self._frames_shown:
+            print(f"Webcam: {self.grabber.fps():.1f} fps captured, {self._frames_shown} frames shown, "
+                  f"{self._ui_seconds / self._frames_shown * 1000:.2f} ms Tk time per frame")
+        self.grabber = None
     
     def capture_photo(self):
         """Capture the current frame"""
-        if hasattr(self, 'current_frame') and self.current_frame:
-            self.captured_image = self.current_frame.copy()
+        frame = self.grabber.capture() if self.grabber is not None else None
+        if frame is not None:
+            self.captured_image = frame
             self.status_label.configure(text="✅ Photo captured! Closing...", text_color=SUCCESS)
             
             # Stop webcam and close
-            self.is_running = False
-            if self.cap:
-                self.cap.release()
+            self.stop_webcam()
             
             # Call callback with captured image
             if self.callback:
@@ -874,12 +992,15 @@ class WebcamCaptureDialog(ctk.CTkToplevel):
     
     def cancel(self):
         """Cancel and close the dialog"""
-        self.is_running = False
-        if self.cap:
-            self.cap.release()
+        self.stop_webcam()
         self.destroy()
     
     def show_error(self, message):
         """Show error message"""
+        if self._video_label is not None:
+            # The camera was lost mid-stream: swap the frozen frame for the message
+            self._video_label.destroy()
+            self._video_label = None
+            self.preview_label.pack(padx=10, pady=10)
         self.preview_label.configure(text=f"❌ {message}", text_color=ERROR)
         self.status_label.configure(text="Camera unavailable", text_color=ERROR)
\ No newline at end of file
@@ -12,6 +12,8 @@ from PIL import Image, ImageDraw
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import database as db
+import db_executor
+import events
 from utils import (
     format_date, format_currency, get_remaining_days, is_membership_valid,
     validate_phone, FEE_MAP, calculate_pending_fee, get_membership_status,
@@ -97,12 +99,20 @@ def create_status_pil_image(status="paid", size=48):
     return img
 
 
+# Rows loaded per page of the payment history ("Load more" fetches the next page)
+PAYMENT_HISTORY_ROWS = db.HISTORY_PAGE_SIZE
+
+
 class PaymentView(ctk.CTkFrame):
     """Payment Screen with Phone Verification"""
     
+    # Kept current through change events (see on_data_change)
+    LIVE_UPDATES = True
+    
     def __init__(self, parent):
         super().__init__(parent, fg_color="transparent")
         self.verified_member = None
+        self._payment_rows = []  # Row frames, newest first
         
         # === CRITICAL: Store PIL images to prevent garbage collection ===
         # PIL images MUST be stored as instance variables
@@ -126,6 +136,7 @@ class PaymentView(ctk.CTkFrame):
         }
         
         self.create_widgets()
+        events.subscribe(self.on_data_change, "payments")
         
     def create_widgets(self):
         # Main container with two panels
@@ -781,7 +792,7 @@ Proceed with payment?"""
         # Process payment
         try:
             # Add payment record
-            db.add_payment(
+            payment_id = db.add_payment(
                 member['id'],
                 member['phone'],
                 amount,
@@ -821,7 +832,7 @@ Member: {member['name']}
 Amount: {format_currency(amount)}
 {"New End Date: " + format_date(new_end_date) if new_end_date else ""}
 
-Receipt ID: #{db.get_member_payments(member['id'])[0]['id']}"""
+Receipt ID: #{payment_id}"""
             
             messagebox.showinfo("Payment Success", success_msg)
             
@@ -830,7 +841,6 @@ Receipt ID: #{db.get_member_payments(member['id'])[0]['id']}"""
             self.verified_member = None
             self.show_empty_state()
             self.payment_section.pack_forget()
-            self.load_payment_history()
             
         except Exception as e:
             messagebox.showerror("Payment Error", f"Failed to process payment: {str(e)}")
@@ -901,87 +911,175 @@ Receipt ID: #{db.get_member_payments(member['id'])[0]['id']}"""
         self.payment_list = ctk.CTkScrollableFrame(history_frame, fg_color="#2d2d2d", corner_radius=8)
         self.payment_list.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
+        self.no_payments_label = ctk.CTkLabel(
+            self.payment_list,
+            text="No payment records yet",
+            font=ctk.CTkFont(size=14),
+            text_color="#888888"
+        )
+        
+        # Shown below the last row while older payments may exist
+        self.load_more_btn = ctk.CTkButton(
+            self.payment_list,
+            text="⬇ Load more",
+            height=30,
+            command=self.load_more_payments,
+            fg_color="#3d3d3d",
+            hover_color="#4d4d4d"
+        )
+        
         self.load_payment_history()
         
     def load_payment_history(self):
-        """Load payment history"""
-        for widget in self.payment_list.winfo_children():
-            widget.destroy()
+        """Load payment history (queried in the background)"""
+        db_executor.submit(
+            self, self._fetch_payment_history,
+            callback=self._show_payment_history, tag="history"
+        )
+    
+    def _fetch_payment_history(self):
+        """First page of payments and collection totals - runs on a database worker thread"""
+        payments = db.get_payments_page(limit=PAYMENT_HISTORY_ROWS)
+        return payments, db.get_today_collections(), db.get_monthly_collections()
+    
+    def _show_payment_history(self, result):
+        """Rebuild the payment list from _fetch_payment_history's result"""
+        payments, today_total, month_total = result
+        for row in self._payment_rows:
+            row.destroy()
+        self._payment_rows = []
+        
+        self._show_collection_totals(today_total, month_total)
         
-        # Update stats
-        today_total = db.get_today_collections()
-        month_total = db.get_monthly_collections()
+        if not payments:
+            self.load_more_btn.pack_forget()
+            self.no_payments_label.pack(pady=50)
+            return
+        self.no_payments_label.pack_forget()
+        self._append_payment_rows(payments)
+    
+    def load_more_payments(self):
+        """Append the next page of older payments (queried in the background)"""
+        if not self._payment_rows or db_executor.is_pending(self, "history"):
+            return
+        self.load_more_btn.configure(state="disabled")
+        after = self._payment_rows[-1].cursor
+        db_executor.submit(
+            self, db.get_payments_page, after, PAYMENT_HISTORY_ROWS,
+            callback=lambda payments: self._on_more_payments(after, payments), tag="more"
+        )
+    
+    def _on_more_payments(self, after, payments):
+        """Append a "Load more" page unless the list was reloaded in the meantime"""
+        if self._payment_rows and self._payment_rows[-1].cursor == after:
+            self._append_payment_rows(payments)
+    
+    def _append_payment_rows(self, payments):
+        """Add a page of payments below the current rows"""
+        self.load_more_btn.pack_forget()
+        shade = 1 - self._payment_rows[-1].shade if self._payment_rows else 0
+        for i, payment in enumerate(payments):
+            row = self._create_payment_row(payment, shade + i)
+            row.pack(fill="x", pady=2)
+            self._payment_rows.append(row)
         
+        # A short page means the oldest payment is already shown
+        if len(payments) == PAYMENT_HISTORY_ROWS:
+            self.load_more_btn.configure(state="normal")
+            self.load_more_btn.pack(pady=10)
+    
+    def update_collection_stats(self):
+        """Update today's / this month's collection totals"""
+        self._show_collection_totals(db.get_today_collections(), db.get_monthly_collections())
+    
+    def _show_collection_totals(self, today_total, month_total):
         self.today_collection_label.configure(text=f"Today's Collection: {format_currency(today_total)}")
         self.month_collection_label.configure(text=f"This Month: {format_currency(month_total)}")
+    
+    def _create_payment_row(self, payment, i):
+        """Build one payment history row (not packed)"""
+        row_bg = "#3d3d3d" if i % 2 == 0 else "#2d2d2d"
+        row = ctk.CTkFrame(self.payment_list, fg_color=row_bg, corner_radius=5)
+        row.shade = i % 2
+        row.cursor = db.payment_cursor(payment)
+        
+        # Date
+        ctk.CTkLabel(
+            row,
+            text=format_date(payment['payment_date']),
+            font=ctk.CTkFont(size=11),
+            text_color="#aaaaaa",
+            width=90,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
         
-        # Load payments
-        payments = db.get_all_payments()
+        # Member Name
+        ctk.CTkLabel(
+            row,
+            text=payment['member_name'][:18] + "..." if len(payment['member_name']) > 18 else payment['member_name'],
+            font=ctk.CTkFont(size=11),
+            text_color="#ffffff",
+            width=150,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
         
-        if not payments:
-            ctk.CTkLabel(
-                self.payment_list,
-                text="No payment records yet",
-                font=ctk.CTkFont(size=14),
-                text_color="#888888"
-            ).pack(pady=50)
+        # Phone
+        ctk.CTkLabel(
+            row,
+            text=payment['phone'],
+            font=ctk.CTkFont(size=11),
+            text_color="#aaaaaa",
+            width=100,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        # Type
+        type_color = "#3498db" if payment['payment_type'] == "PT" else "#2ecc71"
+        ctk.CTkLabel(
+            row,
+            text=payment['payment_type'],
+            font=ctk.CTkFont(size=11),
+            text_color=type_color,
+            width=90,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        # Amount
+        ctk.CTkLabel(
+            row,
+            text=format_currency(payment['amount']),
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color="#2ecc71",
+            width=100,
+            anchor="w"
+        ).pack(side="left", padx=5, pady=10)
+        
+        return row
+    
+    def on_data_change(self, event):
+        """Apply a payments change event: a new payment adds one row at the top"""
+        if (event.operation != events.INSERT or event.row_id is None
+                or db_executor.is_pending(self, "history")):
+            # A reload started before this change could miss it - start a new one
+            self.load_payment_history()
+            return
+        
+        payment = db.get_payment(event.row_id)
+        if payment is None:
             return
         
-        for i, payment in enumerate(payments[:50]):  # Show last 50
-            row_bg = "#3d3d3d" if i % 2 == 0 else "#2d2d2d"
-            row = ctk.CTkFrame(self.payment_list, fg_color=row_bg, corner_radius=5)
+        # Alternate colors by age, so the new row takes the opposite shade of the current top row
+        shade = 1 - self._payment_rows[0].shade if self._payment_rows else 0
+        row = self._create_payment_row(payment, shade)
+        if self._payment_rows:
+            row.pack(fill="x", pady=2, before=self._payment_rows[0])
+        else:
+            self.no_payments_label.pack_forget()
             row.pack(fill="x", pady=2)
-            
-            # Date
-            ctk.CTkLabel(
-                row,
-                text=format_date(payment['payment_date']),
-                font=ctk.CTkFont(size=11),
-                text_color="#aaaaaa",
-                width=90,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Member Name
-            ctk.CTkLabel(
-                row,
-                text=payment['member_name'][:18] + "..." if len(payment['member_name']) > 18 else payment['member_name'],
-                font=ctk.CTkFont(size=11),
-                text_color="#ffffff",
-                width=150,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Phone
-            ctk.CTkLabel(
-                row,
-                text=payment['phone'],
-                font=ctk.CTkFont(size=11),
-                text_color="#aaaaaa",
-                width=100,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Type
-            type_color = "#3498db" if payment['payment_type'] == "PT" else "#2ecc71"
-            ctk.CTkLabel(
-                row,
-                text=payment['payment_type'],
-                font=ctk.CTkFont(size=11),
-                text_color=type_color,
-                width=90,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
-            
-            # Amount
-            ctk.CTkLabel(
-                row,
-                text=format_currency(payment['amount']),
-                font=ctk.CTkFont(size=11, weight="bold"),
-                text_color="#2ecc71",
-                width=100,
-                anchor="w"
-            ).pack(side="left", padx=5, pady=10)
+        self._payment_rows.insert(0, row)
+        
+        # The "Load more" cursor is the bottom row, so nothing is trimmed here
+        self.update_collection_stats()
     
     def refresh(self):
         """Refresh the view"""
@@ -992,3 +1090,7 @@ Receipt ID: #{db.get_member_payments(member['id'])[0]['id']}"""
             if member:
                 self.verified_member = member
                 self.display_member_details(member)
+    
+    def destroy(self):
+        events.unsubscribe(self.on_data_change)
+        super().destroy()
@@ -0,0 +1,105 @@
+"""
+Search Controller for Horsepower Gym Management System
+Debounces search-as-you-type and runs the query off the Tk thread
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_executor
+
+
+# Wait this long after the last keystroke before searching
+DEBOUNCE_MS = 200
+
+
+class SearchController:
+    """
+    Debounced, cancellable background search bound to a Tk widget.
+
+    Every keystroke calls schedule(); the search runs DEBOUNCE_MS after the
+    last one, on the shared database executor. Each search gets a generation
+    number, and results from anything but the newest generation are
+    dropped, so a slow stale query can never overwrite newer results.
+
+    Args:
+        widget: Tk widget that owns the controller (used for after())
+        search_fn: callback(query) -> result; runs on a database worker
+                   thread and must not touch Tk widgets
+        on_results: callback(query, result); runs on the Tk thread
+        delay_ms: Debounce delay
+    """
+
+    def __init__(self, widget, search_fn, on_results, delay_ms=DEBOUNCE_MS):
+        self.widget = widget
+        self.search_fn = search_fn
+        self.on_results = on_results
+        self.delay_ms = delay_ms
+
+        self._generation = 0
+        self._debounce_id = None
+        self._running = None      # Generation of the submitted, undelivered search
+
+    def schedule(self, query):
+        """Search for query once typing pauses"""
+        self._cancel_debounce()
+        # Invalidate the running search right away, its result is already stale
+        self._generation += 1
+        self._debounce_id = self.widget.after(self.delay_ms, self._start, query)
+
+    def search_now(self, query):
+        """Search immediately (e.g. refresh button), skipping the debounce"""
+        self._cancel_debounce()
+        self._generation += 1
+        self._start(query)
+
+    def cancel(self):
+        """Drop the pending and running searches (call when the widget is destroyed)"""
+        self._cancel_debounce()
+        self._generation += 1
+
+    def is_current(self, generation):
+        """True if no newer search was requested (safe from any thread)"""
+        return generation == self._generation
+
+    def is_pending(self):
+        """True while the newest search is waiting for its debounce or still running"""
+        return self._debounce_id is not None or self._running == self._generation
+
+    def _run(self, generation, query):
+        """Runs on a database worker thread"""
+        # Skip searches that were superseded while waiting in the queue
+        if not self.is_current(generation):
+            return None
+        return self.search_fn(query)
+
+    # ---------- Tk thread ----------
+
+    def _cancel_debounce(self):
+        if self._debounce_id is not None:
+            try:
+                self.widget.after_cancel(self._debounce_id)
+            except Exception:
+                pass
+            self._debounce_id = None
+
+    def _start(self, query):
+        self._debounce_id = None
+        generation = self._generation
+        self._running = generation
+        db_executor.submit(
+            self.widget, self._run, generation, query,
+            callback=lambda result: self._deliver(generation, query, result),
+            on_error=lambda error: self._fail(generation, query, error)
+        )
+
+    def _deliver(self, generation, query, result):
+        if not self.is_current(generation):
+            return
+        self._running = None
+        self.on_results(query, result)
+
+    def _fail(self, generation, query, error):
+        if self._running == generation:
+            self._running = None
+        print(f"Error searching for '{query}': {error}")
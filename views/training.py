@@ -10,24 +10,33 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import database as db
+import db_executor
+import events
+import member_status
 from utils import (
-    calculate_training_end_date, format_date, format_currency, 
-    get_remaining_days, is_membership_valid, TRAINERS
+    calculate_training_end_date, format_date, format_currency, TRAINERS
 )
 from ui_theme import (
     BG_PRIMARY, BG_SECONDARY, BG_TERTIARY, BG_HOVER,
     ACCENT_GOLD, ACCENT_GOLD_HOVER, TEXT_PRIMARY, TEXT_MUTED,
-    SUCCESS, SUCCESS_DARK, ERROR, ERROR_DARK, WARNING, INFO, INFO_DARK,
-    BORDER_COLOR, TABLE_ROW_ODD, TABLE_ROW_EVEN
+    SUCCESS, SUCCESS_DARK, ERROR, ERROR_DARK, INFO, INFO_DARK,
+    BORDER_COLOR, TABLE_ROW_ODD, TABLE_ROW_EVEN, EXPIRY_COLORS
 )
+from views.search_controller import SearchController
 
 
 class TrainingView(ctk.CTkFrame):
+    # Kept current through change events (see on_data_change)
+    LIVE_UPDATES = True
+    
     def __init__(self, parent):
         super().__init__(parent, fg_color=BG_PRIMARY)
         self.selected_training_id = None
         self.selected_member_id = None
+        self._search = SearchController(self, self._search_members, self._on_search_results)
+        self._reload_id = None
         self.create_widgets()
+        events.subscribe(self.on_data_change, "personal_training", "members")
         
     def create_widgets(self):
         # Main container
@@ -243,11 +252,19 @@ class TrainingView(ctk.CTkFrame):
         self.load_training()
         
     def load_training(self):
-        """Load training records"""
+        """Load training records (queried in the background)"""
+        db_executor.submit(self, self._query_training, callback=self._show_training, tag="training")
+    
+    def _query_training(self):
+        """Training records and their expiry status - runs on a database worker thread"""
+        records = db.get_all_training()
+        return records, member_status.MemberSnapshot(records)
+    
+    def _show_training(self, result):
+        """Rebuild the training list"""
+        training_records, statuses = result
         for widget in self.training_list.winfo_children():
             widget.destroy()
-            
-        training_records = db.get_all_training()
         
         if not training_records:
             ctk.CTkLabel(
@@ -259,8 +276,7 @@ class TrainingView(ctk.CTkFrame):
             return
             
         for i, record in enumerate(training_records):
-            is_valid = is_membership_valid(record['end_date'])
-            remaining = get_remaining_days(record['end_date'])
+            is_valid, remaining, bucket = statuses.status(i)
             
             row_bg = TABLE_ROW_ODD if i % 2 == 0 else TABLE_ROW_EVEN
             if not is_valid and record['status'] == 'Active':
@@ -323,7 +339,7 @@ class TrainingView(ctk.CTkFrame):
             
             # Days Left
             if record['status'] == 'Active':
-                days_color = SUCCESS if remaining > 7 else WARNING if remaining > 0 else ERROR
+                days_color = EXPIRY_COLORS[bucket]
                 days_text = f"{remaining} days" if is_valid else "EXPIRED"
             else:
                 days_color = TEXT_MUTED
@@ -354,17 +370,25 @@ class TrainingView(ctk.CTkFrame):
             make_clickable(status_label, record)
     
     def on_member_search(self, *args):
-        """Search members"""
-        for widget in self.member_results.winfo_children():
-            widget.destroy()
-            
+        """Search members (debounced, runs in the background)"""
         query = self.member_search_var.get().strip()
         if not query:
+            self._search.cancel()
+            for widget in self.member_results.winfo_children():
+                widget.destroy()
             return
-            
-        members = db.search_members(query)
+        self._search.schedule(query)
+    
+    def _search_members(self, query):
+        """Search query - runs on the search worker thread"""
+        return db.search_members(query, limit=5)  # Show max 5 results
+    
+    def _on_search_results(self, query, members):
+        """Show search results"""
+        for widget in self.member_results.winfo_children():
+            widget.destroy()
         
-        for member in members[:5]:  # Show max 5 results
+        for member in members:
             btn = ctk.CTkButton(
                 self.member_results,
                 text=f"{member['name']} - {member['phone']}",
@@ -441,7 +465,6 @@ class TrainingView(ctk.CTkFrame):
             messagebox.showinfo("Success", "Training assigned successfully!")
         
         self.clear_form()
-        self.load_training()
     
     def delete_training(self):
         """Delete selected training record"""
@@ -453,7 +476,6 @@ class TrainingView(ctk.CTkFrame):
             db.delete_personal_training(self.selected_training_id)
             messagebox.showinfo("Success", "Training record deleted!")
             self.clear_form()
-            self.load_training()
     
     def clear_form(self):
         """Clear form"""
@@ -484,3 +506,21 @@ class TrainingView(ctk.CTkFrame):
     
     def refresh(self):
         self.load_training()
+    
+    def on_data_change(self, event):
+        """Reload the training list once after a burst of changes"""
+        if event.table == "members" and event.operation == events.INSERT:
+            return  # New members have no training yet
+        if self._reload_id is None:
+            self._reload_id = self.after_idle(self._reload_training)
+    
+    def _reload_training(self):
+        self._reload_id = None
+        self.load_training()
+    
+    def destroy(self):
+        events.unsubscribe(self.on_data_change)
+        if self._reload_id is not None:
+            self.after_cancel(self._reload_id)
+        self._search.cancel()
+        super().destroy()
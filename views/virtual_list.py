@@ -0,0 +1,205 @@
+"""
+Virtualized List Widget for Horsepower Gym Management System
+Only builds the rows that are visible and reuses them while scrolling
+"""
+
+import customtkinter as ctk
+import tkinter as tk
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ui_theme import BG_TERTIARY, TEXT_MUTED
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollable list of fixed-height rows backed by a small pool of row widgets.
+
+    Instead of one set of widgets per item, only enough rows to fill the
+    viewport (plus buffer_rows) are created. Rows are positioned with place()
+    and re-bound to new items as they scroll into view, so the widget count
+    stays constant no matter how many items are loaded.
+
+    Args:
+        parent: Parent widget
+        create_row: callback(parent) -> new row widget (called once per pool slot)
+        update_row: callback(row, item, index) to show an item in a row
+        row_height: Height of one row including spacing
+        buffer_rows: Extra rows kept above/below the viewport
+        empty_text: Message shown when there are no items
+    """
+
+    def __init__(self, parent, create_row, update_row, row_height=50, buffer_rows=2,
+                 empty_text="No items found", **kwargs):
+        kwargs.setdefault("fg_color", BG_TERTIARY)
+        kwargs.setdefault("corner_radius", 8)
+        super().__init__(parent, **kwargs)
+
+        self._create_row = create_row
+        self._update_row = update_row
+        self._row_height = row_height
+        self._buffer_rows = buffer_rows
+
+        self._items = []
+        self._rows = []           # Pool of row widgets
+        self._row_index = []      # Item index currently shown by each pool slot
+        self._offset = 0          # Scroll position in pixels
+        self._wheel_px = 0.0      # Wheel scrolling not yet applied (under a pixel)
+        self._viewport_height = 0
+
+        self._body = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self._body.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y", padx=(0, 3), pady=5)
+
+        self._empty_label = ctk.CTkLabel(
+            self._body,
+            text=empty_text,
+            font=ctk.CTkFont(size=14),
+            text_color=TEXT_MUTED
+        )
+
+        self._body.bind("<Configure>", self._on_configure)
+        self._bind_wheel(self._body)
+
+    # ---------- public API ----------
+
+    def set_items(self, items, keep_position=False):
+        """Replace the list contents"""
+        self._items = list(items)
+        # Every slot must be re-bound; the items behind the indexes changed
+        self._row_index = [None] * len(self._rows)
+        if not keep_position:
+            self._offset = 0
+        self._render()
+
+    def get_items(self):
+        """Items currently in the list"""
+        return self._items
+
+    def update_item(self, index, item):
+        """Replace one item and redraw it if visible"""
+        self._items[index] = item
+        self.refresh_row(index)
+
+    def refresh_row(self, index):
+        """Redraw one item if it is currently visible"""
+        for slot, shown in enumerate(self._row_index):
+            if shown == index:
+                self._update_row(self._rows[slot], self._items[index], index)
+                return
+
+    def scroll_to(self, index):
+        """Scroll so the item at index is visible"""
+        row_px = self._row_px()
+        top = index * row_px
+        if top < self._offset:
+            self._offset = top
+        elif top + row_px > self._offset + self._viewport_height:
+            self._offset = top + row_px - self._viewport_height
+        self._render()
+
+    # ---------- layout ----------
+
+    def _row_px(self):
+        """Row height in screen pixels (CTk widget sizes are scaled on HiDPI)"""
+        return max(1, round(self._apply_widget_scaling(self._row_height)))
+
+    def _on_configure(self, event):
+        if event.height != self._viewport_height:
+            self._viewport_height = event.height
+            self._render()
+
+    def _max_offset(self):
+        return max(0, len(self._items) * self._row_px() - self._viewport_height)
+
+    def _ensure_pool(self, count):
+        """Grow the row pool to count rows (rows are never destroyed)"""
+        while len(self._rows) < count:
+            row = self._create_row(self._body)
+            self._bind_wheel(row)
+            self._rows.append(row)
+            self._row_index.append(None)
+
+    def _render(self):
+        """Position pool rows for the current scroll offset"""
+        if not self._items:
+            for row in self._rows:
+                row.place_forget()
+            self._empty_label.place(relx=0.5, y=50, anchor="n")
+            self._scrollbar.set(0, 1)
+            return
+        self._empty_label.place_forget()
+
+        row_px = self._row_px()
+        height = self._viewport_height or self._body.winfo_height()
+        self._offset = min(max(0, self._offset), self._max_offset())
+
+        first = max(0, self._offset // row_px - self._buffer_rows)
+        visible = height // row_px + 2 + self._buffer_rows * 2
+        last = min(len(self._items), first + visible)
+        self._ensure_pool(min(visible, len(self._items)))
+
+        pool = len(self._rows)
+        used = set()
+        for index in range(first, last):
+            # A fixed slot per index means only rows scrolling into view are re-bound
+            slot = index % pool
+            used.add(slot)
+            row = self._rows[slot]
+            if self._row_index[slot] != index:
+                self._update_row(row, self._items[index], index)
+                self._row_index[slot] = index
+            row.place(x=0, y=index * row_px - self._offset, relwidth=1.0, height=row_px - 4)
+
+        for slot in range(pool):
+            if slot not in used:
+                self._rows[slot].place_forget()
+
+        total = len(self._items) * row_px
+        if total <= height:
+            self._scrollbar.set(0, 1)
+        else:
+            self._scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    # ---------- scrolling ----------
+
+    def _scroll_by(self, pixels):
+        new_offset = min(max(0, self._offset + pixels), self._max_offset())
+        if new_offset != self._offset:
+            self._offset = new_offset
+            self._render()
+
+    def _on_scrollbar(self, action, value, units=None):
+        if action == "moveto":
+            total = len(self._items) * self._row_px()
+            self._offset = int(float(value) * total)
+            self._render()
+        elif action == "scroll":
+            step = self._viewport_height if units == "pages" else self._row_px()
+            self._scroll_by(int(value) * step)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            direction = -1
+        elif event.num == 5:
+            direction = 1
+        elif sys.platform == "darwin":
+            direction = -event.delta
+        else:
+            # Windows: a wheel notch is 120 (one row); precision touchpads
+            # send smaller deltas, scrolled in proportion in both directions
+            self._wheel_px -= event.delta * self._row_px() / 120
+            step = int(self._wheel_px)
+            self._wheel_px -= step
+            self._scroll_by(step)
+            return
+        self._scroll_by(int(direction) * self._row_px())
+
+    def _bind_wheel(self, widget):
+        """Bind wheel scrolling on a widget and all of its (internal) children"""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tk.Misc.bind(widget, sequence, self._on_mousewheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
@@ -0,0 +1,180 @@
+"""
+Webcam capture for Horsepower Gym Management System
+Reads camera frames on a background thread into a preallocated ring buffer
+so the photo dialog only has to display the newest one
+"""
+
+import threading
+import time
+
+
+# Resolution requested from the camera driver
+CAPTURE_SIZE = (640, 480)
+
+# Size of the live preview in the capture dialog
+PREVIEW_SIZE = (400, 300)
+
+# Frame slots: one being written, the newest finished one, and the one the
+# UI may still be reading
+RING_SLOTS = 3
+
+# Consecutive failed reads (about 10 ms apart) before the camera counts as lost
+MAX_READ_FAILURES = 100
+
+
+class FrameGrabber:
+    """
+    Background camera reader.
+
+    The capture thread opens the camera (slow on some drivers), then reads
+    every frame straight into a preallocated buffer, converts it to RGB and
+    shrinks it for the preview with cv2.resize(INTER_AREA), all into
+    preallocated ring slots, so steady-state capture allocates nothing.
+    The UI polls latest_preview() from its own timer and only ever sees the
+    newest frame; frames it did not get to are overwritten, not queued.
+    latest_preview() and capture() must be called from one thread (the Tk
+    thread): the slot they hand out is protected until the next call.
+
+    OpenCV and NumPy are imported by the capture thread, so importing this
+    module is cheap.
+    """
+
+    def __init__(self, device=0, capture_factory=None, capture_size=CAPTURE_SIZE, preview_size=PREVIEW_SIZE):
+        """
+        Args:
+            device: Camera index
+            capture_factory: callable(device) -> object with the
+                             cv2.VideoCapture interface (isOpened, set, read,
+                             release); default cv2.VideoCapture. Benchmarks
+                             pass one that produces synthetic frames.
+            capture_size: (width, height) requested from the camera
+            preview_size: (width, height) of latest_preview() frames
+        """
+        self.device = device
+        self.capture_factory = capture_factory
+        self.capture_size = capture_size
+        self.preview_size = preview_size
+        self.error = None            # Message once the camera failed
+        self.frames_captured = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self._stopped_at = None
+        # Ring buffer, allocated on the first frame (the camera may not
+        # honour capture_size)
+        self._raw = None             # BGR frame as read
+        self._full = []              # RGB frames at camera resolution
+        self._preview = []           # RGB frames at preview_size
+        self._latest = None          # Slot of the newest finished frame
+        self._seq = 0                # Number of the newest finished frame
+        self._reading = None         # Slot handed to the UI last
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="webcam", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop capturing and release the camera"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _open(self, cv2):
+        factory = self.capture_factory or cv2.VideoCapture
+        cap = factory(self.device)
+        if not cap.isOpened():
+            cap.release()
+            raise OSError("Could not open webcam. Please check if camera is connected.")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.capture_size[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.capture_size[1])
+        return cap
+
+    def _allocate(self, np, shape):
+        height, width = shape[:2]
+        preview_w, preview_h = self.preview_size
+        with self._lock:
+            self._raw = np.empty(shape, np.uint8)
+            self._full = [np.empty((height, width, 3), np.uint8) for _ in range(RING_SLOTS)]
+            self._preview = [np.empty((preview_h, preview_w, 3), np.uint8) for _ in range(RING_SLOTS)]
+            self._latest = None
+            self._reading = None
+
+    def _free_slot(self):
+        with self._lock:
+            for slot in range(RING_SLOTS):
+                if slot != self._latest and slot != self._reading:
+                    return slot
+
+    def _run(self):
+        try:
+            import cv2
+            import numpy as np
+            cap = self._open(cv2)
+        except Exception as e:
+            self.error = str(e) if isinstance(e, OSError) else f"Webcam error: {e}"
+            return
+
+        self._started_at = time.perf_counter()
+        failures = 0
+        try:
+            while not self._stop.is_set():
+                ok, frame = cap.read(self._raw) if self._raw is not None else cap.read()
+                if not ok or frame is None:
+                    failures += 1
+                    if failures >= MAX_READ_FAILURES:
+                        self.error = "Camera stopped sending frames."
+                        break
+                    time.sleep(0.01)
+                    continue
+                failures = 0
+                if self._raw is None or frame.shape != self._raw.shape:
+                    self._allocate(np, frame.shape)
+
+                slot = self._free_slot()
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._full[slot])
+                cv2.resize(self._full[slot], self.preview_size, dst=self._preview[slot],
+                           interpolation=cv2.INTER_AREA)
+                with self._lock:
+                    self._latest = slot
+                    self._seq += 1
+                self.frames_captured += 1
+        except Exception as e:
+            self.error = f"Webcam error: {e}"
+        finally:
+            self._stopped_at = time.perf_counter()
+            cap.release()
+
+    def latest_preview(self, after_seq=0):
+        """
+        The newest preview frame, if newer than after_seq.
+
+        Returns:
+            (seq, RGB array of preview_size) or None. The array belongs to
+            the ring buffer: it stays untouched until the next call, so
+            convert or copy it before then.
+        """
+        with self._lock:
+            if self._latest is None or self._seq == after_seq:
+                return None
+            self._reading = self._latest
+            return self._seq, self._preview[self._reading]
+
+    def capture(self):
+        """The newest frame at camera resolution as a PIL image, or None"""
+        from PIL import Image
+        with self._lock:
+            if self._latest is None:
+                return None
+            self._reading = self._latest
+            frame = self._full[self._reading]
+        return Image.fromarray(frame)   # Copies: PIL stores RGB as 4 bytes per pixel
+
+    def fps(self):
+        """Average frames captured per second since the camera opened"""
+        if self._started_at is None:
+            return 0.0
+        elapsed = (self._stopped_at or time.perf_counter()) - self._started_at
+        return self.frames_captured / elapsed if elapsed > 0 else 0.0